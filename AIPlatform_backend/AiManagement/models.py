@@ -7,6 +7,7 @@ import logging
 import yaml
 from fastapi import HTTPException,status
 from Database.applicationDataBase import *
+from Database.asyncApplicationDataBase import AsyncApplicationDataBase
 import random
 import string
 
@@ -27,7 +28,7 @@ logger = logging.getLogger(__name__)
 
 
 def initilizeApplicationDB():
-    applicationDB = ApplicationDataBase()
+    applicationDB = AsyncApplicationDataBase()
     return applicationDB
 
 
@@ -45,7 +46,7 @@ class Model:
         self.userId = userId
         self.applicationDB = initilizeApplicationDB()
 
-    def addModel(self, data: dict):
+    async def addModel(self, data: dict):
         try:
             # Check if the incoming data is empty or invalid
             if not data or not isinstance(data, dict):
@@ -90,7 +91,7 @@ class Model:
                 }
 
             # Call the database layer to add the model
-            status_code, success = self.applicationDB.add_model(data)
+            status_code, success = await self.applicationDB.add_model(data)
             if success:
                 logger.info("Model added successfully.")
                 return {
@@ -112,7 +113,7 @@ class Model:
             )
 
         
-    def getModeldetails(self, data: dict):
+    async def getModeldetails(self, data: dict):
         try:
             # Validate input data
             if not data or not isinstance(data, dict):
@@ -140,7 +141,7 @@ class Model:
                 }
 
             # Call the database function
-            model_details = self.applicationDB.get_model_details(model)
+            model_details = await self.applicationDB.get_model_details(model)
 
             if model_details is None:
                 logging.error(f"No records found for model: {model}")
@@ -170,7 +171,7 @@ class Model:
                 detail="An unexpected error occurred while processing the request.",
             )
         
-    def deleteModel(self, data: dict):
+    async def deleteModel(self, data: dict):
         """
         Deletes model from the database.
 
@@ -204,7 +205,7 @@ class Model:
                     "detail": f"The following fields have empty values: {', '.join(empty_fields)}. Please provide valid data."
                 }
             # Call the database layer to delete the prompt
-            result = self.applicationDB.delete_model(data)
+            result = await self.applicationDB.delete_model(data)
 
             # Handle cases based on the result
             if result["status_code"] == 404:
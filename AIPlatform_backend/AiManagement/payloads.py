@@ -7,6 +7,7 @@ import logging
 import yaml
 from fastapi import HTTPException,status
 from Database.applicationDataBase import *
+from Database.asyncApplicationDataBase import AsyncApplicationDataBase
 import random
 import string
 
@@ -27,7 +28,7 @@ logger = logging.getLogger(__name__)
 
 
 def initilizeApplicationDB():
-    applicationDB = ApplicationDataBase()
+    applicationDB = AsyncApplicationDataBase()
     return applicationDB
 
 
@@ -44,7 +45,7 @@ class Payload:
         self.role = role
         self.userId = userId
         self.applicationDB = initilizeApplicationDB()  # Initialize the application database
-    def addPayload(self, data: dict):
+    async def addPayload(self, data: dict):
         
         try:
             # Check if the incoming data is empty
@@ -76,7 +77,7 @@ class Payload:
                     "detail": f"Missing required fields: {', '.join(missing_fields)}."
                 }
             # Call the database layer to add the prompt
-            status_code, success = self.applicationDB.add_payload(data)
+            status_code, success = await self.applicationDB.add_payload(data)
 
             if success:
                 logger.info(f"Payload added successfully for userId {self.userId}")
@@ -116,7 +117,7 @@ class Payload:
                 detail="Failed to add payload due to an unexpected internal error",
             )
         
-    def getPayloadDetails(self):
+    async def getPayloadDetails(self):
                 """
                 Fetches the Payloads data from the database.
 
@@ -124,7 +125,7 @@ class Payload:
                 """
                 try:
                     # Call the database layer method to fetch LLM prompts data
-                    result = self.applicationDB.get_payload_details()
+                    result = await self.applicationDB.get_payload_details()
 
                     # Handle cases where no data is returned
                     if not result:
@@ -168,7 +169,7 @@ class Payload:
         
         
 
-    def deletePayload(self, data: dict):
+    async def deletePayload(self, data: dict):
         """
         Deletes Payloads from the database.
 
@@ -202,7 +203,7 @@ class Payload:
                     "detail": f"The following fields have empty values: {', '.join(empty_fields)}. Please provide valid data."
                 }
             # Call the database layer to delete the prompt
-            result = self.applicationDB.delete_payload(data)
+            result = await self.applicationDB.delete_payload(data)
 
             # Handle cases based on the result
             if result["status_code"] == 404:
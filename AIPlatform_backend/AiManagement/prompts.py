@@ -7,6 +7,7 @@ import logging
 import yaml
 from fastapi import HTTPException,status
 from Database.applicationDataBase import *
+from Database.asyncApplicationDataBase import AsyncApplicationDataBase
 import random
 import string
 
@@ -27,7 +28,7 @@ logger = logging.getLogger(__name__)
 
 
 def initilizeApplicationDB():
-    applicationDB = ApplicationDataBase()
+    applicationDB = AsyncApplicationDataBase()
     return applicationDB
 
 
@@ -44,7 +45,7 @@ class Prompts:
         self.role = role
         self.userId = userId
         self.applicationDB = initilizeApplicationDB()  # Initialize the application database
-    def addPrompt(self, data: dict):
+    async def addPrompt(self, data: dict):
         print("dataa  dghfd--",data)
         """
         Adds a prompt to the database.
@@ -96,7 +97,7 @@ class Prompts:
                 }
 
             # Call the database layer to add the prompt
-            status_code, success = self.applicationDB. add_prompt(data)
+            status_code, success = await self.applicationDB. add_prompt(data)
 
             if success:
                 logger.info(f"Prompt added successfully for clientApiKey {data['clientApiKey']}")
@@ -137,7 +138,7 @@ class Prompts:
             )
 
 
-    def getPromptsData(self):
+    async def getPromptsData(self):
         """
         Fetches the LLM Prompts data from the database.
 
@@ -145,7 +146,7 @@ class Prompts:
         """
         try:
             # Call the database layer method to fetch LLM prompts data
-            result = self.applicationDB.get_llm_prompts_data()
+            result = await self.applicationDB.get_llm_prompts_data()
 
             # Handle cases where no data is returned
             if not result:
@@ -188,7 +189,7 @@ class Prompts:
             }
 
 
-    def updatePrompt(self, data: dict):
+    async def updatePrompt(self, data: dict):
         """
         Fetches the LLM Prompts data from the database.
 
@@ -211,7 +212,7 @@ class Prompts:
         "detail": f"The following fields have empty values: {', '.join(empty_fields)}. Please provide valid data for these fields.",
     }
 
-                result = self.applicationDB.update_prompt(data)
+                result = await self.applicationDB.update_prompt(data)
 
                 # Handle cases where no data is returned
                 if not result:
@@ -241,7 +242,7 @@ class Prompts:
                     "detail": "An error occurred while updating the LLM prompt."
                 }
 
-    def deletePrompt(self, data: dict):
+    async def deletePrompt(self, data: dict):
         """
         Deletes LLM Prompts from the database.
 
@@ -277,7 +278,7 @@ class Prompts:
                 }
 
             # Call the database layer to delete the prompt
-            result = self.applicationDB.delete_prompt(data)
+            result = await self.applicationDB.delete_prompt(data)
 
             # Handle cases based on the result
             if "status_code" not in result:
@@ -8,6 +8,11 @@ class ExcelHandler:
     def __init__(self, excel_file_name):
         self.excel_file_name = excel_file_name
 
+    @staticmethod
+    def existing_columns(df, columns):
+        # Results stored before a column was introduced do not have it, so only keep the ones present
+        return [column for column in columns if column in df.columns]
+
     def json_to_excel(self, json_data):
         try:
             # Validate the provided JSON data
@@ -59,10 +64,16 @@ class ExcelHandler:
             df1 = df[["Timestamp", "Test ID", "Input", "Question Number", "distributor(%)", "prompt_count"]].drop_duplicates().sort_values(by=["Test ID", "Question Number"])
 
             # Sheet 2: Request Response Details
-            df2 = df[["Test ID", "User ID", "Session ID", "Question Number", "request_id", "Response", "Status Code", "Latency (seconds)"]].sort_values(by=["Test ID", "User ID"])
+            df2 = df[self.existing_columns(df, ["Test ID", "User ID", "Session ID", "Question Number", "request_id", "Response", "Status Code", "Latency (seconds)",
+                                                "Send Lag (seconds)", "Corrected Latency (seconds)",
+                                                "TTFT (seconds)", "Mean Inter-Token Latency (seconds)", "Max Inter-Token Gap (seconds)",
+                                                "Output Tokens", "Decode Throughput (tokens/second)"])].sort_values(by=["Test ID", "User ID"])
 
             # Sheet 3: Performance Data
-            df3 = df[["Test ID", "Percentile Latency (seconds)", "Throughput (requests/second)"]].drop_duplicates()
+            df3 = df[self.existing_columns(df, ["Test ID", "Percentile Latency (seconds)", "Throughput (requests/second)",
+                                                "Load Profile", "Target Rate (requests/second)", "Achieved Rate (requests/second)",
+                                                "TTFT Percentiles (seconds)", "Inter-Token Latency Percentiles (seconds)",
+                                                "Mean Decode Throughput (tokens/second)"])].drop_duplicates()
 
             # Write data to Excel using xlsxwriter
             with pd.ExcelWriter(file_path, engine='xlsxwriter') as writer:
@@ -1,20 +1,26 @@
 import logging
+import os
+import threading
 import numpy as np
 import nltk
 from typing import List, Optional, Dict, Tuple
 from collections import Counter
-from nltk.translate.bleu_score import sentence_bleu, SmoothingFunction
-from nltk.translate.meteor_score import meteor_score
 from nltk.tokenize import word_tokenize
 import pandas as pd
 from sklearn.metrics import matthews_corrcoef, f1_score, precision_score
 from sentence_transformers import SentenceTransformer, util
 from sklearn.metrics import confusion_matrix, precision_score, recall_score, f1_score
-from bert_score import score as bert_score
-from rouge_score import rouge_scorer
+import bert_score
+from bert_score.utils import bert_encode, get_model, get_tokenizer, lang2model, model2layers, padding, sent_encode
+from ApplicationManagment.Handlers.bleuEngine import bleu_scores
+from ApplicationManagment.Handlers.embeddingCache import get_embedding_cache
+from ApplicationManagment.Handlers.meteorEngine import meteor_mean
+from ApplicationManagment.Handlers.rougeEngine import rouge_f1
 import torch
 import torch.nn.functional as F
+from torch.nn.utils.rnn import pad_sequence
 from transformers import AutoTokenizer, AutoModelForCausalLM
+from db_config import bert_score_config
 
 # Download the 'punkt' tokenizer
 nltk.download('punkt')
@@ -23,6 +29,140 @@ nltk.download('punkt_tab')
 
 nltk.download('wordnet')
 
+class BertScoreEngine:
+    """
+    BERTScore as bert_score.score(lang=..., rescale_with_baseline=True) computes it, with the model kept resident.
+
+    The default model of the language is loaded once per process (optionally int8 dynamically quantized), sentences
+    are embedded in batches of similar token length to cut padding, and the token embeddings of the references are
+    cached by token ids, so the answers of a payload are embedded once for all the models scored against them.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, lang: str, batch_size: int, num_threads: int = 0, quantize: bool = False,
+                 cache_references: bool = True):
+        if num_threads > 0:
+            torch.set_num_threads(num_threads)
+        self.model_type = lang2model[lang]
+        self.num_layers = model2layers[self.model_type]
+        self.batch_size = batch_size
+        print(f"Loading BERTScore model {self.model_type} ({self.num_layers} layers)")
+        self.tokenizer = get_tokenizer(self.model_type)
+        self.model = get_model(self.model_type, self.num_layers)
+        if quantize:
+            self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+        # Special tokens are matched against but not weighted, as with bert_score's idf=False
+        self.special_ids = {self.tokenizer.sep_token_id, self.tokenizer.cls_token_id}
+        baseline_path = os.path.join(
+            os.path.dirname(bert_score.__file__), f"rescale_baseline/{lang}/{self.model_type}.tsv"
+        )
+        self.baseline = torch.from_numpy(pd.read_csv(baseline_path).iloc[self.num_layers].to_numpy())[1:].float()
+        self.cache = None
+        if cache_references:
+            self.cache = get_embedding_cache(
+                f"bertscore:{self.model_type}:{self.num_layers}{':int8' if quantize else ''}"
+            )
+        self._encode_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls, lang: str = None) -> "BertScoreEngine":
+        lang = lang or bert_score_config["LANG"]
+        with cls._instances_lock:
+            engine = cls._instances.get(lang)
+            if engine is None:
+                engine = cls(
+                    lang,
+                    bert_score_config["BATCH_SIZE"],
+                    bert_score_config["NUM_THREADS"],
+                    bert_score_config["QUANTIZE"],
+                    bert_score_config["CACHE_REFERENCES"]
+                )
+                cls._instances[lang] = engine
+            return engine
+
+    def _embed(self, token_ids: List[Tuple[int, ...]]) -> Dict[Tuple[int, ...], torch.Tensor]:
+        """Unit-length token embeddings of each distinct id sequence, batched by length."""
+        unique_ids = sorted(set(token_ids), key=len)
+        embeddings = {}
+        with self._encode_lock, torch.inference_mode():
+            for start in range(0, len(unique_ids), self.batch_size):
+                batch = unique_ids[start:start + self.batch_size]
+                padded, lengths, mask = padding([list(ids) for ids in batch], self.tokenizer.pad_token_id)
+                output = bert_encode(self.model, padded, attention_mask=mask)
+                for i, ids in enumerate(batch):
+                    embedding = output[i, :lengths[i]].float()
+                    embeddings[ids] = embedding / torch.norm(embedding, dim=-1).unsqueeze(-1)
+        return embeddings
+
+    def _embed_references(self, token_ids: List[Tuple[int, ...]]) -> Dict[Tuple[int, ...], torch.Tensor]:
+        if self.cache is None:
+            return self._embed(token_ids)
+        keys = {" ".join(map(str, ids)): ids for ids in set(token_ids)}
+        cached = self.cache.get_many(keys)
+        embeddings = {keys[key]: torch.from_numpy(np.array(array)) for key, array in cached.items()}
+        missing = [ids for key, ids in keys.items() if key not in cached]
+        if missing:
+            encoded = self._embed(missing)
+            self.cache.put_many({" ".join(map(str, ids)): embedding.numpy() for ids, embedding in encoded.items()})
+            embeddings.update(encoded)
+        return embeddings
+
+    def _idf(self, ids: Tuple[int, ...]) -> torch.Tensor:
+        return torch.tensor([0.0 if token in self.special_ids else 1.0 for token in ids])
+
+    def _greedy_match(self, hypotheses: List[Tuple[int, ...]], references: List[Tuple[int, ...]],
+                      hypothesis_embeddings: Dict, reference_embeddings: Dict):
+        """Greedy cosine matching of a batch of pairs (bert_score's greedy_cos_idf), before rescaling."""
+        hyp = pad_sequence([hypothesis_embeddings[ids] for ids in hypotheses], batch_first=True)
+        ref = pad_sequence([reference_embeddings[ids] for ids in references], batch_first=True)
+        # Padding rows are zero vectors, so they score 0 like the masked positions in bert_score
+        sim = torch.bmm(hyp, ref.transpose(1, 2))
+        word_precision = sim.max(dim=2)[0]
+        word_recall = sim.max(dim=1)[0]
+        hyp_idf = pad_sequence([self._idf(ids) for ids in hypotheses], batch_first=True)
+        ref_idf = pad_sequence([self._idf(ids) for ids in references], batch_first=True)
+        P = (word_precision * hyp_idf / hyp_idf.sum(dim=1, keepdim=True)).sum(dim=1)
+        R = (word_recall * ref_idf / ref_idf.sum(dim=1, keepdim=True)).sum(dim=1)
+        F1 = 2 * P * R / (P + R)
+        # Empty sentences (special tokens only) score 0
+        empty = torch.tensor([len(h) == 2 or len(r) == 2 for h, r in zip(hypotheses, references)])
+        P = P.masked_fill(empty, 0.0)
+        R = R.masked_fill(empty, 0.0)
+        F1 = F1.masked_fill(torch.isnan(F1), 0.0)
+        return torch.stack((P, R, F1), dim=-1)
+
+    def score(self, predictions: List[str], references: List[str]) -> Dict[str, np.ndarray]:
+        """Rescaled precision, recall and f1 of every prediction/reference pair."""
+        if len(predictions) != len(references):
+            raise ValueError("Predictions and references must have the same length")
+        if not predictions:
+            return {"precision": np.empty(0), "recall": np.empty(0), "f1": np.empty(0)}
+        encoded = {}
+        for text in predictions + references:
+            if text not in encoded:
+                encoded[text] = tuple(sent_encode(self.tokenizer, text))
+        hypotheses = [encoded[text] for text in predictions]
+        reference_ids = [encoded[text] for text in references]
+        reference_embeddings = self._embed_references(reference_ids)
+        hypothesis_embeddings = self._embed([ids for ids in hypotheses if ids not in reference_embeddings])
+        hypothesis_embeddings.update(reference_embeddings)
+
+        # Pairs of similar lengths are matched together to keep the padded similarity matrices small
+        order = sorted(range(len(hypotheses)), key=lambda i: (len(hypotheses[i]), len(reference_ids[i])))
+        scores = torch.empty(len(hypotheses), 3)
+        with torch.inference_mode():
+            for start in range(0, len(order), self.batch_size):
+                batch = order[start:start + self.batch_size]
+                scores[batch] = self._greedy_match(
+                    [hypotheses[i] for i in batch], [reference_ids[i] for i in batch],
+                    hypothesis_embeddings, reference_embeddings
+                )
+        scores = ((scores - self.baseline) / (1 - self.baseline)).numpy()
+        return {"precision": scores[:, 0], "recall": scores[:, 1], "f1": scores[:, 2]}
+
+
 class Metrics:
     def __init__(self):
         self.tokenizer = None
@@ -125,22 +265,17 @@ class Metrics:
     
     @staticmethod
     def bert_score_evaluation(predictions, references):
-        
-        P, R, F1 = bert_score(predictions, references, lang="en", rescale_with_baseline=True)
-        
-        return P.mean().item(), R.mean().item(), F1.mean().item()
+        """Mean rescaled BERTScore precision, recall and F1, and the per-row scores."""
+        rows = BertScoreEngine.get_instance().score(predictions, references)
+        if not len(rows["f1"]):
+            return 0.0, 0.0, 0.0, rows
+        return float(rows["precision"].mean()), float(rows["recall"].mean()), float(rows["f1"].mean()), rows
 
     @staticmethod
     def rouge_score_evaluation(predictions, references):
-        scorer = rouge_scorer.RougeScorer(['rouge1', 'rouge2', 'rougeL'], use_stemmer=True)
-        scores = [scorer.score(pred, ref) for pred, ref in zip(predictions, references)]
-        print("scores", scores)
-        rouge1_f1 = sum(score['rouge1'].fmeasure for score in scores) / len(scores)
-        print("1", rouge1_f1)
-        rouge2_f1 = sum(score['rouge2'].fmeasure for score in scores) / len(scores)
-        print("2", rouge2_f1)
-        rougel_f1 = sum(score['rougeL'].fmeasure for score in scores) / len(scores)
-        print("3", rougel_f1)
+        # Same scores as rouge_scorer.RougeScorer(['rouge1', 'rouge2', 'rougeL'], use_stemmer=True)
+        rouge1_f1, rouge2_f1, rougel_f1 = rouge_f1(predictions, references)
+        print("ROUGE-1/2/L", rouge1_f1, rouge2_f1, rougel_f1)
         return rouge1_f1, rouge2_f1, rougel_f1
 
     def calculate_mrr(predictions, references):
@@ -227,42 +362,47 @@ class Metrics:
     
     
         
-    def calculate_bleu(self, predictions: List[str], references: List[str]) -> Dict[str, float]:
+    @staticmethod
+    def tokenize_texts(texts: List[str]) -> List[List[str]]:
         """
-        Calculate BLEU scores for 1-4 grams.
+        word_tokenize of each lowercased text, tokenizing every distinct text once.
+        Shared by BLEU and METEOR so a metrics pass tokenizes each response and answer a single time.
         """
-        smooth = SmoothingFunction().method1
-        bleu_scores = {f'bleu-{i}': 0.0 for i in range(1, 5)}
-        
-        for pred, ref in zip(predictions, references):
-            # Tokenize
-            pred_tokens = word_tokenize(pred.lower())
-            ref_tokens = [word_tokenize(ref.lower())]
-            
-            # Calculate BLEU-1 to BLEU-4
-            for n in range(1, 5):
-                weights = tuple([1./n] * n + [0.] * (4-n))
-                score = sentence_bleu(ref_tokens, pred_tokens, 
-                                   weights=weights,
-                                   smoothing_function=smooth)
-                bleu_scores[f'bleu-{n}'] += score
-        
-        # Average scores
-        for key in bleu_scores:
-            bleu_scores[key] /= len(predictions) if predictions else 1
-        print("9999999", bleu_scores)    
-        return bleu_scores
-
-    def calculate_meteor(self, predictions: List[str], references: List[str]) -> float:
+        cache = {}
+        tokens = []
+        for text in texts:
+            if text not in cache:
+                cache[text] = word_tokenize(text.lower())
+            tokens.append(cache[text])
+        return tokens
+
+    def calculate_bleu(self, predictions: List[str], references: List[str],
+                       prediction_tokens: List[List[str]] = None, reference_tokens: List[List[str]] = None) -> Dict[str, float]:
+        """
+        Calculate BLEU scores for 1-4 grams: the mean sentence BLEU (bleu-n, as sentence_bleu with method1
+        smoothing) and the corpus BLEU of all pairs (corpus-bleu-n, as corpus_bleu).
+        """
+        if prediction_tokens is None:
+            prediction_tokens = self.tokenize_texts(predictions)
+        if reference_tokens is None:
+            reference_tokens = self.tokenize_texts(references)
+        bleu = bleu_scores(prediction_tokens, reference_tokens)
+        print("BLEU", bleu)
+        return bleu
+
+    def calculate_meteor(self, predictions: List[str], references: List[str],
+                         prediction_tokens: List[List[str]] = None, reference_tokens: List[List[str]] = None) -> float:
         """
         Calculate METEOR score.
         """
-        meteor_scores = []
-        for pred, ref in zip(predictions, references):
-            score = meteor_score([word_tokenize(ref)], word_tokenize(pred))
-            meteor_scores.append(score)
-        print("9999999", np.mean(meteor_scores) if meteor_scores else 0.0)
-        return np.mean(meteor_scores) if meteor_scores else 0.0
+        # meteor lowercases the tokens itself, so the shared lowercased tokenization can be used
+        if prediction_tokens is None:
+            prediction_tokens = self.tokenize_texts(predictions)
+        if reference_tokens is None:
+            reference_tokens = self.tokenize_texts(references)
+        score = meteor_mean(prediction_tokens, reference_tokens)
+        print("METEOR", score)
+        return score
 
     def calculate_mcc(self, predictions: List[str], references: List[str], 
                      labels: Optional[List[str]] = None) -> float:
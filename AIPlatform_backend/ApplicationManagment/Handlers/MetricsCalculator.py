@@ -1,5 +1,8 @@
 from asyncio.log import logger
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+import multiprocessing
 from fastapi import HTTPException
 import json
 import os
@@ -12,6 +15,7 @@ import requests
 import logging
 from ApplicationManagment.Handlers.Metrics import Metrics
 from ApplicationManagment.Handlers.ScoreCalculator import ScoreCalculator
+from ApplicationManagment.Handlers.scoringPool import limit_workers
 from db_config import eval_config
 from ApplicationManagment.Handlers.storeExcel import JSONToExcelConverter
 from utils import MetricStatus, MetricStatusRecord, MetricsPayload
@@ -20,6 +24,35 @@ from utils import MetricStatus, MetricStatusRecord, MetricsPayload
 score_calculator = ScoreCalculator(eval_config['SCORE_ENDPOINT'])
 metricsHandler = Metrics()
 
+# Long-lived so each worker keeps its metric models loaded between runs
+_metrics_pool = None
+
+
+def _init_metrics_worker(num_threads):
+    import torch
+    # Split the CPU between the workers instead of every worker using all cores,
+    # for torch and for the scoring pool the text metrics of a large set fan out to
+    torch.set_num_threads(num_threads)
+    limit_workers(num_threads)
+
+
+def get_metrics_pool():
+    global _metrics_pool
+    if _metrics_pool is None:
+        workers = eval_config["METRICS_WORKERS"]
+        _metrics_pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_metrics_worker,
+            initargs=(max((os.cpu_count() or 1) // workers, 1),)
+        )
+    return _metrics_pool
+
+
+def compute_model_metrics(data, metrics):
+    """Process pool entry point: every requested metric for one model's evaluation results."""
+    return MetricsCalculator.calculate_metrics(data, metrics)
+
 class MetricsCalculator:
     def __init__(self, mongoHandler: MongoDBHandler, payload):
         self.mongoHandler = mongoHandler
@@ -35,9 +68,6 @@ class MetricsCalculator:
     async def do_metrics(self, metric_id):
         start_time = datetime.now()
         try:
-            payload = self.payload_file_path
-            collection = self.load_yaml_data(payload)
-
             # Check if model is completed - this should be an async call
             model_completed = await self.mongoHandler.check_model_completed_status(self.process_id)
             if not model_completed:
@@ -77,12 +107,14 @@ class MetricsCalculator:
             # Update metric status - this should be an async call
             await self.mongoHandler.update_metric_status_record(status_record, self.process_name)
 
-            # Process each model
-            for index, model_id in enumerate(model_ids):
+            # Models are scored in parallel, each from its own responses in EvalResults
+            results_lock = asyncio.Lock()
+
+            async def process_model(model_id):
                 try:
                     # Update model status to "Calculating"
                     self.task_statuses[self.process_id]["models"][model_id] = "Calculating Metrics"
-                    await self.mongoHandler.update_metric_model_status(
+                    await self.mongoHandler.queue_metric_model_status(
                         self.process_id, 
                         model_id, 
                         "Calculating Metrics",
@@ -90,62 +122,53 @@ class MetricsCalculator:
                         "Evaluation completed. Calculating Metrics."
                     )
 
-                    # Calculate metrics - this is synchronous
-                    metrics_results = self.calculate_metrics(collection, self.metrics)
+                    # Only this model's responses are loaded
+                    model_results = await self.mongoHandler.get_results_by_model_id(self.process_id, model_id)
+                    if not model_results:
+                        raise ValueError(f"No evaluation results found for model {model_id}")
+
+                    # Calculate metrics in the process pool
+                    loop = asyncio.get_running_loop()
+                    metrics_results = await loop.run_in_executor(get_metrics_pool(), compute_model_metrics, model_results, self.metrics)
                     print("metrics_results", metrics_results)
 
-                    if metrics_results.get('status_code') == 200:
-                        try:
-                            # Update status to completed
-                            logger.info("Updating model status to Completed...")
-                            new_status = "Metrics Calculation Completed"
-                            await self.mongoHandler.update_metric_model_status(
-                                self.process_id, 
-                                model_id, 
-                                new_status,
-                                metric_id,
-                                "Evaluation completed. Calculating Metrics."
-                            )
-                        except Exception as e:
-                            logger.error(f"Error updating model status to Completed: {str(e)}")
-                            raise
-
-                        try:
-                            # Update metrics results
-                            print("Updating metrics results record...")
-                            await self.mongoHandler.update_metrics_results_record(
-                                self.process_id,
-                                self.user_id,
-                                config_type,
-                                object_id,
-                                metric_id,
-                                self.process_name,
-                                model_id,
-                                metrics_results['data']
-                            )
-                        except Exception as e:
-                            logger.error(f"Error updating metrics results record: {str(e)}")
-                            raise
-
-                    else:
+                    if metrics_results.get('status_code') != 200:
                         print(f"Metrics calculation failed with status: {metrics_results.get('status_code')}")
-                        # Update status to failed
-                        await self.mongoHandler.update_metric_model_status(
-                            self.process_id,
-                            model_id,
-                            "Metrics Calculation Failed",
-                            metric_id,
-                            "Evaluation completed. Calculating Metrics."
-                        )
                         raise HTTPException(
                             status_code=500,
-                            detail=f"Metrics calculation failed for model {model_id}"
+                            detail=f"Metrics calculation failed for model {model_id}: {metrics_results.get('detail')}"
+                        )
+
+                    # One writer at a time, the first write creates the metrics document
+                    async with results_lock:
+                        print("Updating metrics results record...")
+                        await self.mongoHandler.update_metrics_results_record(
+                            self.process_id,
+                            self.user_id,
+                            config_type,
+                            object_id,
+                            metric_id,
+                            self.process_name,
+                            model_id,
+                            metrics_results['data'],
+                            row_scores=metrics_results.get('rows')
                         )
 
+                    logger.info("Updating model status to Completed...")
+                    self.task_statuses[self.process_id]["models"][model_id] = "Metrics Calculation Completed"
+                    await self.mongoHandler.queue_metric_model_status(
+                        self.process_id, 
+                        model_id, 
+                        "Metrics Calculation Completed",
+                        metric_id,
+                        "Evaluation completed. Calculating Metrics."
+                    )
+
                 except Exception as e:
                     print(f"Error processing model {model_id}: {str(e)}")
+                    self.task_statuses[self.process_id]["models"][model_id] = "Metrics Calculation Failed"
                     try:
-                        await self.mongoHandler.update_metric_model_status(
+                        await self.mongoHandler.queue_metric_model_status(
                             self.process_id,
                             model_id,
                             "Metrics Calculation Failed",
@@ -156,6 +179,11 @@ class MetricsCalculator:
                         logger.error(f"Error updating failure status: {str(update_error)}")
                     raise
 
+            outcomes = await asyncio.gather(*[process_model(model_id) for model_id in model_ids], return_exceptions=True)
+            failed = [model_id for model_id, outcome in zip(model_ids, outcomes) if isinstance(outcome, Exception)]
+            if failed:
+                raise Exception(f"Metrics calculation failed for models {failed}")
+
             try:
                 # Update overall status when all models are processed
                 print("Updating overall status to Completed...")
@@ -182,16 +210,23 @@ class MetricsCalculator:
             except Exception as update_error:
                 logger.error(f"Error updating failure status: {str(update_error)}")
             raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
-    def calculate_metrics(self, data, metrics):
+    @staticmethod
+    def calculate_metrics(data, metrics):
         print("metrics --",metrics)
         try:
             
             if isinstance(metrics, str):
                 metrics = [mode.strip() for mode in metrics.split(",")]
     
-            final_result = data
+            # Scores only: the responses stay in EvalResults, per-row scores are returned separately
+            final_result = {}
+            queries = []
             predictions = []
             references = []
+            row_scores = None
+            prediction_tokens = None
+            reference_tokens = None
+            failed_count = 0
            
             # Process each payload
             for payload_key, questions in data.items():
@@ -205,10 +240,16 @@ class MetricsCalculator:
                         logging.error(f"Invalid question format: Expected a dictionary, got {type(question)}")
                         continue  # Skip invalid entries
 
+                    if "error" in question:
+                        # The request failed, there is no response to score
+                        failed_count += 1
+                        continue
+
                     prediction = question.get("response", "").strip()
                     reference = question.get("answer", "").strip()
                    
                     if prediction or reference:
+                        queries.append(question.get("query", ""))
                         predictions.append(prediction)
                         references.append(reference)
             # for question in data.get('query', []):
@@ -219,17 +260,30 @@ class MetricsCalculator:
             #         references.append(reference)
             # print("actual data ----", predictions, references)
 
+            # Failed requests are left out of every score, reported next to them
+            final_result['failed_count'] = failed_count
+
+            # Tokenize once for all token-based metrics of this pass
+            if "BLEU Score" in metrics or "METEOR" in metrics:
+                prediction_tokens = metricsHandler.tokenize_texts(predictions)
+                reference_tokens = metricsHandler.tokenize_texts(references)
+
             for mode in metrics:
                 if mode == "BERT Score":
-                    P, R, F1 = metricsHandler.bert_score_evaluation(predictions, references)
+                    P, R, F1, rows = metricsHandler.bert_score_evaluation(predictions, references)
                     final_result['BERT_score'] = {
                         'precision': P,
                         'recall': R,
                         'f1': F1
                     }
+                    # Per question, in the order of the scored responses
+                    row_scores = row_scores or [{"query": query} for query in queries]
+                    for name, values in rows.items():
+                        for row, value in zip(row_scores, values.tolist()):
+                            row[f"BERT {name}"] = value
                     print("bert completed")
                 elif mode == "BLEU Score":
-                    score = metricsHandler.calculate_bleu(predictions, references)
+                    score = metricsHandler.calculate_bleu(predictions, references, prediction_tokens, reference_tokens)
                     final_result['BLEU Score'] = {
                         'score' : score
                     }   
@@ -245,7 +299,7 @@ class MetricsCalculator:
 
                 elif mode == "METEOR":
                     print("METEOR")
-                    meteor_score = metricsHandler.calculate_meteor(predictions, references)
+                    meteor_score = metricsHandler.calculate_meteor(predictions, references, prediction_tokens, reference_tokens)
                     final_result['METEOR_score'] = {
                         'score': meteor_score
                     }
@@ -304,7 +358,7 @@ class MetricsCalculator:
                             false_negative.extend(value)
 
                     # Process actual and predicted payloads for confusion matrix
-                    actual_payloads, predicted_payloads = self.process_payloads({
+                    actual_payloads, predicted_payloads = MetricsCalculator.process_payloads({
                         "TruePositive": true_positive,
                         "TrueNegative": true_negative,
                         "FalsePositive": false_positive,
@@ -328,7 +382,8 @@ class MetricsCalculator:
 
             return {
                 "status_code": 200,
-                "data": final_result         
+                "data": final_result,
+                "rows": row_scores
             }
 
         except Exception as e:
@@ -345,7 +400,8 @@ class MetricsCalculator:
                 "detail": str(e)
             }
 
-    def process_payloads(self, data):
+    @staticmethod
+    def process_payloads(data):
         actual_payloads = []
         predicted_payloads = []
         categories = ["TruePositive", "TrueNegative", "FalsePositive", "FalseNegative"]
@@ -356,7 +412,7 @@ class MetricsCalculator:
                 scores = [{"score": obj.get("score", 0)} for obj in data[category]]
 
                 # Classify based on score
-                predicted = [self.classify_percentage(score["score"]) for score in scores]
+                predicted = [MetricsCalculator.classify_percentage(score["score"]) for score in scores]
 
                 # Debug: print category details
                 print(f"Category: {category}, Actual: {actual}, Predicted: {predicted}")
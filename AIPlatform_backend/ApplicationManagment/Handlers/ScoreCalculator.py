@@ -5,8 +5,7 @@ import pandas as pd
 import requests
 import logging
 from sklearn.metrics import confusion_matrix, precision_score, recall_score, f1_score
-from sentence_transformers import SentenceTransformer, util
-import torch
+from ApplicationManagment.Handlers.embeddingEngine import EmbeddingEngine
 
 
 
@@ -23,10 +22,14 @@ class ScoreCalculator:
         self.endpoint = endpoint   
 
     def get_scores_data(self, data, mode):
+        if mode == "Cosine Similarity":
+            return self.get_cosine_scores_data(data)
     # Iterate over the specified keys: TruePositive, TrueNegative, etc.
         for key in ["TruePositive", "TrueNegative", "FalsePositive", "FalseNegative"]:
             if key in data:  # Check if the key exists in the input data
                 for obj in data[key]:
+                    if "error" in obj:
+                        continue
                     prediction = obj.get("response", "")
                     reference = obj.get("answer", "")
                     
@@ -36,6 +39,21 @@ class ScoreCalculator:
 
         return data
 
+    def get_cosine_scores_data(self, data):
+        """Score every row of every key in one batched encode instead of one model call per pair."""
+        # Rows of failed requests have no response to score
+        rows = [
+            obj for key in ["TruePositive", "TrueNegative", "FalsePositive", "FalseNegative"] if key in data
+            for obj in data[key] if "error" not in obj
+        ]
+        similarities = EmbeddingEngine.get_instance().pairwise_similarity(
+            [obj.get("response", "") for obj in rows],
+            [obj.get("answer", "") for obj in rows]
+        )
+        for obj, similarity in zip(rows, similarities):
+            obj["score"] = float(similarity) * 100
+        return data
+
             
 
     def calculate_similarity(self, first_sentence, second_sentence):
@@ -104,19 +122,10 @@ class ScoreCalculator:
         
     @staticmethod    
     def calculate_cosine_similarity(pred, ref):
-        # Load pre-trained model
-        print("111")
-        model = SentenceTransformer('all-MiniLM-L6-v2')
-        print("model", model)
-        # Encode the sentences to get their embeddings
-        embedding1 = model.encode(pred, convert_to_tensor=True)
-        embedding2 = model.encode(ref, convert_to_tensor=True)
-        
-        # Calculate cosine similarity
-        cosine_sim = util.pytorch_cos_sim(embedding1, embedding2)
-        print("cosine", cosine_sim)
+        # Shared, already loaded model; batch callers should use get_cosine_scores_data
+        cosine_sim = EmbeddingEngine.get_instance().pairwise_similarity([pred], [ref])[0]
         # Return the cosine similarity score
-        return cosine_sim.item() * 100
+        return float(cosine_sim) * 100
     
 
     def calculate_similarity_scores(self, prediction, reference, mode):
@@ -3,17 +3,27 @@ import os
 import json
 from datetime import datetime
 import asyncio
+import hashlib
+import random
 import re
 import statistics
+import time
 from typing import Any, Dict, List
 import uuid
 import httpx
-import numpy as np
 import yaml
 import psutil
+from ApplicationManagment.Handlers.latencyHistogram import LatencyHistogram
+from ApplicationManagment.Handlers.httpClient import get_async_client, warm_up
+
+DEFAULT_PERCENTILES = [50, 75, 90.5, 95, 99]
+# "closed" keeps the semaphore-throttled behaviour, the others send on a fixed schedule (open loop)
+LOAD_PROFILES = ["closed", "constant", "poisson", "step", "ramp"]
 
 class AsyncTester:
-    def __init__(self, payload_file_path, user_id, session_id, endpoint, config_type, config_id, client_api_key, total_requests,concurrency_limit=50):
+    def __init__(self, payload_file_path, user_id, session_id, endpoint, config_type, config_id, client_api_key, total_requests,concurrency_limit=50,
+                 load_profile="closed", target_rps=0, end_rps=0, ramp_steps=1, percentiles=None, stream=False,
+                 worker_index=0, worker_count=1, run_id=None, verbose=True):
         self.payload_file_path = payload_file_path
         self.user_id = user_id
         self.endpoint = endpoint
@@ -22,7 +32,10 @@ class AsyncTester:
         self.concurrency_limit = concurrency_limit
         self.query_list = []
         self.results = []
-        self.latencies = []
+        # Latencies of the current payload set, bounded in memory regardless of the request count
+        self.latency_histogram = LatencyHistogram()
+        self.latency_histograms = {}
+        self.percentiles = percentiles or DEFAULT_PERCENTILES
         self.session_id = session_id
         self.task_queue = asyncio.Queue()
         self.client_api_key = client_api_key
@@ -30,31 +43,69 @@ class AsyncTester:
         self.execution_timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
         self.distributor_map = {}
         self.prompt_counts = {}
-
-    async def fetch_async(self, client, url, data, semaphore):
+        # Open-loop load settings
+        if load_profile not in LOAD_PROFILES:
+            raise ValueError(f"Invalid load_profile '{load_profile}', expected one of {LOAD_PROFILES}")
+        if load_profile != "closed" and target_rps <= 0:
+            raise ValueError(f"target_rps must be greater than 0 for the '{load_profile}' load profile")
+        self.load_profile = load_profile
+        self.target_rps = target_rps
+        self.end_rps = end_rps if end_rps > 0 else target_rps
+        self.ramp_steps = max(int(ramp_steps), 1)
+        self.send_times = []
+        self.rate_stats = {}
+        # Streaming (chunked HTTP / SSE) measurement: time to first token, inter-token gaps, decode throughput
+        self.stream = stream
+        self.stream_stats = self.new_stream_stats()
+        self.all_stream_stats = {}
+        # Distributed runs: every worker builds the same shuffled query list (seeded by run_id)
+        # and sends only its own share of it
+        self.worker_index = worker_index
+        self.worker_count = max(int(worker_count), 1)
+        self.run_id = run_id
+        self.payload_set_count = 0
+        self.set_throughputs = {}
+        # Wall-clock window and request counts of each payload set, so shards can be merged over their common window
+        self.set_windows = {}
+        # Per-request printing is turned off in workers so it does not eat the event loop
+        self.verbose = verbose
+
+    def log(self, *args):
+        if self.verbose:
+            print(*args)
+
+    async def fetch_async(self, client, url, data, semaphore, scheduled_time=None):
         async with semaphore:
             start_time = asyncio.get_event_loop().time()
-            print(f"Request {data['request_id']} is running...")
+            # In closed-loop mode the request is "scheduled" when it gets a semaphore slot
+            if scheduled_time is None:
+                scheduled_time = start_time
+            self.send_times.append(start_time)
+            self.log(f"Request {data['request_id']} is running...")
 
+            stream_result = None
             try:
-                response = await client.post(url, json=data, timeout=3000)
-                response.raise_for_status()
+                if self.stream:
+                    response, stream_result = await self.fetch_stream(client, url, data)
+                else:
+                    response = await client.post(url, json=data)
+                    response.raise_for_status()
             except httpx.HTTPStatusError as exc:
                 error_message = (
                     f"Server error '{exc.response.status_code} {exc.response.reason_phrase}' for URL '{exc.request.url}'"
                 )
                 print(error_message)
-                print(f"Request data: {json.dumps(data, indent=2)}")
+                self.log(f"Request data: {json.dumps(data, indent=2)}")
                 try:
                     error_response = exc.response.json()
-                    print(f"Error response: {json.dumps(error_response, indent=2)}")
+                    self.log(f"Error response: {json.dumps(error_response, indent=2)}")
                 except json.JSONDecodeError:
-                    print(f"Error response (non-JSON): {exc.response.text}")
+                    self.log(f"Error response (non-JSON): {exc.response.text}")
                 return None
             except httpx.RequestError as exc:
                 print(f"Request error: {exc}")
                 if hasattr(exc, 'request'):
-                    print(f"Request data: {json.dumps(data, indent=2)}")
+                    self.log(f"Request data: {json.dumps(data, indent=2)}")
                 return None
             except Exception as exc:
                 print(f"Unexpected error: {exc}")
@@ -62,11 +113,18 @@ class AsyncTester:
 
             end_time = asyncio.get_event_loop().time()
             latency = end_time - start_time
-            print(f"Request {data['request_id']} completed. Status: {response.status_code}. Time taken: {latency:.2f} seconds")
-            self.latencies.append(latency)
+            # Latency measured from the scheduled send time, so a late send is not hidden (coordinated omission)
+            corrected_latency = end_time - scheduled_time
+            self.log(f"Request {data['request_id']} completed. Status: {response.status_code}. Time taken: {latency:.2f} seconds")
+            self.latency_histogram.record(corrected_latency)
             result = "Error processing response"
             try:
-                if data["service"] == "stt":
+                if stream_result is not None:
+                    # The streamed chunks are already the generated text
+                    streamed_text = stream_result["text"]
+                    assistant_lines = re.findall(r'<ASSISTANT>:\s*(.*?)\n', streamed_text)
+                    result = "\n".join(assistant_lines) if assistant_lines else streamed_text.strip()
+                elif data["service"] == "stt":
                     response_text = response.text
                     try:
                         response_json = json.loads(response_text)
@@ -76,13 +134,13 @@ class AsyncTester:
                 elif data["service"] == "LLM":
                     if response.status_code == 200:
                         response_text = response.text
-                        print("LLM raw response:", response_text)
+                        self.log("LLM raw response:", response_text)
                         try:
                             response_json = json.loads(response_text)
                             assistant_response = response_json.get("response", "")
-                            print("Assistant response:", assistant_response)
+                            self.log("Assistant response:", assistant_response)
                             result = "\n".join(re.findall(r'<ASSISTANT>:\s*(.*?)\n', assistant_response))
-                            print("Processed LLM response text:", result)
+                            self.log("Processed LLM response text:", result)
                         except json.JSONDecodeError:
                             print("Error decoding JSON response.")
                             result = "Error processing response."
@@ -97,7 +155,7 @@ class AsyncTester:
                 else data.get("query", "default_value")
             )
 
-            self.results.append({
+            row = {
                 "Test ID": data['test_id'],
                 "request_id": data['request_id'],
                 "Question Number": data['index'],
@@ -107,21 +165,129 @@ class AsyncTester:
                 "Session ID": data['uniqueId'],
                 "Query": data['input_file'] if data["service"] == "stt" else data['inputData']["question"] if data["service"] == "LLM" else data.get("query", "default_value"),
                 "Latency (seconds)": latency,
+                "Send Lag (seconds)": start_time - scheduled_time,
+                "Corrected Latency (seconds)": corrected_latency,
                 "Response": result,
                 "Status Code": f"{response.status_code} {HTTPStatus(response.status_code).phrase}"
-            })
+            }
+            if stream_result is not None:
+                row.update(self.record_stream_metrics(stream_result))
+            self.results.append(row)
 
             await self.task_queue.put(data['request_id'])
             return response, 200
 
 
+    async def fetch_stream(self, client, url, data):
+        """
+        Send the request and consume the response as it arrives (SSE events or raw chunks),
+        recording when each chunk is received.
+        """
+        loop = asyncio.get_event_loop()
+        send_time = loop.time()
+        chunk_times = []
+        chunks = []
+        usage_tokens = None
+        async with client.stream("POST", url, json=data) as response:
+            if response.status_code >= 400:
+                # Read the body so the error handler can print it
+                await response.aread()
+            response.raise_for_status()
+
+            if "text/event-stream" in response.headers.get("content-type", ""):
+                async for line in response.aiter_lines():
+                    # Only "data:" lines carry content; comments, event names and ids are skipped
+                    if not line.startswith("data:"):
+                        continue
+                    payload = line[5:].strip()
+                    if payload == "[DONE]":
+                        break
+                    text, tokens = self.parse_stream_chunk(payload)
+                    usage_tokens = tokens or usage_tokens
+                    if text:
+                        chunk_times.append(loop.time())
+                        chunks.append(text)
+            else:
+                async for text in response.aiter_text():
+                    if text:
+                        chunk_times.append(loop.time())
+                        chunks.append(text)
+
+        return response, {
+            "text": "".join(chunks),
+            "send_time": send_time,
+            "chunk_times": chunk_times,
+            "usage_tokens": usage_tokens
+        }
+
+    @staticmethod
+    def parse_stream_chunk(payload: str):
+        """
+        Extract the generated text and, when the server reports it, the completion token count
+        from one SSE event. Plain-text events are returned as they are.
+        """
+        try:
+            event = json.loads(payload)
+        except json.JSONDecodeError:
+            return payload, None
+        if not isinstance(event, dict):
+            return str(event), None
+
+        usage_tokens = (event.get("usage") or {}).get("completion_tokens")
+        if event.get("choices"):
+            # OpenAI-compatible servers (vLLM, TGI, llama.cpp)
+            choice = event["choices"][0]
+            text = (choice.get("delta") or {}).get("content") or choice.get("text") or ""
+        else:
+            text = event.get("response") or event.get("token") or event.get("text") or event.get("content") or ""
+            if isinstance(text, dict):
+                text = text.get("text", "")
+        return text, usage_tokens
+
+    def record_stream_metrics(self, stream_result):
+        """Compute the per-request streaming metrics and add them to the payload set histograms."""
+        chunk_times = stream_result["chunk_times"]
+        if not chunk_times:
+            return {"TTFT (seconds)": None, "Output Tokens": 0}
+
+        ttft = chunk_times[0] - stream_result["send_time"]
+        gaps = [later - earlier for earlier, later in zip(chunk_times, chunk_times[1:])]
+        # Without a usage count from the server every streamed chunk is counted as one token
+        output_tokens = stream_result["usage_tokens"] or len(chunk_times)
+        decode_time = chunk_times[-1] - chunk_times[0]
+        decode_throughput = (output_tokens - 1) / decode_time if decode_time > 0 else None
+
+        self.stream_stats["ttft"].record(ttft)
+        for gap in gaps:
+            self.stream_stats["inter_token"].record(gap)
+        if decode_throughput is not None:
+            self.stream_stats["decode_throughput_sum"] += decode_throughput
+            self.stream_stats["decode_count"] += 1
+
+        return {
+            "TTFT (seconds)": ttft,
+            "Mean Inter-Token Latency (seconds)": sum(gaps) / len(gaps) if gaps else None,
+            "Max Inter-Token Gap (seconds)": max(gaps) if gaps else None,
+            "Output Tokens": output_tokens,
+            "Decode Throughput (tokens/second)": decode_throughput
+        }
+
+    @staticmethod
+    def new_stream_stats():
+        return {
+            "ttft": LatencyHistogram(),
+            "inter_token": LatencyHistogram(),
+            "decode_throughput_sum": 0.0,
+            "decode_count": 0
+        }
+
     async def print_status(self):
         total_requests = len(self.query_list)
         completed_requests = 0
         while completed_requests < total_requests:
             await self.task_queue.get()
             completed_requests += 1
-            print(f"Completed {completed_requests}/{total_requests} requests")
+            self.log(f"Completed {completed_requests}/{total_requests} requests")
             self.task_queue.task_done()
 
     async def load_yaml_data(self):
@@ -181,17 +347,26 @@ class AsyncTester:
             total_requests = len(distributed_questions)
             print("Number of distributed requests:", total_requests)
 
-            # Generate a unique test ID
-            test_id = f"{uuid.uuid4().hex[:6]}(input={question_count}, deploy_id={deploy_id}, service={service}, total_requests={total_requests})"
+            # Generate a unique test ID, shared by every worker of a distributed run
+            self.payload_set_count += 1
+            if self.run_id:
+                test_prefix = hashlib.sha1(f"{self.run_id}:{self.payload_set_count}".encode()).hexdigest()[:6]
+            else:
+                test_prefix = uuid.uuid4().hex[:6]
+            test_id = f"{test_prefix}(input={question_count}, deploy_id={deploy_id}, service={service}, total_requests={total_requests})"
             print("Test ID:", test_id)
 
             # Process each question in distributed questions
-            for question in distributed_questions:
+            for position, question in enumerate(distributed_questions):
+                if position % self.worker_count != self.worker_index:
+                    # Sent by another worker
+                    continue
+                request_id = position + 1
                 try:
                     if isinstance(question, dict) and "index" in question and "prompt" in question:
                         index = question.get("index", 0)
                         prompt = question.get("prompt", "")
-                        print("Index:", index, "Prompt:", prompt)
+                        self.log("Index:", index, "Prompt:", prompt)
                         inputData = {"question": prompt}
                         query_content = prompt
                         query = {
@@ -213,7 +388,6 @@ class AsyncTester:
                             query["query"] = query_content
 
                         self.query_list.append(query)
-                        request_id += 1
                     else:
                         print(f"Invalid question format: {question}")
                 except Exception as e:
@@ -230,58 +404,11 @@ class AsyncTester:
 
     async def test_async_endpoint(self):
         try:
-            payloads = await self.load_yaml_data()
-            total_start_time = asyncio.get_event_loop().time()
-            all_throughputs = []
-            all_latency_data = {}
-
-            for payload_key, payload_set in payloads.items():
-                set_start_time = asyncio.get_event_loop().time()
-                await self.generate_query_list(payload_set)
-                
-                # Print the actual distribution of requests
-                self.print_request_distribution(self.query_list)
-
-                async with httpx.AsyncClient() as client:
-                    semaphore = asyncio.Semaphore(self.concurrency_limit)
-                    tasks = [self.fetch_async(client, self.endpoint, query_data, semaphore) 
-                            for query_data in self.query_list]
-                    status_task = asyncio.create_task(self.print_status())
-                    cpu_task = asyncio.create_task(self.monitor_cpu())
-
-                    await asyncio.gather(*tasks)
-                    await self.task_queue.join()
-                    status_task.cancel()
-                    cpu_task.cancel()
-                    try:
-                        await status_task
-                    except asyncio.CancelledError:
-                        pass
-                    try:
-                        await cpu_task
-                    except asyncio.CancelledError:
-                        pass
-
-                set_end_time = asyncio.get_event_loop().time()
-                set_total_time = set_end_time - set_start_time
-                set_throughput = len(self.query_list) / set_total_time if set_total_time > 0 else float('inf')
-                all_throughputs.append(set_throughput)
-                all_latency_data[payload_key] = self.latencies.copy()
-
-                print(f"Total time for set {payload_key}: {set_total_time:.2f} seconds")
-                print(f"Throughput for set {payload_key}: {set_throughput:.2f} requests/second")
-
-                self.latencies.clear()
-                self.query_list.clear()
-
-            total_end_time = asyncio.get_event_loop().time()
-            total_time = total_end_time - total_start_time
-            print(f"Total time taken for all sets: {total_time:.2f} seconds")
+            all_throughputs = await self.run_payload_sets()
 
-            percentiles_to_calculate = [50, 75, 90.5, 95, 99]
             latency_percentiles = {}
-            for key, latencies in all_latency_data.items():
-                latency_percentiles[key] = self.calculate_latency_percentiles(latencies, percentiles_to_calculate)
+            for key, histogram in self.latency_histograms.items():
+                latency_percentiles[key] = self.calculate_latency_percentiles(histogram, self.percentiles)
                 print(f"Latency Percentiles for {key}: {latency_percentiles[key]}")
 
             self.format_results(all_throughputs, latency_percentiles)
@@ -291,6 +418,142 @@ class AsyncTester:
             print(f"An error occurred in test_async_endpoint: {e}")
             raise e
 
+    async def run_payload_sets(self):
+        """Send the queries of every payload set and return the throughput of each set."""
+        payloads = await self.load_yaml_data()
+        # Shared, pre-tuned connection pool; connections are opened before the timed window starts
+        client = get_async_client()
+        await warm_up(client, self.endpoint)
+        total_start_time = asyncio.get_event_loop().time()
+        all_throughputs = []
+
+        for payload_key, payload_set in payloads.items():
+            set_start_time = asyncio.get_event_loop().time()
+            # Loop time is per process, the offset turns it into wall-clock time other workers can compare
+            wall_offset = time.time() - set_start_time
+            await self.generate_query_list(payload_set)
+            
+            # Print the actual distribution of requests
+            self.print_request_distribution(self.query_list)
+
+            status_task = asyncio.create_task(self.print_status())
+            cpu_task = asyncio.create_task(self.monitor_cpu())
+
+            target_rate = None
+            if self.load_profile == "closed":
+                semaphore = asyncio.Semaphore(self.concurrency_limit)
+                tasks = [self.fetch_async(client, self.endpoint, query_data, semaphore) 
+                        for query_data in self.query_list]
+                await asyncio.gather(*tasks)
+            else:
+                target_rate = await self.run_open_loop(client)
+            await self.task_queue.join()
+            status_task.cancel()
+            cpu_task.cancel()
+            try:
+                await status_task
+            except asyncio.CancelledError:
+                pass
+            try:
+                await cpu_task
+            except asyncio.CancelledError:
+                pass
+
+            set_end_time = asyncio.get_event_loop().time()
+            set_total_time = set_end_time - set_start_time
+            set_throughput = len(self.query_list) / set_total_time if set_total_time > 0 else float('inf')
+            all_throughputs.append(set_throughput)
+            self.set_throughputs[payload_key] = set_throughput
+            self.latency_histograms[payload_key] = self.latency_histogram
+            if self.stream:
+                self.all_stream_stats[payload_key] = self.stream_stats
+
+            # Achieved send rate is measured from the actual send times, not the completions
+            send_window = max(self.send_times) - min(self.send_times) if len(self.send_times) > 1 else 0
+            achieved_rate = (len(self.send_times) - 1) / send_window if send_window > 0 else None
+            self.rate_stats[payload_key] = {
+                "load_profile": self.load_profile,
+                "target_rate": target_rate,
+                "achieved_rate": achieved_rate
+            }
+            self.set_windows[payload_key] = {
+                "start": set_start_time + wall_offset,
+                "end": set_end_time + wall_offset,
+                "first_send": min(self.send_times) + wall_offset if self.send_times else None,
+                "last_send": max(self.send_times) + wall_offset if self.send_times else None,
+                "requests": len(self.query_list),
+                "sends": len(self.send_times)
+            }
+
+            print(f"Total time for set {payload_key}: {set_total_time:.2f} seconds")
+            print(f"Throughput for set {payload_key}: {set_throughput:.2f} requests/second")
+            print(f"Send rate for set {payload_key}: {self.rate_stats[payload_key]}")
+
+            self.latency_histogram = LatencyHistogram()
+            self.stream_stats = self.new_stream_stats()
+            self.send_times.clear()
+            self.query_list.clear()
+
+        total_end_time = asyncio.get_event_loop().time()
+        total_time = total_end_time - total_start_time
+        print(f"Total time taken for all sets: {total_time:.2f} seconds")
+
+        return all_throughputs
+
+    async def run_open_loop(self, client):
+        """
+        Send every query at its scheduled time, regardless of how long earlier requests take.
+        Returns the request rate the schedule was built for.
+        """
+        loop = asyncio.get_event_loop()
+        offsets = self.build_send_schedule(len(self.query_list))
+        # No concurrency cap in open-loop mode, the schedule alone decides the offered load
+        semaphore = asyncio.Semaphore(max(len(self.query_list), 1))
+        tasks = []
+        start = loop.time()
+        for query_data, offset in zip(self.query_list, offsets):
+            scheduled_time = start + offset
+            delay = scheduled_time - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(
+                self.fetch_async(client, self.endpoint, query_data, semaphore, scheduled_time)
+            ))
+        await asyncio.gather(*tasks)
+
+        if len(offsets) > 1 and offsets[-1] > 0:
+            return (len(offsets) - 1) / offsets[-1]
+        return self.target_rps
+
+    def build_send_schedule(self, request_count: int) -> List[float]:
+        """
+        Build the send offsets (seconds from the start of the set) for the configured load profile.
+        """
+        offsets = []
+        elapsed = 0.0
+        for i in range(request_count):
+            if self.load_profile == "constant":
+                elapsed = i / self.target_rps
+            elif self.load_profile == "poisson":
+                # Exponential inter-arrival times give a Poisson arrival process
+                if i > 0:
+                    elapsed += random.expovariate(self.target_rps)
+            elif self.load_profile == "step":
+                # Rate increases from target_rps to end_rps in ramp_steps equal blocks of requests
+                step = min(i * self.ramp_steps // request_count, self.ramp_steps - 1)
+                fraction = step / (self.ramp_steps - 1) if self.ramp_steps > 1 else 0
+                rate = self.target_rps + (self.end_rps - self.target_rps) * fraction
+                if i > 0:
+                    elapsed += 1 / rate
+            elif self.load_profile == "ramp":
+                # Rate changes linearly from target_rps to end_rps over the whole set
+                fraction = i / (request_count - 1) if request_count > 1 else 0
+                rate = self.target_rps + (self.end_rps - self.target_rps) * fraction
+                if i > 0:
+                    elapsed += 1 / rate
+            offsets.append(elapsed)
+        return offsets
+
     from typing import List, Dict, Any
 
     def calculate_distributed_requests(self, payload_set: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -318,8 +581,7 @@ class AsyncTester:
                     })
 
             # Shuffle the queries to avoid clustering
-            import random
-            random.shuffle(distributed_queries)
+            random.Random(self.run_id).shuffle(distributed_queries)
             return distributed_queries
 
         except ValueError as e:
@@ -337,17 +599,18 @@ class AsyncTester:
             prompt = query['inputData']["question"] if self.config_type == "LLM" else query.get("query", "")
             distribution_count[prompt] = distribution_count.get(prompt, 0) + 1
         
-        print("\nActual Request Distribution:")
+        self.log("\nActual Request Distribution:")
         for prompt, count in distribution_count.items():
             percentage = (count / len(query_list)) * 100
-            print(f"Prompt: {prompt}")
-            print(f"Count: {count} ({percentage:.1f}%)\n")
+            self.log(f"Prompt: {prompt}")
+            self.log(f"Count: {count} ({percentage:.1f}%)\n")
 
     async def monitor_cpu(self):
         try:
             while True:
-                cpu_percent = psutil.cpu_percent(interval=1)
-                print(f"Current CPU usage: {cpu_percent}%")
+                # interval=None is non-blocking (usage since the previous call), interval=1 would stall the event loop
+                cpu_percent = psutil.cpu_percent(interval=None)
+                self.log(f"Current CPU usage: {cpu_percent}%")
                 await asyncio.sleep(1)
         except asyncio.CancelledError:
             print("CPU monitoring task was cancelled.")
@@ -356,12 +619,105 @@ class AsyncTester:
             return 0.0
         return statistics.mean(self.latencies)'''
 
-    def calculate_latency_percentiles(self, latencies, percentiles=None):
-        if not latencies:
+    def calculate_latency_percentiles(self, histogram: LatencyHistogram, percentiles=None):
+        if histogram.total_count == 0:
             return {}
-        sorted_latencies = sorted(latencies)
-        percentile_values = {p: np.percentile(sorted_latencies, p) for p in percentiles}
-        return percentile_values
+        return histogram.percentiles(percentiles or self.percentiles)
+
+    def export_shard(self):
+        """
+        Everything a coordinator needs to merge this worker's share of a distributed run:
+        the unformatted rows plus mergeable histograms and counters per payload set.
+        """
+        return {
+            "worker_index": self.worker_index,
+            "rows": self.results,
+            "rate_stats": self.rate_stats,
+            "windows": self.set_windows,
+            "latency_histograms": {key: histogram.to_dict() for key, histogram in self.latency_histograms.items()},
+            "stream_stats": {
+                key: {
+                    "ttft": stats["ttft"].to_dict(),
+                    "inter_token": stats["inter_token"].to_dict(),
+                    "decode_throughput_sum": stats["decode_throughput_sum"],
+                    "decode_count": stats["decode_count"]
+                }
+                for key, stats in self.all_stream_stats.items()
+            }
+        }
+
+    def merge_shards(self, shards: List[Dict[str, Any]]):
+        """
+        Combine the exported shards of all workers into the same results shape as test_async_endpoint.
+        Throughput and achieved rate are measured over the window from the first shard's start to the last
+        shard's end, so shards that ran one after another (fewer queue workers than shards) are not counted
+        as concurrent. Target rates are the configured split of the run's rate and add up.
+        """
+        windows = {}
+        for shard in sorted(shards, key=lambda item: item["worker_index"]):
+            self.results.extend(shard["rows"])
+            for key, window in shard["windows"].items():
+                windows.setdefault(key, []).append(window)
+            for key, histogram in shard["latency_histograms"].items():
+                self.latency_histograms.setdefault(key, LatencyHistogram()).merge(LatencyHistogram.from_dict(histogram))
+            for key, stats in shard["rate_stats"].items():
+                merged = self.rate_stats.setdefault(key, {"load_profile": stats["load_profile"], "target_rate": None, "achieved_rate": None})
+                if stats.get("target_rate") is not None:
+                    merged["target_rate"] = (merged["target_rate"] or 0) + stats["target_rate"]
+            for key, stats in shard["stream_stats"].items():
+                merged = self.all_stream_stats.setdefault(key, self.new_stream_stats())
+                merged["ttft"].merge(LatencyHistogram.from_dict(stats["ttft"]))
+                merged["inter_token"].merge(LatencyHistogram.from_dict(stats["inter_token"]))
+                merged["decode_throughput_sum"] += stats["decode_throughput_sum"]
+                merged["decode_count"] += stats["decode_count"]
+
+        throughputs = {}
+        for key, shard_windows in windows.items():
+            total_time = max(window["end"] for window in shard_windows) - min(window["start"] for window in shard_windows)
+            requests = sum(window["requests"] for window in shard_windows)
+            throughputs[key] = requests / total_time if total_time > 0 else float('inf')
+            sent = [window for window in shard_windows if window["first_send"] is not None]
+            send_window = max(window["last_send"] for window in sent) - min(window["first_send"] for window in sent) if sent else 0
+            if key in self.rate_stats:
+                self.rate_stats[key]["achieved_rate"] = (sum(window["sends"] for window in sent) - 1) / send_window if send_window > 0 else None
+
+        # Keep the payload sets in order, and the requests of each set in send order
+        test_order = {}
+        for row in self.results:
+            test_order.setdefault(row["Test ID"], len(test_order))
+        self.results.sort(key=lambda row: (test_order[row["Test ID"]], row["request_id"]))
+        latency_percentiles = {
+            key: self.calculate_latency_percentiles(histogram) for key, histogram in self.latency_histograms.items()
+        }
+        self.set_throughputs = throughputs
+        self.format_results(list(throughputs.values()), latency_percentiles)
+        return self.results
+
+    def get_histogram_summary(self):
+        """
+        Compact histograms for each payload set plus the merge of all of them,
+        so percentiles can be recomputed later without the raw rows.
+        """
+        summary = {key: histogram.to_dict() for key, histogram in self.latency_histograms.items()}
+        summary["overall"] = LatencyHistogram.merge_all(self.latency_histograms.values()).to_dict()
+        return summary
+
+    def get_streaming_histogram_summary(self):
+        """Compact TTFT and inter-token histograms per payload set plus "overall", or None when not streaming."""
+        if not self.stream:
+            return None
+        summary = {}
+        for metric in ["ttft", "inter_token"]:
+            histograms = {key: stats[metric] for key, stats in self.all_stream_stats.items()}
+            summary[metric] = {key: histogram.to_dict() for key, histogram in histograms.items()}
+            summary[metric]["overall"] = LatencyHistogram.merge_all(histograms.values()).to_dict()
+        return summary
+
+    def format_percentiles(self, histogram: LatencyHistogram):
+        percentile_str = ""
+        for p, latency in self.calculate_latency_percentiles(histogram).items():
+            percentile_str += f"{p}th percentile: {latency:.3f} seconds\n"
+        return percentile_str
     
     def format_results(self, throughput, percentile_values):
         # Print throughput values
@@ -391,9 +747,11 @@ class AsyncTester:
             # Initialize payload list if not already done
             payload_key = f"Payload{i+1}"
             updated_results[payload_key] = []
+            rate_stats = self.rate_stats.get(payload_key, {})
+            stream_stats = self.all_stream_stats.get(payload_key)
 
             for entry in data["query_list"]:
-                updated_results[payload_key].append({
+                row = {
                     "Test ID": test_id,  
                     "request_id": entry.get("request_id", ""),
                     "Question Number": entry.get("Question Number", ""),
@@ -404,10 +762,28 @@ class AsyncTester:
                     "Input": entry.get("Query", ""),
                     "Latency (seconds)": entry.get("Latency (seconds)", ""),
                     "Response": entry.get("Response", ""),
+                    "Send Lag (seconds)": entry.get("Send Lag (seconds)", 0),
+                    "Corrected Latency (seconds)": entry.get("Corrected Latency (seconds)", ""),
                     "Throughput (requests/second)": throughput_value,  
+                    "Load Profile": rate_stats.get("load_profile", self.load_profile),
+                    "Target Rate (requests/second)": rate_stats.get("target_rate"),
+                    "Achieved Rate (requests/second)": rate_stats.get("achieved_rate"),
                     "Percentile Latency (seconds)": percentile_latency_str,  
                     "Status Code": entry.get("Status Code", ""),
-                })
+                }
+                if stream_stats is not None:
+                    decode_count = stream_stats["decode_count"]
+                    row.update({
+                        "TTFT (seconds)": entry.get("TTFT (seconds)"),
+                        "Mean Inter-Token Latency (seconds)": entry.get("Mean Inter-Token Latency (seconds)"),
+                        "Max Inter-Token Gap (seconds)": entry.get("Max Inter-Token Gap (seconds)"),
+                        "Output Tokens": entry.get("Output Tokens"),
+                        "Decode Throughput (tokens/second)": entry.get("Decode Throughput (tokens/second)"),
+                        "TTFT Percentiles (seconds)": self.format_percentiles(stream_stats["ttft"]),
+                        "Inter-Token Latency Percentiles (seconds)": self.format_percentiles(stream_stats["inter_token"]),
+                        "Mean Decode Throughput (tokens/second)": stream_stats["decode_throughput_sum"] / decode_count if decode_count else None
+                    })
+                updated_results[payload_key].append(row)
 
         # Update the final results list
         self.results = updated_results
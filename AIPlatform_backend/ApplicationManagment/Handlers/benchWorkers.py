@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import socket
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+from ApplicationManagment.Handlers.asynctester import AsyncTester
+
+logger = logging.getLogger(__name__)
+
+
+def build_shard_kwargs(tester_kwargs: Dict[str, Any], worker_count: int) -> List[Dict[str, Any]]:
+    """
+    AsyncTester arguments for each worker. Every worker builds the same query list and sends
+    every worker_count-th query, so the request rate is split between them as well.
+    """
+    shard_kwargs = []
+    for worker_index in range(worker_count):
+        kwargs = dict(tester_kwargs)
+        kwargs.update({
+            "worker_index": worker_index,
+            "worker_count": worker_count,
+            "target_rps": tester_kwargs.get("target_rps", 0) / worker_count,
+            "end_rps": tester_kwargs.get("end_rps", 0) / worker_count,
+            "verbose": False
+        })
+        shard_kwargs.append(kwargs)
+    return shard_kwargs
+
+
+async def run_shard(tester_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    tester = AsyncTester(**tester_kwargs)
+    await tester.run_payload_sets()
+    return tester.export_shard()
+
+
+def run_shard_in_process(tester_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Process pool entry point: run one worker's share in its own event loop."""
+    return asyncio.run(run_shard(tester_kwargs))
+
+
+async def run_local_shards(shard_kwargs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    loop = asyncio.get_running_loop()
+    # "spawn" gives each worker a clean interpreter instead of a fork of the API process and its Mongo clients
+    with ProcessPoolExecutor(max_workers=len(shard_kwargs), mp_context=multiprocessing.get_context("spawn")) as pool:
+        return await asyncio.gather(*[
+            loop.run_in_executor(pool, run_shard_in_process, kwargs) for kwargs in shard_kwargs
+        ])
+
+
+async def run_queued_shards(mongo_handler, process_id: str, model_id: str, shard_kwargs: List[Dict[str, Any]],
+                            poll_interval: float = 2, timeout: float = None) -> List[Dict[str, Any]]:
+    """
+    Put the shards on the Mongo work queue and wait until benchmark workers on any host have run them.
+    The payload file must be readable at the same path on the worker hosts.
+    Raises when a shard fails, runs out of attempts, or the shards are not all done within timeout seconds.
+    """
+    await mongo_handler.insert_work_items(process_id, model_id, shard_kwargs)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout if timeout else None
+    max_attempts = mongo_handler.config["WORK_QUEUE_MAX_ATTEMPTS"]
+    try:
+        while True:
+            items = await mongo_handler.get_work_items(process_id, model_id)
+            failed = [item for item in items if item["status"] == "Failed"]
+            if failed:
+                raise RuntimeError(f"Benchmark shard {failed[0]['shard_index']} failed: {failed[0].get('error')}")
+            now = datetime.utcnow()
+            lost = [
+                item for item in items
+                if item["status"] == "In Progress" and item.get("attempts", 0) >= max_attempts
+                and item.get("lease_until") is not None and item["lease_until"] < now
+            ]
+            if lost:
+                raise RuntimeError(f"Benchmark shard {lost[0]['shard_index']} lost its worker {max_attempts} times")
+            if items and all(item["status"] == "Completed" for item in items):
+                break
+            if deadline is not None and loop.time() > deadline:
+                raise TimeoutError(f"Benchmark shards of model {model_id} not done after {timeout} seconds")
+            await asyncio.sleep(poll_interval)
+    except BaseException:
+        # Nobody will merge what is left, keep workers from picking it up
+        await mongo_handler.cancel_work_items(process_id, model_id)
+        await mongo_handler.delete_work_item_rows(await mongo_handler.get_work_items(process_id, model_id))
+        raise
+
+    shards = []
+    for item in items:
+        shard = dict(item["result"])
+        shard["rows"] = await mongo_handler.get_work_item_rows(item)
+        shards.append(shard)
+    # The merged rows are stored with the model's results, the shard copies are not needed any more
+    await mongo_handler.delete_work_item_rows(items)
+    return shards
+
+
+def merge_shards(tester_kwargs: Dict[str, Any], shards: List[Dict[str, Any]]):
+    """Merge worker shards into the BenchResults shape, plus the merged histogram summaries."""
+    tester = AsyncTester(**tester_kwargs)
+    data = tester.merge_shards(shards)
+    return data, tester.get_histogram_summary(), tester.get_streaming_histogram_summary()
+
+
+async def run_claimed_shard(mongo_handler, worker_id: str, item: Dict[str, Any], heartbeat_interval: float):
+    """Run a claimed shard, renewing its lease meanwhile; stops it if the shard was taken away."""
+    task = asyncio.create_task(run_shard(item["tester_kwargs"]))
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=heartbeat_interval)
+        if done:
+            break
+        if not await mongo_handler.renew_work_item(item["_id"], worker_id):
+            # Lease lost, or cancelled by the coordinator
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            logger.error(f"Benchmark shard {item['_id']} was taken away from {worker_id}, stopped it")
+            return
+    try:
+        shard = task.result()
+        await mongo_handler.complete_work_item(item, worker_id, shard)
+    except Exception as e:
+        logger.error(f"Benchmark shard {item['_id']} failed: {e}")
+        await mongo_handler.fail_work_item(item["_id"], worker_id, str(e))
+
+
+async def worker_loop(mongo_handler, poll_interval: float, heartbeat_interval: float):
+    """Claim and run benchmark shards from the work queue until stopped."""
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    print(f"Benchmark worker {worker_id} waiting for work")
+    while True:
+        item = await mongo_handler.claim_work_item(worker_id)
+        if item is None:
+            await asyncio.sleep(poll_interval)
+            continue
+        print(f"Worker {worker_id} running shard {item['shard_index']} of process {item['process_id']} (attempt {item['attempts']})")
+        await run_claimed_shard(mongo_handler, worker_id, item, heartbeat_interval)
+
+
+if __name__ == "__main__":
+    # Remote worker: python -m ApplicationManagment.Handlers.benchWorkers
+    from Database.evaluationSetup import MongoDBHandler
+    from db_config import bench_config
+
+    asyncio.run(worker_loop(
+        MongoDBHandler.get_handler(bench_config, None),
+        bench_config["WORK_QUEUE_POLL_SECONDS"],
+        bench_config["WORK_QUEUE_HEARTBEAT_SECONDS"]
+    ))
@@ -4,6 +4,7 @@ import os
 from fastapi import HTTPException, logger
 from ApplicationManagment.Handlers.BenchExcel import ExcelHandler
 from  ApplicationManagment.Handlers.asynctester import AsyncTester
+from ApplicationManagment.Handlers import benchWorkers
 from  ApplicationManagment.Handlers.evaluationHandler import EvaluationHandler
 from utils import Payload, ModelStatus, StatusRecord
 from Database.evaluationSetup import MongoDBHandler
@@ -15,7 +16,7 @@ class BenchmarkHandler:
 
     def __init__(self, org_id: str):
         # Initialize the MongoDB handler with the org_id
-        self.mongo_handler = MongoDBHandler(bench_config, org_id)
+        self.mongo_handler = MongoDBHandler.get_handler(bench_config, org_id)
     task_statuses = {}
     results_path = "C:/Users/Admin/projects/Model_Evaluation/services/Evaluation/results"
         
@@ -32,6 +33,16 @@ class BenchmarkHandler:
         self.client_api_key = self.payload.client_api_key
         self.process_name = self.payload.process_name
         self.total_requests = self.payload.total_requests
+        self.load_profile = self.payload.load_profile
+        self.target_rps = self.payload.target_rps
+        self.end_rps = self.payload.end_rps
+        self.ramp_steps = self.payload.ramp_steps
+        self.percentiles = self.payload.percentiles
+        self.stream = self.payload.stream
+        self.worker_count = self.payload.worker_count
+        self.worker_mode = self.payload.worker_mode
+        # Models of a re-claimed job that an earlier attempt finished, see background_benchmark
+        self.completed_models = set()
         # Lists to store extracted config_id and model_name
         self.config_ids = []
         self.model_names = []
@@ -70,6 +81,10 @@ class BenchmarkHandler:
                 "payload_file_path": self.payload_file_path
             }
             await self.mongoHandler.insert_config_record(config_data)            
+            # Models a re-claimed job already finished keep their stored results and are not run again
+            self.completed_models = await self.mongoHandler.get_completed_model_ids(process_id)
+            for model_id in self.completed_models:
+                BenchmarkHandler.task_statuses[process_id]["models"][model_id] = "Completed"
             
             status_record = {
                 "user_id": self.user_id,
@@ -79,7 +94,7 @@ class BenchmarkHandler:
                     {
                         "model_id": model_id,
                         "model_name": self.model_names[index],
-                        "status": "Not Started"
+                        "status": "Completed" if model_id in self.completed_models else "Not Started"
                     }
                     for index, model_id in enumerate(self.config_ids)
                 ],
@@ -108,36 +123,51 @@ class BenchmarkHandler:
     async def run_benchmarking_process(self, process_id: str, status_record: StatusRecord):
         # Evaluate each model sequentially
         for index, model_id in enumerate(self.config_ids):
+            if model_id in self.completed_models:
+                # Stored by an earlier attempt of this job
+                if index == len(self.config_ids) - 1:
+                    BenchmarkHandler.task_statuses[process_id]["overall_status"] = "Completed"
+                    status_record["overall_status"] = "Completed"
+                continue
             # Update the status of the current model
             BenchmarkHandler.task_statuses[process_id]["models"][model_id] = "In Progress"
             status_record['models'][index]['status']= "In Progress"
-            print("up..status", status_record)
-            await self.mongoHandler.update_status_record(status_record)
+            await self.mongoHandler.queue_model_status(process_id, model_id, "In Progress")
 
             # Perform benchmarking for the current model
-            tester = AsyncTester(
-                self.payload_file_path, self.user_id, self.session_id, 
-                self.endpoint, self.config_type, model_id, self.client_api_key,self.total_requests
-            )
-            
-            result = await tester.test_async_endpoint()  # Await the result of the test
-            data, status_code = result
+            tester_kwargs = self.build_tester_kwargs(process_id, model_id)
+            if self.worker_count > 1:
+                try:
+                    data, latency_histograms, streaming_histograms = await self.run_distributed_benchmark(process_id, model_id, tester_kwargs)
+                    status_code = 200
+                except Exception as e:
+                    # A failed or lost shard fails the model like a failed single-process run
+                    logger.error(f"Distributed benchmark of model {model_id} failed: {e}")
+                    data, status_code = None, 500
+            else:
+                tester = AsyncTester(**tester_kwargs)
+                result = await tester.test_async_endpoint()  # Await the result of the test
+                data, status_code = result
+                latency_histograms = tester.get_histogram_summary()
+                streaming_histograms = tester.get_streaming_histogram_summary()
             
             if status_code == 200:
                 model_name = self.model_names[index]
 
                 # Store results immediately in results_db
-                await self.mongoHandler.update_results_record(process_id, self.process_name, self.user_id, self.config_type, model_id, model_name, data)
+                await self.mongoHandler.update_results_record(process_id, self.process_name, self.user_id, self.config_type, model_id, model_name, data,
+                                                              latency_histograms=latency_histograms,
+                                                              streaming_histograms=streaming_histograms)
                 BenchmarkHandler.task_statuses[process_id]["models"][model_id] = "Completed"
                 status_record['models'][index]['status'] = "Completed"
 
-                await self.mongoHandler.update_status_record(status_record)
+                await self.mongoHandler.queue_model_status(process_id, model_id, "Completed")
 
             else:
                 BenchmarkHandler.task_statuses[process_id]["models"][model_id] = "Failed"
                 status_record['models'][index]['status'] = "Failed"
-                status_record.overall_status = "Failed"
-                await self.mongoHandler.update_status_record(status_record)
+                status_record["overall_status"] = "Failed"
+                await self.mongoHandler.queue_model_status(process_id, model_id, "Failed", "Failed")
                 break  # Exit the loop if evaluation fails
 
             # Update overall status if all models are processed
@@ -169,6 +199,39 @@ class BenchmarkHandler:
         # Return final status and results
         return {"status": BenchmarkHandler.task_statuses[process_id], "detail": "Benchmark completed", "result": all_results}
 
+    def build_tester_kwargs(self, process_id: str, model_id: str):
+        return {
+            "payload_file_path": self.payload_file_path,
+            "user_id": self.user_id,
+            "session_id": self.session_id,
+            "endpoint": self.endpoint,
+            "config_type": self.config_type,
+            "config_id": model_id,
+            "client_api_key": self.client_api_key,
+            "total_requests": self.total_requests,
+            "load_profile": self.load_profile,
+            "target_rps": self.target_rps,
+            "end_rps": self.end_rps,
+            "ramp_steps": self.ramp_steps,
+            "percentiles": self.percentiles,
+            "stream": self.stream,
+            # Same seed on every worker, so they all shuffle the query list the same way
+            "run_id": f"{process_id}:{model_id}" if self.worker_count > 1 else None
+        }
+
+    async def run_distributed_benchmark(self, process_id: str, model_id: str, tester_kwargs: dict):
+        """Fan the benchmark of one model out to worker_count workers and merge what they send back."""
+        shard_kwargs = benchWorkers.build_shard_kwargs(tester_kwargs, self.worker_count)
+        if self.worker_mode == "queue":
+            shards = await benchWorkers.run_queued_shards(
+                self.mongoHandler, process_id, model_id, shard_kwargs,
+                bench_config["WORK_QUEUE_POLL_SECONDS"], bench_config["WORK_QUEUE_TIMEOUT_SECONDS"]
+            )
+        else:
+            shards = await benchWorkers.run_local_shards(shard_kwargs)
+        print(f"Merging {len(shards)} benchmark shards for model {model_id}")
+        return benchWorkers.merge_shards(tester_kwargs, shards)
+
     @staticmethod
     async def get_status_details(process_id: str, service: str):
         print("details are", process_id,service)
@@ -199,7 +262,7 @@ class BenchmarkHandler:
             #return model_statuses, overall_status
         else:
             # Get the MongoDB handler based on the service
-            mongo_handler = await MongoDBHandler.get_mongo_handler(service)
+            mongo_handler = await MongoDBHandler.get_mongo_handler(service, None)
             # Check for statuses in the database if not found in task_statuses
             db_status, overall_status = await mongo_handler.get_model_statuses_by_process_id(process_id)
             # Extracting overall_status
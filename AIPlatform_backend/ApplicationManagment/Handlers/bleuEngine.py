@@ -0,0 +1,110 @@
+import math
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+
+from ApplicationManagment.Handlers.scoringPool import is_large, map_chunks
+
+MAX_ORDER = 4
+# Epsilon of nltk's SmoothingFunction().method1
+EPSILON = 0.1
+
+
+def bleu_from_counts(numerators: Sequence[int], denominators: Sequence[int], hyp_length: int, ref_length: int,
+                     order: int) -> float:
+    """
+    Cumulative BLEU-`order` (uniform weights) with method1 smoothing, as nltk's corpus_bleu computes it
+    from the clipped n-gram matches, the n-gram totals and the hypothesis/closest reference lengths.
+    """
+    if numerators[0] == 0:
+        return 0.0
+    if hyp_length > ref_length:
+        brevity_penalty = 1.0
+    elif hyp_length == 0:
+        brevity_penalty = 0.0
+    else:
+        brevity_penalty = math.exp(1 - ref_length / hyp_length)
+    weight = 1. / order
+    log_precisions = (
+        weight * math.log((numerators[i] or EPSILON) / denominators[i]) for i in range(order)
+    )
+    return brevity_penalty * math.exp(math.fsum(log_precisions))
+
+
+class BleuEngine:
+    """
+    BLEU-1..4 of tokenized prediction/reference pairs, matching nltk's sentence_bleu and corpus_bleu
+    with SmoothingFunction().method1.
+
+    The 1..4-gram counts of every distinct token sequence are built once and shared by the four cumulative
+    scores, and the same clipped counts are summed for the corpus-level score.
+    """
+
+    def __init__(self):
+        self.counts = {}
+
+    def ngram_counts(self, tokens: Sequence[str]) -> List[Counter]:
+        key = tuple(tokens)
+        counts = self.counts.get(key)
+        if counts is None:
+            counts = [Counter(zip(*[key[k:] for k in range(n)])) for n in range(1, MAX_ORDER + 1)]
+            self.counts[key] = counts
+        return counts
+
+    def pair_counts(self, hypothesis: Sequence[str], reference: Sequence[str]) -> Tuple[List[int], List[int]]:
+        """Clipped matches and (at least 1) totals of the hypothesis n-grams, per order."""
+        hypothesis_counts = self.ngram_counts(hypothesis)
+        reference_counts = self.ngram_counts(reference)
+        numerators = [sum((hyp & ref).values()) for hyp, ref in zip(hypothesis_counts, reference_counts)]
+        denominators = [max(1, len(hypothesis) - n + 1) for n in range(1, MAX_ORDER + 1)]
+        return numerators, denominators
+
+    def sums(self, prediction_tokens: List[List[str]], reference_tokens: List[List[str]]):
+        """Sums of the sentence BLEU-1..4 and the corpus totals of a set of pairs."""
+        sentence_sums = [0.0] * MAX_ORDER
+        corpus_numerators = [0] * MAX_ORDER
+        corpus_denominators = [0] * MAX_ORDER
+        hyp_lengths = ref_lengths = 0
+        for hypothesis, reference in zip(prediction_tokens, reference_tokens):
+            numerators, denominators = self.pair_counts(hypothesis, reference)
+            for order in range(1, MAX_ORDER + 1):
+                sentence_sums[order - 1] += bleu_from_counts(
+                    numerators, denominators, len(hypothesis), len(reference), order
+                )
+            for i in range(MAX_ORDER):
+                corpus_numerators[i] += numerators[i]
+                corpus_denominators[i] += denominators[i]
+            hyp_lengths += len(hypothesis)
+            ref_lengths += len(reference)
+        return sentence_sums, corpus_numerators, corpus_denominators, hyp_lengths, ref_lengths
+
+
+def _sum_chunk(prediction_tokens: List[List[str]], reference_tokens: List[List[str]]):
+    """Process pool entry point: sentence score sums and corpus totals of one chunk of pairs."""
+    return BleuEngine().sums(prediction_tokens, reference_tokens)
+
+
+def bleu_scores(prediction_tokens: List[List[str]], reference_tokens: List[List[str]]) -> Dict[str, float]:
+    """
+    Mean sentence BLEU-1..4 ("bleu-n") and corpus BLEU-1..4 ("corpus-bleu-n") of tokenized pairs,
+    one reference per prediction. Large sets are counted in chunks across processes.
+    """
+    count = min(len(prediction_tokens), len(reference_tokens))
+    if is_large(count):
+        chunks = map_chunks(_sum_chunk, count, prediction_tokens, reference_tokens)
+    else:
+        chunks = [BleuEngine().sums(prediction_tokens, reference_tokens)]
+
+    sentence_sums = [math.fsum(chunk[0][i] for chunk in chunks) for i in range(MAX_ORDER)]
+    numerators = [sum(chunk[1][i] for chunk in chunks) for i in range(MAX_ORDER)]
+    denominators = [sum(chunk[2][i] for chunk in chunks) for i in range(MAX_ORDER)]
+    hyp_lengths = sum(chunk[3] for chunk in chunks)
+    ref_lengths = sum(chunk[4] for chunk in chunks)
+
+    scores = {}
+    for order in range(1, MAX_ORDER + 1):
+        scores[f"bleu-{order}"] = sentence_sums[order - 1] / count if count else 0.0
+    for order in range(1, MAX_ORDER + 1):
+        scores[f"corpus-bleu-{order}"] = bleu_from_counts(
+            numerators, denominators, hyp_lengths, ref_lengths, order
+        ) if count else 0.0
+    return scores
@@ -0,0 +1,203 @@
+import hashlib
+import logging
+import math
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List
+import numpy as np
+from bson import Binary
+from pymongo import ASCENDING, UpdateOne
+from pymongo.errors import PyMongoError
+from Database.connectionRegistry import get_client
+from db_config import embedding_cache_config
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class EmbeddingCache:
+    """
+    Content-addressed cache of float32 arrays, keyed by (namespace, hash of the normalized text).
+
+    The namespace identifies whatever produced the array (e.g. the embedding model name), so vectors of
+    different models never mix. Lookups go to an in-process LRU bounded in bytes first, then to an optional
+    Mongo collection of packed vectors shared by every process and host, evicted least recently used once the
+    collection's data size passes its budget.
+    Arrays may have any shape, so token-level embeddings can be cached as well as sentence vectors.
+    """
+
+    def __init__(self, namespace: str, memory_bytes: int, collection=None, persistent_bytes: int = 0):
+        self.namespace = namespace
+        self.memory_limit = memory_bytes
+        self.memory = OrderedDict()
+        self.memory_used = 0
+        self.collection = collection if persistent_bytes > 0 else None
+        self.persistent_limit = persistent_bytes
+        self.stats = {
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "persistent_evictions": 0
+        }
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(text) -> str:
+        """Unicode NFC with collapsed whitespace; case is kept since most models are case-sensitive."""
+        text = "" if text is None else str(text)
+        return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+    def key(self, text: str) -> str:
+        digest = hashlib.sha1(self.normalize(text).encode("utf-8")).hexdigest()
+        return f"{self.namespace}:{digest}"
+
+    def get_many(self, texts: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Return the cached arrays of the given texts, keyed by text; texts that are not cached are left out."""
+        keys = {}
+        for text in texts:
+            keys.setdefault(self.key(text), text)
+        found = {}
+        with self._lock:
+            for key in list(keys):
+                array = self.memory.get(key)
+                if array is not None:
+                    self.memory.move_to_end(key)
+                    found[keys.pop(key)] = array
+            self.stats["memory_hits"] += len(found)
+
+        if keys and self.collection is not None:
+            persistent = self._load(list(keys))
+            with self._lock:
+                for key, array in persistent.items():
+                    found[keys.pop(key)] = array
+                    self._remember(key, array)
+                self.stats["persistent_hits"] += len(persistent)
+
+        with self._lock:
+            self.stats["misses"] += len(keys)
+        return found
+
+    def put_many(self, arrays: Dict[str, np.ndarray]):
+        """Cache freshly computed arrays, keyed by text."""
+        entries = {self.key(text): np.asarray(array, dtype=np.float32) for text, array in arrays.items()}
+        with self._lock:
+            for key, array in entries.items():
+                self._remember(key, array)
+        if entries and self.collection is not None:
+            self._store(entries)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_entries"] = len(self.memory)
+            stats["memory_bytes"] = self.memory_used
+        lookups = stats["memory_hits"] + stats["persistent_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["persistent_hits"]) / lookups if lookups else 0
+        return stats
+
+    def _remember(self, key: str, array: np.ndarray):
+        previous = self.memory.pop(key, None)
+        if previous is not None:
+            self.memory_used -= previous.nbytes
+        self.memory[key] = array
+        self.memory_used += array.nbytes
+        while self.memory_used > self.memory_limit and len(self.memory) > 1:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_used -= evicted.nbytes
+            self.stats["memory_evictions"] += 1
+
+    def _load(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        try:
+            documents = list(self.collection.find({"_id": {"$in": keys}}, {"vector": 1, "shape": 1}))
+            if documents:
+                # Refresh recency so frequently used payloads survive eviction
+                self.collection.update_many(
+                    {"_id": {"$in": [document["_id"] for document in documents]}},
+                    {"$set": {"last_used": datetime.utcnow()}}
+                )
+        except PyMongoError as e:
+            logger.warning(f"Embedding cache lookup failed, encoding instead: {e}")
+            return {}
+        return {
+            document["_id"]: np.frombuffer(document["vector"], dtype=np.float32).reshape(document["shape"])
+            for document in documents
+        }
+
+    def _store(self, entries: Dict[str, np.ndarray]):
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {"_id": key},
+                {"$set": {
+                    "namespace": self.namespace,
+                    "vector": Binary(array.tobytes()),
+                    "shape": list(array.shape),
+                    "last_used": now
+                }},
+                upsert=True
+            )
+            for key, array in entries.items()
+        ]
+        try:
+            self.collection.bulk_write(operations, ordered=False)
+            self._evict_persistent()
+        except PyMongoError as e:
+            logger.warning(f"Embedding cache write failed: {e}")
+
+    def _evict_persistent(self):
+        # Data size and average document size as the server tracks them, without scanning the collection
+        stats = next(self.collection.aggregate([{"$collStats": {"storageStats": {}}}]))["storageStats"]
+        excess = stats.get("size", 0) - self.persistent_limit
+        if excess <= 0 or not stats.get("avgObjSize"):
+            return
+        # A vector document is dim x 4 bytes plus its key and shape, the average covers every model in the collection
+        count = math.ceil(excess / stats["avgObjSize"])
+        oldest = [
+            document["_id"]
+            for document in self.collection.find({}, {"_id": 1}).sort("last_used", ASCENDING).limit(count)
+        ]
+        result = self.collection.delete_many({"_id": {"$in": oldest}})
+        with self._lock:
+            self.stats["persistent_evictions"] += result.deleted_count
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+_collection = None
+
+
+def _get_collection():
+    global _collection
+    if _collection is None:
+        client = get_client(embedding_cache_config["MONGO_URI"])
+        _collection = client[embedding_cache_config["DB_NAME"]][embedding_cache_config["COLLECTION"]]
+        _collection.create_index([("last_used", ASCENDING)])
+    return _collection
+
+
+def get_embedding_cache(namespace: str) -> EmbeddingCache:
+    """Return the process-wide cache of a namespace, or None when caching is disabled."""
+    if not embedding_cache_config["ENABLED"]:
+        return None
+    with _caches_lock:
+        cache = _caches.get(namespace)
+        if cache is None:
+            collection = None
+            if embedding_cache_config["PERSISTENT_MB"] > 0:
+                try:
+                    collection = _get_collection()
+                except PyMongoError as e:
+                    logger.warning(f"Embedding cache collection unavailable, using the in-memory tier only: {e}")
+            cache = EmbeddingCache(
+                namespace,
+                embedding_cache_config["MEMORY_MB"] * 1024 * 1024,
+                collection,
+                embedding_cache_config["PERSISTENT_MB"] * 1024 * 1024
+            )
+            _caches[namespace] = cache
+        return cache
@@ -0,0 +1,89 @@
+import logging
+import threading
+from typing import List
+import numpy as np
+import torch
+from sentence_transformers import SentenceTransformer
+from ApplicationManagment.Handlers.embeddingCache import EmbeddingCache, get_embedding_cache
+from db_config import embedding_config
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingEngine:
+    """
+    Sentence embedding model loaded once per process and shared by every scorer.
+    Texts are encoded in large batches and similarities are computed on the normalized embeddings.
+    Embeddings are cached by content, so answers seen in earlier runs are not encoded again.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, model_name: str, batch_size: int, num_threads: int = 0):
+        if num_threads > 0:
+            torch.set_num_threads(num_threads)
+        self.model_name = model_name
+        self.batch_size = batch_size
+        print(f"Loading embedding model {model_name}")
+        self.model = SentenceTransformer(model_name, device="cpu")
+        # One encode at a time, concurrent callers would only fight over the same CPU threads
+        self._encode_lock = threading.Lock()
+        self.cache = get_embedding_cache(f"sentence:{model_name}")
+
+    @classmethod
+    def get_instance(cls, model_name: str = None) -> "EmbeddingEngine":
+        model_name = model_name or embedding_config["MODEL_NAME"]
+        with cls._instances_lock:
+            engine = cls._instances.get(model_name)
+            if engine is None:
+                engine = cls(model_name, embedding_config["BATCH_SIZE"], embedding_config["NUM_THREADS"])
+                cls._instances[model_name] = engine
+            return engine
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Return unit-length float32 embeddings, one row per text."""
+        texts = ["" if text is None else str(text) for text in texts]
+        if not texts:
+            return np.empty((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+        if self.cache is None:
+            return self._encode(texts)
+
+        # The model sees the original text, normalization only decides which texts share a cache entry
+        keys = [EmbeddingCache.normalize(text) for text in texts]
+        originals = {}
+        for key, text in zip(keys, texts):
+            originals.setdefault(key, text)
+        unique_texts = list(originals.values())
+        embeddings = self.cache.get_many(unique_texts)
+        missing = [text for text in unique_texts if text not in embeddings]
+        if missing:
+            encoded = dict(zip(missing, self._encode(missing)))
+            self.cache.put_many(encoded)
+            embeddings.update(encoded)
+        return np.stack([embeddings[originals[key]] for key in keys])
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        with self._encode_lock, torch.inference_mode():
+            return self.model.encode(
+                texts,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            ).astype(np.float32, copy=False)
+
+    def pairwise_similarity(self, predictions: List[str], references: List[str]) -> np.ndarray:
+        """Cosine similarity of predictions[i] with references[i]."""
+        if len(predictions) != len(references):
+            raise ValueError("Predictions and references must have the same length")
+        if not predictions:
+            return np.empty(0, dtype=np.float32)
+        # Encode both sides in one pass, each distinct text only once
+        unique_texts = list(dict.fromkeys(predictions + references))
+        positions = {text: index for index, text in enumerate(unique_texts)}
+        embeddings = self.encode(unique_texts)
+        prediction_embeddings = embeddings[[positions[text] for text in predictions]]
+        reference_embeddings = embeddings[[positions[text] for text in references]]
+        # Diagonal of the similarity matrix without building the full matrix
+        return np.einsum("ij,ij->i", prediction_embeddings, reference_embeddings)
@@ -8,6 +8,8 @@ import random
 import re
 from typing import List
 import uuid
+import weakref
+import httpx
 import requests
 
 import yaml
@@ -15,12 +17,16 @@ from flask import jsonify
 from utils import Payload, ModelStatus, StatusRecord
 from Database.evaluationSetup import MongoDBHandler
 from ApplicationManagment.Handlers.storeExcel import JSONToExcelConverter
+from ApplicationManagment.Handlers.httpClient import get_async_client
 from db_config import eval_config
 
 logger = logging.getLogger(__name__)
 
 class EvaluationHandler:
     task_statuses = {}
+    # Concurrency budgets shared by every evaluation on an event loop (a Semaphore cannot be used
+    # from another loop): the models evaluated at once and the requests in flight per deployment
+    loop_semaphores = weakref.WeakKeyDictionary()
     results_path = "C:/Users/Admin/projects/Model_Evaluation/services/Evaluation/results"
     def __init__(self, mongoHandler: MongoDBHandler, payload: Payload):
         self.mongoHandler = mongoHandler
@@ -72,6 +78,10 @@ class EvaluationHandler:
                 "payload_file_path": self.payload_file_path
                 }
             await self.mongoHandler.insert_config_record(config_data)
+            # Models a re-claimed job already finished keep their stored results and are not run again
+            completed_models = await self.mongoHandler.get_completed_model_ids(process_id)
+            for model_id in completed_models:
+                EvaluationHandler.task_statuses[process_id]["models"][model_id] = "Completed"
 
             # Create initial status record in the database
             # Create initial status record in the database
@@ -83,7 +93,7 @@ class EvaluationHandler:
                     {
                         "model_id": model_id,
                         "model_name": self.model_names[index],
-                        "status": "Not Started"
+                        "status": "Completed" if model_id in completed_models else "Not Started"
                     }
                     for index, model_id in enumerate(self.config_ids)
                 ],
@@ -94,56 +104,53 @@ class EvaluationHandler:
             # Insert initial status in EvalStatus using MongoDBHandler
             await self.mongoHandler.update_status_record(status_record)
 
-            # Evaluate each model concurrently
+            # Models run concurrently: a process-wide budget caps how many models are evaluated at once,
+            # and fetch_responses caps the requests in flight per deployment
+            model_semaphore = self.get_model_semaphore()
+            status_lock = asyncio.Lock()
+            model_results = {}
+
+            async def set_model_status(index, model_id, status):
+                # Serialise status changes so concurrent completions never write a stale models array
+                async with status_lock:
+                    EvaluationHandler.task_statuses[process_id]["models"][model_id] = status
+                    status_record['models'][index]['status'] = status
+                    await self.mongoHandler.queue_model_status(process_id, model_id, status, "In Progress")
+
             async def evaluate_model(index, model_id):
-                try:
-                    print("id", model_id)
-                    # Update the status of the current model
-                    EvaluationHandler.task_statuses[process_id]["models"][model_id] = "In Progress"
-                    status_record['models'][index]['status'] = "In Progress"
-                    await self.mongoHandler.update_status_record(status_record)
-
-                    # Perform evaluation for the current model
-                    eval_results = await self.select_config_type(model_id)  # Await here
-                    if eval_results.get('status_code') == 200:
-                        # Store results immediately in results_db
-                        model_name = self.model_names[index]
-                        await self.mongoHandler.update_results_record(
-                            process_id, self.process_name, self.user_id, self.config_type, model_id, model_name, eval_results['data']
-                        )
-                        EvaluationHandler.task_statuses[process_id]["models"][model_id] = "Completed"
-                        status_record['models'][index]['status'] = "Completed"
-
-                        #status_record["status_details"][0]["overall_status"] = "Completed"
-                        await self.mongoHandler.update_status_record(status_record)
-                    else:
-                        EvaluationHandler.task_statuses[process_id]["models"][model_id] = "Failed"
-                        status_record['models'][index]['status'] = "Failed"
-                        #status_record["status_details"][0]["overall_status"] = "Failed"
-                        await self.mongoHandler.update_status_record(status_record)
-                        raise Exception("Evaluation failed for model")
-                        
-
-                except Exception as e:
-                    logger.error(f"Error during evaluation of model {model_id}: {e}")
-                    EvaluationHandler.task_statuses[process_id]["models"][model_id] = "Failed"
-                    status_record['models'][index]['status'] = "Failed"
-                    print("task_statuses", EvaluationHandler.task_statuses)
-                    print("status_record", status_record)
-                    #status_record["status_details"][0]["overall_status"] = "Failed"
-                    await self.mongoHandler.update_status_record(status_record)
-                    raise
-
-                
-                    
+                async with model_semaphore:
+                    try:
+                        print("id", model_id)
+                        await set_model_status(index, model_id, "In Progress")
+
+                        # Perform evaluation for the current model
+                        eval_results = await self.select_config_type(model_id)  # Await here
+                        if eval_results.get('status_code') != 200:
+                            raise Exception("Evaluation failed for model")
+                        model_results[index] = eval_results['data']
+                        await set_model_status(index, model_id, "Completed")
+
+                    except Exception as e:
+                        logger.error(f"Error during evaluation of model {model_id}: {e}")
+                        await set_model_status(index, model_id, "Failed")
+                        raise
+
+            pending_models = [(index, model_id) for index, model_id in enumerate(self.config_ids) if model_id not in completed_models]
+            outcomes = await asyncio.gather(
+                *[evaluate_model(index, model_id) for index, model_id in pending_models],
+                return_exceptions=True
+            )
+            for (index, model_id), outcome in zip(pending_models, outcomes):
+                if isinstance(outcome, Exception):
+                    print(f"Error evaluating model {model_id} at index {index}: {outcome}")
+
+            # Store results once every model has finished, in config order
             for index, model_id in enumerate(self.config_ids):
-                try:
-                    # Attempt to run evaluate_model for the current config_id
-                    await evaluate_model(index, model_id)
-                except Exception as e:
-                    # Log or handle the error if evaluate_model fails
-                    print(f"Error evaluating model {model_id} at index {index}: {e}")
-                        
+                if index in model_results:
+                    await self.mongoHandler.update_results_record(
+                        process_id, self.process_name, self.user_id, self.config_type, model_id, self.model_names[index], model_results[index]
+                    )
+
             # Check if all model statuses are "Completed"
             if all(status == "Completed" for status in EvaluationHandler.task_statuses[process_id]["models"].values()):
                 EvaluationHandler.task_statuses[process_id]["overall_status"] = "Completed"
@@ -227,37 +234,92 @@ class EvaluationHandler:
             test_id = str(uuid.uuid4())
             user_responses = {"responses": []}
 
-            loop = asyncio.get_running_loop()
-            
-            # Prepare tasks for each question using run_in_executor
+            client = get_async_client()
+            semaphore = self.get_deployment_semaphore(deploy_id)
             response_tasks = [
-                loop.run_in_executor(None, self._post_request, self._prepare_request_data(q.get("query", ""), deploy_id))
+                self._post_with_retry(client, semaphore, self._prepare_request_data(q.get("query", ""), deploy_id))
                 for q in payload_questions
             ]
-            
-            # Gather results
-            responses = await asyncio.gather(*response_tasks, return_exceptions=True)
-
-            for question_data, response in zip(payload_questions, responses):
-                if isinstance(response, Exception):
-                    logger.error(f"Request failed: {response}")
-                    raise HTTPException(status_code=500, detail="Request failed")
-
-                if response.status_code == 200:
-                    formatted_response = self.format_responses(
-                        question_data.get("query", ""), response.json(), test_id, response.status_code
-                    )
-                    user_responses['responses'].append(formatted_response)
+            responses = await asyncio.gather(*response_tasks)
+
+            # A failed question is kept as a failed row instead of discarding the whole payload set
+            failed_count = 0
+            for question_data, (response, error) in zip(payload_questions, responses):
+                question = question_data.get("query", "")
+                response_json = None
+                if response is not None and response.status_code == 200:
+                    try:
+                        response_json = response.json()
+                    except ValueError as e:
+                        error = f"Invalid JSON response: {e}"
+
+                if response_json is not None:
+                    formatted_response = self.format_responses(question, response_json, test_id, response.status_code)
                 else:
-                    logger.error(f"Request failed with status {response.status_code}")
-                    raise HTTPException(status_code=500, detail="Request failed")
+                    failed_count += 1
+                    status_code = response.status_code if response is not None else 500
+                    error = error or f"Request failed with status {status_code}"
+                    logger.error(f"Question failed for deployment {deploy_id}: {error}")
+                    formatted_response = self.format_failed_response(question, test_id, status_code, error)
+                user_responses['responses'].append(formatted_response)
 
-            return {"status_code": 200, "response": user_responses}
+            if payload_questions and failed_count == len(payload_questions):
+                return {"status_code": 500, "detail": f"All {failed_count} requests failed", "response": user_responses}
+            return {"status_code": 200, "response": user_responses, "failed_count": failed_count}
 
         except Exception as e:
             logger.error(f"An error occurred: {e}")
             return {"status_code": 500, "detail": str(e)}
 
+    @classmethod
+    def _semaphores(cls):
+        loop = asyncio.get_running_loop()
+        semaphores = cls.loop_semaphores.get(loop)
+        if semaphores is None:
+            semaphores = cls.loop_semaphores[loop] = {
+                "models": asyncio.Semaphore(eval_config["MAX_CONCURRENT_MODELS"]),
+                "deployments": {}
+            }
+        return semaphores
+
+    @classmethod
+    def get_model_semaphore(cls):
+        return cls._semaphores()["models"]
+
+    @classmethod
+    def get_deployment_semaphore(cls, deploy_id):
+        deployments = cls._semaphores()["deployments"]
+        semaphore = deployments.get(deploy_id)
+        if semaphore is None:
+            semaphore = deployments[deploy_id] = asyncio.Semaphore(eval_config["CONCURRENCY_PER_DEPLOYMENT"])
+        return semaphore
+
+    async def _post_with_retry(self, client, semaphore, data):
+        """
+        Post one question, retrying 5xx responses, timeouts and connection errors with jittered
+        exponential backoff. Never raises: returns (response, error) where response is the last
+        response received (or None) and error is None on success.
+        """
+        max_retries = eval_config["MAX_RETRIES"]
+        response = None
+        error = None
+        for attempt in range(max_retries + 1):
+            async with semaphore:
+                try:
+                    response = await client.post(f"{self.endpoint}", json=data)
+                    if response.status_code < 500:
+                        return response, None
+                    error = f"Server error {response.status_code}"
+                except httpx.TransportError as e:
+                    # Timeouts, connection and protocol errors
+                    response = None
+                    error = f"{type(e).__name__}: {e}"
+            if attempt < max_retries:
+                # Full jitter, the deployment slot is released while waiting
+                backoff = min(eval_config["RETRY_BACKOFF_SECONDS"] * 2 ** attempt, eval_config["RETRY_BACKOFF_MAX_SECONDS"])
+                await asyncio.sleep(random.uniform(0, backoff))
+        return response, error
+
 
 
     def _prepare_request_data(self, question, deploy_id):
@@ -312,6 +374,18 @@ class EvaluationHandler:
                 "status_code": 500
             }
 
+    def format_failed_response(self, question, test_id, status_code, error):
+        """Row for a question that did not get a usable response."""
+        return {
+            "test_id": test_id,
+            "user_id": self.user_id,
+            "uniqueId": self.session_id,
+            "query": question,
+            "response": "",
+            "status_code": status_code,
+            "error": error
+        }
+
     def evaluate_stt(self):
         """Handles STT evaluation"""
         try:
@@ -0,0 +1,72 @@
+import asyncio
+import importlib.util
+import logging
+import weakref
+import httpx
+from db_config import http_client_config
+
+logger = logging.getLogger(__name__)
+
+# One AsyncClient per event loop, an AsyncClient cannot be used from another loop
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _limits():
+    return httpx.Limits(
+        max_connections=http_client_config["MAX_CONNECTIONS"],
+        max_keepalive_connections=http_client_config["MAX_KEEPALIVE_CONNECTIONS"],
+        keepalive_expiry=http_client_config["KEEPALIVE_EXPIRY"]
+    )
+
+
+def _timeout():
+    return httpx.Timeout(
+        connect=http_client_config["CONNECT_TIMEOUT"],
+        read=http_client_config["READ_TIMEOUT"],
+        write=http_client_config["WRITE_TIMEOUT"],
+        pool=http_client_config["POOL_TIMEOUT"]
+    )
+
+
+def _http2_enabled():
+    if not http_client_config["HTTP2"]:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP/2 is enabled but the 'h2' package is not installed, using HTTP/1.1")
+        return False
+    return True
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient of the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(limits=_limits(), timeout=_timeout(), http2=_http2_enabled())
+        _async_clients[loop] = client
+    return client
+
+
+async def warm_up(client: httpx.AsyncClient, url: str, connections: int = None):
+    """
+    Open keep-alive connections to the endpoint's host before a timed window starts,
+    so the first requests do not pay for the TCP/TLS handshake. The responses are ignored.
+    """
+    connections = http_client_config["WARMUP_CONNECTIONS"] if connections is None else connections
+    if connections <= 0:
+        return
+
+    async def open_connection():
+        try:
+            await client.options(url)
+        except httpx.HTTPError as e:
+            logger.warning(f"Connection warm-up to {url} failed: {e}")
+
+    await asyncio.gather(*[open_connection() for _ in range(connections)])
+
+
+async def close_clients():
+    """Close the shared client of the running loop, e.g. on application shutdown."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,119 @@
+import math
+from typing import Any, Dict, List
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed (HDR-style) latency histogram.
+
+    Values are recorded in microseconds. Every power-of-two range is split into the same number of
+    linear sub-buckets, so memory is bounded by the value range rather than the number of requests
+    and every percentile is answered within the configured number of significant figures.
+    Histograms with the same precision can be merged, e.g. across payload sets, models or workers.
+    """
+
+    UNIT_SECONDS = 1e-6
+
+    def __init__(self, significant_figures: int = 2):
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+        self.significant_figures = significant_figures
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_figures))
+        self.sub_bucket_count = 1 << self.sub_bucket_bits
+        self.sub_bucket_half = self.sub_bucket_count >> 1
+        self.counts = {}
+        self.total_count = 0
+        self.min_value = None
+        self.max_value = None
+        self.sum_value = 0
+
+    def _bucket_index(self, value: int) -> int:
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return self.sub_bucket_count + (shift - 1) * self.sub_bucket_half + (value >> shift) - self.sub_bucket_half
+
+    def _bucket_range(self, index: int):
+        """Return the lowest and highest value that fall into a bucket."""
+        if index < self.sub_bucket_count:
+            return index, index
+        offset = index - self.sub_bucket_count
+        shift = offset // self.sub_bucket_half + 1
+        sub_bucket = offset % self.sub_bucket_half + self.sub_bucket_half
+        return sub_bucket << shift, ((sub_bucket + 1) << shift) - 1
+
+    def record(self, latency_seconds: float, count: int = 1):
+        value = max(int(round(latency_seconds / self.UNIT_SECONDS)), 0)
+        index = self._bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += count
+        self.sum_value += value * count
+        self.min_value = value if self.min_value is None else min(self.min_value, value)
+        self.max_value = value if self.max_value is None else max(self.max_value, value)
+
+    def merge(self, other: "LatencyHistogram"):
+        if other.significant_figures != self.significant_figures:
+            raise ValueError("Cannot merge histograms with different significant_figures")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += other.total_count
+        self.sum_value += other.sum_value
+        if other.min_value is not None:
+            self.min_value = other.min_value if self.min_value is None else min(self.min_value, other.min_value)
+            self.max_value = other.max_value if self.max_value is None else max(self.max_value, other.max_value)
+        return self
+
+    def percentile(self, percentile: float) -> float:
+        """Return the latency (seconds) at the given percentile, or None if nothing was recorded."""
+        if self.total_count == 0:
+            return None
+        if percentile >= 100:
+            return self.max_value * self.UNIT_SECONDS
+        target_rank = max(math.ceil(percentile / 100 * self.total_count), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target_rank:
+                low, high = self._bucket_range(index)
+                value = min(max((low + high) / 2, self.min_value), self.max_value)
+                return value * self.UNIT_SECONDS
+        return self.max_value * self.UNIT_SECONDS
+
+    def percentiles(self, percentiles: List[float]) -> Dict[float, float]:
+        return {p: self.percentile(p) for p in percentiles}
+
+    def mean(self) -> float:
+        if self.total_count == 0:
+            return None
+        return self.sum_value / self.total_count * self.UNIT_SECONDS
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact, Mongo-friendly form: only the non-empty buckets are stored."""
+        indexes = sorted(self.counts)
+        return {
+            "unit": "us",
+            "significant_figures": self.significant_figures,
+            "count": self.total_count,
+            "min": self.min_value,
+            "max": self.max_value,
+            "sum": self.sum_value,
+            "bucket_indexes": indexes,
+            "bucket_counts": [self.counts[index] for index in indexes]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls(data.get("significant_figures", 2))
+        histogram.counts = dict(zip(data.get("bucket_indexes", []), data.get("bucket_counts", [])))
+        histogram.total_count = data.get("count", 0)
+        histogram.min_value = data.get("min")
+        histogram.max_value = data.get("max")
+        histogram.sum_value = data.get("sum", 0)
+        return histogram
+
+    @classmethod
+    def merge_all(cls, histograms: List["LatencyHistogram"], significant_figures: int = 2) -> "LatencyHistogram":
+        merged = cls(significant_figures)
+        for histogram in histograms:
+            merged.merge(histogram)
+        return merged
@@ -0,0 +1,134 @@
+from collections import defaultdict
+from functools import lru_cache
+from typing import FrozenSet, List, Sequence, Tuple
+
+from nltk.corpus import wordnet
+from nltk.stem.porter import PorterStemmer
+
+from ApplicationManagment.Handlers.scoringPool import is_large, map_chunks
+
+# Parameters of nltk's meteor_score
+ALPHA = 0.9
+BETA = 3.0
+GAMMA = 0.5
+
+_stemmer = PorterStemmer()
+
+
+@lru_cache(maxsize=200000)
+def stem(word: str) -> str:
+    return _stemmer.stem(word)
+
+
+@lru_cache(maxsize=200000)
+def synonyms(word: str) -> FrozenSet[str]:
+    """Single-word WordNet lemma names of every synset of a word, and the word itself."""
+    names = {
+        lemma.name()
+        for synset in wordnet.synsets(word)
+        for lemma in synset.lemmas()
+        if lemma.name().find("_") < 0
+    }
+    names.add(word)
+    return frozenset(names)
+
+
+def _unmatched(words: List[Tuple[int, str]], matched: set) -> List[Tuple[int, str]]:
+    return [pair for index, pair in enumerate(words) if index not in matched]
+
+
+def _exact_match(hypothesis: List[Tuple[int, str]], reference: List[Tuple[int, str]]):
+    """Each hypothesis word, last first, takes the last unused reference word of the same form."""
+    matches = []
+    positions = defaultdict(list)
+    for j, (_, word) in enumerate(reference):
+        positions[word].append(j)
+    matched_hypothesis, matched_reference = set(), set()
+    for i in range(len(hypothesis) - 1, -1, -1):
+        candidates = positions.get(hypothesis[i][1])
+        if candidates:
+            j = candidates.pop()
+            matched_hypothesis.add(i)
+            matched_reference.add(j)
+            matches.append((hypothesis[i][0], reference[j][0]))
+    return matches, _unmatched(hypothesis, matched_hypothesis), _unmatched(reference, matched_reference)
+
+
+def _synonym_match(hypothesis: List[Tuple[int, str]], reference: List[Tuple[int, str]]):
+    """Like _exact_match, but a hypothesis word takes the last unused reference word among its synonyms."""
+    matches = []
+    positions = defaultdict(list)
+    for j, (_, word) in enumerate(reference):
+        positions[word].append(j)
+    matched_hypothesis, matched_reference = set(), set()
+    for i in range(len(hypothesis) - 1, -1, -1):
+        if not positions:
+            break
+        words = synonyms(hypothesis[i][1])
+        # Walk the smaller side, the synonyms of common words outnumber the leftover reference words
+        candidates = positions.keys() if len(positions) < len(words) else words
+        best_j, best_word = -1, None
+        for word in candidates:
+            if word in words:
+                word_positions = positions.get(word)
+                if word_positions and word_positions[-1] > best_j:
+                    best_j, best_word = word_positions[-1], word
+        if best_word is not None:
+            positions[best_word].pop()
+            if not positions[best_word]:
+                del positions[best_word]
+            matched_hypothesis.add(i)
+            matched_reference.add(best_j)
+            matches.append((hypothesis[i][0], reference[best_j][0]))
+    return matches, _unmatched(hypothesis, matched_hypothesis), _unmatched(reference, matched_reference)
+
+
+def _count_chunks(matches: List[Tuple[int, int]]) -> int:
+    chunks = 1
+    for previous, current in zip(matches, matches[1:]):
+        if not (current[0] == previous[0] + 1 and current[1] == previous[1] + 1):
+            chunks += 1
+    return chunks
+
+
+def meteor(reference: Sequence[str], hypothesis: Sequence[str]) -> float:
+    """
+    nltk's single_meteor_score with its defaults: exact, then Porter stem, then WordNet synonym matches
+    (the synonym stage looks up the stemmed leftovers, as nltk does), with stems and synonyms cached per word.
+    """
+    hypothesis_words = [(i, word.lower()) for i, word in enumerate(hypothesis)]
+    reference_words = [(j, word.lower()) for j, word in enumerate(reference)]
+    if not hypothesis_words or not reference_words:
+        return 0.0
+
+    exact, hypothesis_words, reference_words = _exact_match(hypothesis_words, reference_words)
+    stemmed, hypothesis_words, reference_words = _exact_match(
+        [(i, stem(word)) for i, word in hypothesis_words], [(j, stem(word)) for j, word in reference_words]
+    )
+    synonym, _, _ = _synonym_match(hypothesis_words, reference_words)
+    matches = sorted(exact + stemmed + synonym, key=lambda pair: pair[0])
+    if not matches:
+        return 0.0
+
+    precision = len(matches) / len(hypothesis)
+    recall = len(matches) / len(reference)
+    fmean = (precision * recall) / (ALPHA * precision + (1 - ALPHA) * recall)
+    fragmentation = float(_count_chunks(matches)) / len(matches)
+    return (1 - GAMMA * fragmentation ** BETA) * fmean
+
+
+def _sum_chunk(prediction_tokens: List[List[str]], reference_tokens: List[List[str]]) -> float:
+    """Process pool entry point: METEOR sum of one chunk of pairs."""
+    return sum(meteor(reference, prediction) for prediction, reference in zip(prediction_tokens, reference_tokens))
+
+
+def meteor_mean(prediction_tokens: List[List[str]], reference_tokens: List[List[str]]) -> float:
+    """Mean METEOR of tokenized pairs, one reference per prediction; large sets are scored in chunks across processes."""
+    count = min(len(prediction_tokens), len(reference_tokens))
+    if count == 0:
+        return 0.0
+    if is_large(count):
+        total = sum(map_chunks(_sum_chunk, count, prediction_tokens, reference_tokens))
+    else:
+        total = _sum_chunk(prediction_tokens, reference_tokens)
+    return total / count
@@ -0,0 +1,122 @@
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from nltk.stem import porter
+
+from ApplicationManagment.Handlers.scoringPool import is_large, map_chunks
+
+# Same tokenization as rouge_score.tokenize, which replicates the original ROUGE perl script
+_NON_ALPHANUM = re.compile(r"[^a-z0-9]+")
+_VALID_TOKEN = re.compile(r"^[a-z0-9]+$")
+_stemmer = porter.PorterStemmer()
+
+
+@lru_cache(maxsize=200000)
+def stem(word: str) -> str:
+    """Porter stem of a word, only words longer than 3 characters are stemmed (as rouge_score does)."""
+    return _stemmer.stem(word) if len(word) > 3 else word
+
+
+def tokenize(text: str) -> List[str]:
+    """rouge_score tokenization with use_stemmer=True."""
+    tokens = [stem(token) for token in _NON_ALPHANUM.sub(" ", text.lower()).split()]
+    return [token for token in tokens if _VALID_TOKEN.match(token)]
+
+
+def _f_measure(matches: int, prediction_count: int, target_count: int) -> Tuple[float, float, float]:
+    precision = matches / max(prediction_count, 1)
+    recall = matches / max(target_count, 1)
+    fmeasure = 2 * precision * recall / (precision + recall) if precision + recall > 0 else 0.0
+    return precision, recall, fmeasure
+
+
+def lcs_length(a: Tuple[int, ...], b: Tuple[int, ...]) -> int:
+    """
+    Length of the longest common subsequence, bit-parallel (Allison-Dix / Hyyrö).
+
+    Each position of `a` is one bit of a Python int, so a row of the dynamic programming
+    table is computed with a few big-int operations per token of `b` instead of len(a) steps.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    match_masks = {}
+    for i, token in enumerate(a):
+        match_masks[token] = match_masks.get(token, 0) | (1 << i)
+    mask = (1 << len(a)) - 1
+    row = mask
+    for token in b:
+        matches = row & match_masks.get(token, 0)
+        row = ((row + matches) | (row - matches)) & mask
+    return len(a) - bin(row).count("1")
+
+
+class RougeEngine:
+    """
+    ROUGE-1, ROUGE-2 and ROUGE-L (precision, recall, F1) matching rouge_score.RougeScorer with use_stemmer=True.
+
+    Every distinct text is tokenized and stemmed once per engine and mapped to integer token ids; the
+    n-gram counts are built once per text and shared by the variants, and ROUGE-L uses a bit-parallel LCS.
+    """
+
+    def __init__(self):
+        self.vocabulary = {}
+        self.texts = {}
+
+    def encode(self, text: str):
+        """Token ids, unigram and bigram counts of a text, computed once per distinct text."""
+        text = "" if text is None else str(text)
+        encoded = self.texts.get(text)
+        if encoded is None:
+            ids = tuple(self.vocabulary.setdefault(token, len(self.vocabulary)) for token in tokenize(text))
+            encoded = (ids, Counter(ids), Counter(zip(ids, ids[1:])))
+            self.texts[text] = encoded
+        return encoded
+
+    def score(self, target: str, prediction: str) -> Dict[str, Tuple[float, float, float]]:
+        """(precision, recall, fmeasure) per variant, same argument order as RougeScorer.score."""
+        target_ids, target_unigrams, target_bigrams = self.encode(target)
+        prediction_ids, prediction_unigrams, prediction_bigrams = self.encode(prediction)
+        scores = {
+            "rouge1": _f_measure(
+                sum((target_unigrams & prediction_unigrams).values()), len(prediction_ids), len(target_ids)
+            ),
+            "rouge2": _f_measure(
+                sum((target_bigrams & prediction_bigrams).values()),
+                max(len(prediction_ids) - 1, 0), max(len(target_ids) - 1, 0)
+            ),
+        }
+        if not target_ids or not prediction_ids:
+            scores["rougeL"] = (0.0, 0.0, 0.0)
+        else:
+            scores["rougeL"] = _f_measure(lcs_length(target_ids, prediction_ids), len(prediction_ids), len(target_ids))
+        return scores
+
+    def f1_sums(self, predictions: List[str], references: List[str]) -> Tuple[float, float, float]:
+        """Sums of the ROUGE-1/2/L F1 over the pairs."""
+        rouge1 = rouge2 = rougel = 0.0
+        for prediction, reference in zip(predictions, references):
+            scores = self.score(reference, prediction)
+            rouge1 += scores["rouge1"][2]
+            rouge2 += scores["rouge2"][2]
+            rougel += scores["rougeL"][2]
+        return rouge1, rouge2, rougel
+
+
+def _score_chunk(predictions: List[str], references: List[str]) -> Tuple[float, float, float]:
+    """Process pool entry point: F1 sums of one chunk of pairs."""
+    return RougeEngine().f1_sums(predictions, references)
+
+
+def rouge_f1(predictions: List[str], references: List[str]) -> Tuple[float, float, float]:
+    """Mean ROUGE-1, ROUGE-2 and ROUGE-L F1 of the pairs, large sets are scored in chunks across processes."""
+    count = min(len(predictions), len(references))
+    if count == 0:
+        return 0.0, 0.0, 0.0
+    if is_large(count):
+        chunk_sums = map_chunks(_score_chunk, count, predictions, references)
+        sums = tuple(sum(values) for values in zip(*chunk_sums))
+    else:
+        sums = RougeEngine().f1_sums(predictions, references)
+    return tuple(total / count for total in sums)
@@ -0,0 +1,44 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Sequence
+
+from db_config import eval_config
+
+# Shared by the text metric engines (ROUGE, BLEU, ...), created on first use
+_scoring_pool = None
+# This process's share of the CPU when it is one of several metrics workers, see limit_workers
+_worker_share = None
+
+
+def limit_workers(count: int):
+    """Cap the scoring pool of this process, e.g. to its share of the CPU in a metrics pool worker."""
+    global _worker_share
+    _worker_share = max(int(count), 1)
+
+
+def pool_size() -> int:
+    workers = eval_config["SCORING_WORKERS"] or os.cpu_count() or 1
+    return min(workers, _worker_share) if _worker_share else workers
+
+
+def get_scoring_pool():
+    global _scoring_pool
+    if _scoring_pool is None:
+        _scoring_pool = ProcessPoolExecutor(max_workers=pool_size(), mp_context=multiprocessing.get_context("spawn"))
+    return _scoring_pool
+
+
+def is_large(count: int) -> bool:
+    """Whether a set of this many rows is worth splitting across the scoring pool; never with a pool of one."""
+    return pool_size() > 1 and count >= eval_config["SCORING_PARALLEL_MIN_ROWS"]
+
+
+def map_chunks(function: Callable, count: int, *sequences: Sequence) -> List:
+    """Run function(*chunk of every sequence) for each SCORING_CHUNK_ROWS rows on the pool, results in order."""
+    chunk = eval_config["SCORING_CHUNK_ROWS"]
+    futures = [
+        get_scoring_pool().submit(function, *[sequence[start:start + chunk] for sequence in sequences])
+        for start in range(0, count, chunk)
+    ]
+    return [future.result() for future in futures]
@@ -8,15 +8,19 @@ from fastapi import APIRouter, BackgroundTasks, FastAPI, HTTPException, Query, s
 from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from pydantic import ValidationError
 from pymongo import MongoClient
-from Database.applicationDataBase import ApplicationDataBase
 from ApplicationManagment.Handlers.evaluationHandler import EvaluationHandler
 from Database.evaluationSetup import MongoDBHandler
+from Database.asyncApplicationDataBase import AsyncApplicationDataBase
+from Database.statusHub import status_hub
+from Database.jobQueue import get_job_queue
 from ApplicationManagment.Handlers.MetricsCalculator import MetricsCalculator
 from ApplicationManagment.Handlers.benchmarkingHandler import BenchmarkHandler
+from ApplicationManagment.Handlers.asynctester import DEFAULT_PERCENTILES
 from ApplicationManagment.Handlers.BenchExcel import ExcelHandler
 from ApplicationManagment.Handlers.storeExcel import JSONToExcelConverter
 from utils import BenchPayload, LoginDetails, MetricRequest, MetricsPayload, Pagination, Payload, RequestDetails, ResultDetails, ScheduleDetails, metric, viewDetails,RangeUpdateRequest
-from db_config import eval_config, bench_config
+from db_config import eval_config, bench_config, job_queue_config, status_hub_config
+from utils import RequestDetails as RequestDetailsModel
 
 projectDirectory = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 logDir = os.path.join(projectDirectory, "logs")
@@ -33,7 +37,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
     
 def initilizeApplicationDB():
-    applicationDB = ApplicationDataBase()
+    applicationDB = AsyncApplicationDataBase()
     return applicationDB
 
 class Evaluation:
@@ -67,7 +71,7 @@ class Evaluation:
                 }
 
             # Initialize MongoDB Handler
-            mongo_handler = MongoDBHandler(eval_config, orgId)
+            mongo_handler = MongoDBHandler.get_handler(eval_config, orgId)
             print("Mongo handler", mongo_handler)
             logger.info(f"MongoDBHandler initialized for orgId: {orgId}")
 
@@ -101,6 +105,16 @@ class Evaluation:
         print("pid", process_id)
         logger.info(f"Generated process ID: {process_id}")
 
+        if job_queue_config["ENABLED"]:
+            # Run by a worker process, survives restarts of the API
+            await get_job_queue().enqueue("evaluation", process_id, orgId, payload.dict())
+            logger.info(f"Evaluation job queued with process ID: {process_id}")
+            return {
+                "status_code": 200,
+                "process_id": process_id,
+                "message": "Evaluation has been queued"
+            }
+
         # Initialize evaluation handler
         evaluation_handler = EvaluationHandler(mongo_handler, payload)
         print("eval handler", evaluation_handler)
@@ -118,7 +132,7 @@ class Evaluation:
             "message": "Evaluation has been started in the background"
         }
 
-    def calculate_metrics(self, payload, background_tasks):
+    async def calculate_metrics(self, payload, background_tasks):
         # Generate a unique metric_id
         metric_id = str(uuid.uuid4())[:8]
         print("Generated metric_id:", metric_id)
@@ -126,8 +140,15 @@ class Evaluation:
         # Log the payload and metric_id
         print("Payload:", payload)
         org_id = payload.get("org_id")
+        if job_queue_config["ENABLED"]:
+            await get_job_queue().enqueue("metrics", payload.get("process_id"), org_id, payload, metric_id=metric_id)
+            return {
+                "status": "Metrics calculation queued",
+                "metric_id": metric_id,
+                "detail": "You can check the status via the status endpoint."
+            }
         # Create the MongoDB handler and metrics calculator
-        mongo_handler = MongoDBHandler(eval_config, org_id)
+        mongo_handler = MongoDBHandler.get_handler(eval_config, org_id)
         eval = MetricsCalculator(mongo_handler, payload)
 
         # Add the metrics calculation task to the background
@@ -161,7 +182,7 @@ class Evaluation:
             )
 
         try:
-            mongo_handler = MongoDBHandler(bench_config)
+            mongo_handler = MongoDBHandler.get_handler(bench_config, None)
             if await mongo_handler.check_ongoing_task(payload.user_id):
                 return self.validation_error_response(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -178,6 +199,14 @@ class Evaluation:
                 detail=f"Unexpected error occurred while checking ongoing tasks: {str(e)}"
             )
 
+        if job_queue_config["ENABLED"]:
+            await get_job_queue().enqueue("benchmark", process_id, None, payload_dict)
+            return {
+                "status_code": 200,
+                "process_id": process_id,
+                "message": "Benchmarking has been queued"
+            }
+
         # Start background task
         try:
             benchmark_handler = BenchmarkHandler(mongo_handler, payload)
@@ -202,46 +231,55 @@ class Evaluation:
 
 
     async def check_process_status(self, process_id: str = Query(...), service: str = Query(...)):
+        if isinstance(process_id, dict):
+            # Called from the POST route with the request data
+            process_id, service = process_id.get("process_id"), process_id.get("service")
+
         async def event_generator():
+            # Transitions are pushed by the status hub, the statuses are read once when a process gets its first stream
+            queue = status_hub.subscribe(process_id)
             try:
-                
                 while True:
-                    print("details are", process_id,service)
-                    # Fetch the status details for the process
-                    model_statuses, overall_status = await BenchmarkHandler.get_status_details(
-                    process_id, 
-                        service
+                    # Statuses of a process run by this worker, or its status document
+                    snapshot = await status_hub.load_snapshot(
+                        process_id, lambda: BenchmarkHandler.get_status_details(process_id, service)
                     )
-
-                    if model_statuses is None:
-                        # Send an error message and keep checking
-                        yield f"data: {json.dumps({'error': overall_status})}\n\n"
-                        await asyncio.sleep(2)
-                        continue
-
-                    # Prepare and send response data as SSE
+                    if snapshot is not None:
+                        break
+                    # Not found yet (the process may still be starting), keep checking
+                    yield f"data: {json.dumps({'error': 'Process not found'})}\n\n"
+                    await asyncio.sleep(status_hub_config["POLL_SECONDS"])
+                # The first snapshot is sent whole, the subscription only has to deliver what follows it
+                while not queue.empty():
+                    queue.get_nowait()
+
+                # Full statuses first, then only what changed
+                message = snapshot
+                while True:
                     response_data = {
-                        "models": model_statuses,
-                        "overall_status": overall_status
+                        "models": [{"model_id": model_id, "status": status} for model_id, status in message.get("models", {}).items()]
                     }
-                    print("status_data", response_data)
+                    if "overall_status" in message:
+                        response_data["overall_status"] = message["overall_status"]
                     yield f"data: {json.dumps(response_data)}\n\n"
 
-                    # Check if all models have a final status
-                    all_tasks_complete = all(
-                        model["status"] in ["Completed", "Failed"]
-                        for model in model_statuses
-                    )
-
-                    if all_tasks_complete:
-                        break  # Exit the loop when all tasks are done
+                    # Exit the loop when all tasks are done
+                    if status_hub.is_final(process_id):
+                        break
 
-                    # Heartbeat to keep the connection alive
-                    await asyncio.sleep(2)
+                    message = None
+                    while message is None:
+                        try:
+                            message = await asyncio.wait_for(queue.get(), timeout=status_hub_config["HEARTBEAT_SECONDS"])
+                        except asyncio.TimeoutError:
+                            # Heartbeat to keep the connection alive
+                            yield ": heartbeat\n\n"
 
             except Exception as e:
                 # Send any encountered errors back to the client
                 yield f"data: {json.dumps({'error': str(e)})}\n\n"
+            finally:
+                status_hub.unsubscribe(process_id, queue)
                 
         # Return the streaming response with SSE-compatible headers
         return StreamingResponse(
@@ -268,13 +306,18 @@ class Evaluation:
             #     )
             # Get the MongoDB handler based on the service
             # mongo_handler = MongoDBHandler.get_mongo_handler(Pagination["service"], Pagination["orgId"])
-            mongo_handler = MongoDBHandler(eval_config, Pagination["orgId"])
+            mongo_handler = MongoDBHandler.get_handler(eval_config, Pagination["orgId"])
             # Fetch the process results using the user_id from MongoDB
-            result, doc_count = await mongo_handler.get_process_results(Pagination["user_id"], Pagination["page"], Pagination["page_size"])
+            result, doc_count, next_cursor = await mongo_handler.get_process_results(
+                Pagination["user_id"], Pagination.get("page", 1), Pagination["page_size"], Pagination.get("cursor")
+            )
             
             # Return a successful response with a 200 status code
-            return {"result": result, "doc_count": doc_count}
+            return {"result": result, "doc_count": doc_count, "next_cursor": next_cursor}
 
+        except HTTPException as e:
+            # An invalid cursor is the caller's error, keep its 400
+            raise e
         except Exception as e:
             # Handle any errors and return a 500 status code with error details
             return JSONResponse(
@@ -301,6 +344,25 @@ class Evaluation:
                 status_code=500,
                 content={"message": "Error Retreiving results", "detail": str(e)})
 
+    async def view_latency_percentiles(self, request):
+        """Latency percentiles of a benchmark, from its stored histograms, for one model or across all of them."""
+        try:
+            mongo_handler = await MongoDBHandler.get_mongo_handler(request.get("service"), request.get("orgId"))
+            percentiles = await mongo_handler.get_latency_percentiles(
+                request.get("process_id"),
+                request.get("percentiles") or DEFAULT_PERCENTILES,
+                model_id=request.get("model_id"),
+                payload_key=request.get("payload_key", "overall"),
+            )
+            return {"process_id": request.get("process_id"), "percentiles": percentiles}
+
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            return JSONResponse(
+                status_code=500,
+                content={"message": "Error Retreiving latency percentiles", "detail": str(e)})
+
 
     async def view_status_by_userid(self, RequestDetails):
         try:
@@ -389,6 +451,16 @@ class Evaluation:
 
     async def stop_task(self, RequestDetails: RequestDetails):
         try:
+            if isinstance(RequestDetails, dict):
+                # Called from the POST route with the request data
+                RequestDetails = RequestDetailsModel(**RequestDetails)
+
+            if job_queue_config["ENABLED"]:
+                # The worker running the job stops it on its next heartbeat and marks it Cancelled
+                if not await get_job_queue().request_cancel(RequestDetails.process_id):
+                    raise HTTPException(status_code=404, detail="Task not found for cancellation")
+                return {"status_code": 200, "message": "Cancellation requested"}
+
             # Get the appropriate task entry based on the service
             if RequestDetails.service == "benchmarking":
                 task_entry = BenchmarkHandler.task_statuses.get(RequestDetails.process_id)
@@ -429,7 +501,7 @@ class Evaluation:
                     task_entry['models'][model_id] = "Failed"  # Update the status for each model
 
             print("In Memory", task_entry)
-            mongo_handler = await MongoDBHandler.get_mongo_handler(RequestDetails.service)# Ensure this is correctly instantiated
+            mongo_handler = await MongoDBHandler.get_mongo_handler(RequestDetails.service, None)
             await mongo_handler.update_model_status_to_cancelled(RequestDetails.process_id)
 
             logger.info(f"Task {RequestDetails.process_id} status updated to Cancelled in MongoDB.")
@@ -446,7 +518,7 @@ class Evaluation:
             metric_id = request.get("metric_id")
             org_id = request.get("org_id")
             print("metric")
-            mongo_handler = MongoDBHandler(eval_config, org_id)
+            mongo_handler = MongoDBHandler.get_handler(eval_config, org_id)
             result = await mongo_handler.fetch_metrics_by_id(metric_id)
             return result
 
@@ -458,17 +530,21 @@ class Evaluation:
     async def check_metric_results(self, request):
         try:
             user_id = request.get("user_id")
-            page = request.get("page")
+            page = request.get("page", 1)
             page_size = request.get("page_size")
+            cursor = request.get("cursor")
             org_id = request.get("org_id")
             # Get the MongoDB handler based on the service
-            mongo_handler = MongoDBHandler(eval_config,org_id)
+            mongo_handler = MongoDBHandler.get_handler(eval_config,org_id)
             # Fetch the process results using the user_id from MongoDB
-            result, doc_count = await mongo_handler.get_metric_results(user_id, page, page_size)
+            result, doc_count, next_cursor = await mongo_handler.get_metric_results(user_id, page, page_size, cursor)
             
             # Return a successful response with a 200 status code
-            return {"result": result, "doc_count": doc_count}
+            return {"result": result, "doc_count": doc_count, "next_cursor": next_cursor}
 
+        except HTTPException as e:
+            # An invalid cursor is the caller's error, keep its 400
+            raise e
         except Exception as e:
             # Handle any errors and return a 500 status code with error details
             return JSONResponse(
@@ -6,6 +6,7 @@ import string
 from fastapi import HTTPException
 from Database.applicationSetup import *
 from Database.applicationDataBase import *
+from Database.asyncApplicationDataBase import AsyncApplicationDataBase
 
 projectDirectory = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 logDir = os.path.join(projectDirectory, "logs")
@@ -23,7 +24,7 @@ logger = logging.getLogger(__name__)
 
 
 def initilizeApplicationDB():
-    applicationDB = ApplicationDataBase()
+    applicationDB = AsyncApplicationDataBase()
     return applicationDB
 
 def generate_org_id():
@@ -36,7 +37,7 @@ class Organization:
         self.userId = userId
         self.applicationDB = initilizeApplicationDB()
 
-    def createOrganization(self, data: dict):
+    async def createOrganization(self, data: dict):
         try:                 
             if not isinstance(data, dict):
                 return {
@@ -50,7 +51,7 @@ class Organization:
                         "detail": "Unauthorized Access"
                 }
             data["orgId"] = generate_org_id()
-            status_code = self.applicationDB.createOrganization(data, self.userId)
+            status_code = await self.applicationDB.createOrganization(data, self.userId)
 
             if status_code == 400:
                 return {
@@ -61,7 +62,7 @@ class Organization:
             if status_code == status.HTTP_422_UNPROCESSABLE_ENTITY:
                 while status_code == status.HTTP_422_UNPROCESSABLE_ENTITY:
                     data['orgId'] = generate_org_id()
-                    status_code = self.applicationDB.createOrganization(data, userId = self.userId)
+                    status_code = await self.applicationDB.createOrganization(data, userId = self.userId)
                 if status_code == 400:
                     return {
                         "status_code": status.HTTP_400_BAD_REQUEST,
@@ -96,14 +97,14 @@ class Organization:
                 "detail":f"{e}"
             }
 
-    def updateOrganization(self, data: dict):
+    async def updateOrganization(self, data: dict):
         try:
             if not "superadmin" in self.role:
                 return {
                     "status_code": status.HTTP_401_UNAUTHORIZED,
                     "detail":"Unauthorized Access",
                 }
-            status_code = self.applicationDB.checkOrg(data['orgId'])
+            status_code = await self.applicationDB.checkOrg(data['orgId'])
             if status_code == 400:
                 return {
                     "status_code": status.HTTP_400_BAD_REQUEST,
@@ -122,7 +123,7 @@ class Organization:
                     "detail": "Internal server error",
                 }
             
-            status_code = self.applicationDB.updateOrganization(data)
+            status_code = await self.applicationDB.updateOrganization(data)
             if status_code == 409:
                 return {
                     "status_code": status.HTTP_409_CONFLICT,
@@ -143,7 +144,7 @@ class Organization:
                 "detail": f"{e}"
             }
         
-    def getOrganizations(self):
+    async def getOrganizations(self):
         try:
             if not "superadmin" in self.role:
                 return {
@@ -151,7 +152,7 @@ class Organization:
                     "detail": "Unauthorized Access",
                 }
             
-            organizations, status_code = self.applicationDB.getOrganizations()
+            organizations, status_code = await self.applicationDB.getOrganizations()
 
             if status_code == status.HTTP_404_NOT_FOUND:
                 return {
@@ -177,7 +178,7 @@ class Organization:
                 "detail": f"{e}"
             }     
 
-    def removeOrganization(self, data: dict):
+    async def removeOrganization(self, data: dict):
         try:
             if not "superadmin" in self.role:
                 return {
@@ -185,7 +186,7 @@ class Organization:
                     "detail":"Unauthorized Access",
                 }
             orgId = data['orgId']       
-            status_code = self.applicationDB.checkOrg(orgId)
+            status_code = await self.applicationDB.checkOrg(orgId)
             if status_code == 400:
                 return {
                     "status_code": status.HTTP_400_BAD_REQUEST,
@@ -203,7 +204,7 @@ class Organization:
                     "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
                     "detail": "Internal server error",
                 }
-            status_code = self.applicationDB.removeOrganization(orgId)
+            status_code = await self.applicationDB.removeOrganization(orgId)
             if status_code == 422:
                 return {
                     "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -225,7 +226,7 @@ class Organization:
                 "detail": f"{e}"
             } 
         
-    def assignUsersToOrg(self, data: dict):
+    async def assignUsersToOrg(self, data: dict):
         try:
             expected_keys = {"orgId", "userIds"}
             if not isinstance(data, dict) or not data.keys() == expected_keys:
@@ -249,7 +250,7 @@ class Organization:
             #         "detail":"Unauthorized Access",
             #     }
 
-            status_code = self.applicationDB.checkOrg(orgId = orgId)
+            status_code = await self.applicationDB.checkOrg(orgId = orgId)
             # status_code = self.applicationDB.checkAdmin(adminId = adminId)
 
             if status_code == 400:
@@ -271,7 +272,7 @@ class Organization:
                 }
             
             for userId in userIds:
-                status_code = self.applicationDB.assignUserToOrg(orgId= orgId, userId= userId)
+                status_code = await self.applicationDB.assignUserToOrg(orgId= orgId, userId= userId)
 
                 if status_code == 400:
                     return {
@@ -315,7 +316,7 @@ class Organization:
                 "detail": f"{e}"
             }
         
-    def unassignUsersToOrg(self, data: dict):
+    async def unassignUsersToOrg(self, data: dict):
         try:
             expected_keys = {"orgId", "userIds"}
             if not isinstance(data, dict) or not data.keys() == expected_keys:
@@ -338,7 +339,7 @@ class Organization:
             #         "status_code": status.HTTP_401_UNAUTHORIZED,
             #         "detail":"Unauthorized Access",
             #     }
-            status_code = self.applicationDB.checkOrg(orgId = orgId)
+            status_code = await self.applicationDB.checkOrg(orgId = orgId)
             # status_code = self.applicationDB.checkAdmin(adminId = adminId)
 
             if status_code == 400:
@@ -360,7 +361,7 @@ class Organization:
                 }
             
             for userId in userIds:
-                status_code = self.applicationDB.unassignUserToOrg(orgId= orgId, userId= userId)
+                status_code = await self.applicationDB.unassignUserToOrg(orgId= orgId, userId= userId)
 
                 if status_code == 400:
                     return {
@@ -404,7 +405,7 @@ class Organization:
                 "detail": f"{e}"
             }
         
-    def getOrganizationsforAdmin(self):
+    async def getOrganizationsforAdmin(self):
         try:
             if not "admin" in self.role:
                 return {
@@ -412,7 +413,7 @@ class Organization:
                     "detail": "Unauthorized Access",
                 }
             
-            organizations, status_code = self.applicationDB.getOrganizationsforAdmin(self.userId)
+            organizations, status_code = await self.applicationDB.getOrganizationsforAdmin(self.userId)
             if status_code == status.HTTP_404_NOT_FOUND:
                 return {
                         "status_code": status.HTTP_404_NOT_FOUND, 
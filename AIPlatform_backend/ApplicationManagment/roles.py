@@ -3,6 +3,8 @@ import logging
 import yaml
 from fastapi import HTTPException,status
 from Database.applicationDataBase import *
+from Database.asyncApplicationDataBase import AsyncApplicationDataBase
+from Database.asyncOrganizationDataBase import AsyncOrganizationDataBase
 import random
 import string
 
@@ -23,7 +25,7 @@ logger = logging.getLogger(__name__)
 
 
 def initilizeApplicationDB():
-    applicationDB = ApplicationDataBase()
+    applicationDB = AsyncApplicationDataBase()
     return applicationDB
 
 
@@ -39,7 +41,7 @@ class Role:
         self.userId = userId
         self.applicationDB = initilizeApplicationDB()
 
-    def createRole(self, data: dict):
+    async def createRole(self, data: dict):
         try:
             if not isinstance(data, dict) or "spaceIds" not in data or "orgId" not in data or "roleName"  not in data or "description" not in data:
                 return {
@@ -69,7 +71,7 @@ class Role:
                 }
 
             # Initialize the organization database
-            organizationDB = OrganizationDataBase(orgId)
+            organizationDB = AsyncOrganizationDataBase(orgId)
             
             # Check if organizationDB is initialized successfully
             if organizationDB.status_code != 200:
@@ -80,7 +82,7 @@ class Role:
 
             # Create the space in the organization database
             roleId = generate_role_id()
-            status_code = organizationDB.createRole(roleInfo=roleInfo, roleId=roleId, spaceIds=spaceIds, userId=self.userId)
+            status_code = await organizationDB.createRole(roleInfo=roleInfo, roleId=roleId, spaceIds=spaceIds, userId=self.userId)
 
             # Handle space creation statuses
             if status_code == status.HTTP_400_BAD_REQUEST:
@@ -98,7 +100,7 @@ class Role:
             # Handle spaceId conflict by regenerating spaceId
             while status_code == status.HTTP_422_UNPROCESSABLE_ENTITY:
                 roleId = generate_role_id()
-                status_code = organizationDB.createRole(roleInfo=roleInfo, roleId=roleId, spaceIds=spaceIds, userId=self.userId)
+                status_code = await organizationDB.createRole(roleInfo=roleInfo, roleId=roleId, spaceIds=spaceIds, userId=self.userId)
 
             # Return final status
             if status_code == status.HTTP_200_OK:
@@ -118,7 +120,7 @@ class Role:
                 "detail": str(e)
             }
     
-    def getAnalystSpaces(self):
+    async def getAnalystSpaces(self):
         try:
             if not "analyst" in self.role:
                 return {
@@ -128,13 +130,13 @@ class Role:
             spaceIds = self.spaceIds
             roles_data = []
             for orgId,spaceIds in spaceIds.items():
-                applicationDB = ApplicationDataBase()
-                org_list,status = applicationDB.getOrgInfo(orgId=orgId)
+                applicationDB = AsyncApplicationDataBase()
+                org_list,status = await applicationDB.getOrgInfo(orgId=orgId)
                 spaceInfo= org_list
                 spaces=[]
                 for spaceId in spaceIds:
-                    organizationDB = OrganizationDataBase(orgId)
-                    space, status_code = organizationDB.getSpaceInfo(spaceId=spaceId)
+                    organizationDB = AsyncOrganizationDataBase(orgId)
+                    space, status_code = await organizationDB.getSpaceInfo(spaceId=spaceId)
                     spaces.append(space)
                 spaceInfo["spaces"] = spaces
                 roles_data.append(spaceInfo)
@@ -156,7 +158,7 @@ class Role:
                 "detail": f"{e}"
             }
 
-    def getRolesInspace(self, data):
+    async def getRolesInspace(self, data):
         try:
             # if not "admin" in self.role:
             #     return {
@@ -170,8 +172,8 @@ class Role:
                         "status_code": status.HTTP_401_UNAUTHORIZED,
                         "detail": "Unauthorized Access"
                 }
-            organizationDB = OrganizationDataBase(orgId)
-            roles, status_code = organizationDB.getRolesInSpace(self.role, spaceId)
+            organizationDB = AsyncOrganizationDataBase(orgId)
+            roles, status_code = await organizationDB.getRolesInSpace(self.role, spaceId)
 
             if status_code == status.HTTP_404_NOT_FOUND:
                 return {
@@ -196,7 +198,7 @@ class Role:
                 "detail": str(e)
             }
 
-    def updateRole(self, data: dict):
+    async def updateRole(self, data: dict):
         try:
             if not "analyst" in self.role:
                 return {
@@ -216,8 +218,8 @@ class Role:
                         "detail": "Unauthorized Access"
                 }
              # Initialize the organization database
-            organizationDB = OrganizationDataBase(orgId)
-            status_code = organizationDB.checkRole(roleId= data["roleId"])
+            organizationDB = AsyncOrganizationDataBase(orgId)
+            status_code = await organizationDB.checkRole(roleId= data["roleId"])
             if status_code == 400:
                 return {
                     "status_code": status.HTTP_400_BAD_REQUEST,
@@ -236,7 +238,7 @@ class Role:
                     "detail": "Internal server error",
                 }
             data.pop("orgId")
-            status_code = organizationDB.updateRole(data)
+            status_code = await organizationDB.updateRole(data)
             if status_code == status.HTTP_409_CONFLICT:
                 return {
                         "status_code": status.HTTP_409_CONFLICT,
@@ -259,7 +261,7 @@ class Role:
                 "detail": f"{e}"
             }
         
-    def removeRole(self, data: dict):
+    async def removeRole(self, data: dict):
         try:
             if not "analyst" in self.role:
                 return {
@@ -281,8 +283,8 @@ class Role:
                         "detail": "Unauthorized Access"
                 }   
              # Initialize the organization database
-            organizationDB = OrganizationDataBase(orgId)
-            status_code = organizationDB.checkRole(roleId)
+            organizationDB = AsyncOrganizationDataBase(orgId)
+            status_code = await organizationDB.checkRole(roleId)
             if status_code == 400:
                 return {
                     "status_code": status.HTTP_400_BAD_REQUEST,
@@ -300,7 +302,7 @@ class Role:
                     "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
                     "detail": "Internal server error",
                 }
-            status_code = organizationDB.removeRole(roleId)
+            status_code = await organizationDB.removeRole(roleId)
             if status_code == 422:
                 return {
                     "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -322,7 +324,7 @@ class Role:
                 "detail": f"{e}"
             }  
     
-    def assignHierarchy(self, data: dict):
+    async def assignHierarchy(self, data: dict):
         try:
             hierarchyId = data["hierarchyId"]
             useCaseRole = data["useCaseRole"]
@@ -334,7 +336,7 @@ class Role:
                         "detail": "Unauthorized Access"
                 }
              
-            status_code = self.applicationDB.checkHierarchy(hierarchyId= hierarchyId)
+            status_code = await self.applicationDB.checkHierarchy(hierarchyId= hierarchyId)
             if status_code == 404:
                 return {
                     "status_code": status.HTTP_401_UNAUTHORIZED,
@@ -346,7 +348,7 @@ class Role:
                     "detail": "Internal server error",
                 }
             
-            status_code = self.applicationDB.checkHierarchyRoles(hierarchyId= hierarchyId, useCaseRole= useCaseRole)
+            status_code = await self.applicationDB.checkHierarchyRoles(hierarchyId= hierarchyId, useCaseRole= useCaseRole)
             if status_code == 404:
                 return{
                     "status_code": status.HTTP_401_UNAUTHORIZED,
@@ -386,7 +388,7 @@ class Role:
                 "detail": f"{e}"
             }
         
-    def unassignHierarchy(self, data: dict):
+    async def unassignHierarchy(self, data: dict):
         try:
             hierarchyId = data["hierarchyId"]
             userIds = data["userIds"]
@@ -397,7 +399,7 @@ class Role:
                         "detail": "Unauthorized Access"
                 }
             
-            status_code = self.applicationDB.checkHierarchy(hierarchyId= hierarchyId)
+            status_code = await self.applicationDB.checkHierarchy(hierarchyId= hierarchyId)
             if status_code == 404:
                 return {
                     "status_code": status.HTTP_401_UNAUTHORIZED,
@@ -437,7 +439,7 @@ class Role:
                 "detail": f"{e}"
             }
 
-    def getCreatedHierarchy(self, data: dict):
+    async def getCreatedHierarchy(self, data: dict):
         try:
             spaceId = data["spaceId"]
             if not "admin" in self.role:
@@ -446,7 +448,7 @@ class Role:
                         "detail": "Unauthorized Access"
                 }
             
-            status_code = self.applicationDB.checkSpace(spaceId = spaceId)
+            status_code = await self.applicationDB.checkSpace(spaceId = spaceId)
             if status_code == 404:
                 return{
                     "status_code": status.HTTP_401_UNAUTHORIZED,
@@ -457,7 +459,7 @@ class Role:
                     "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
                     "detail": "Internal server error",
                 }
-            hierarchys, status_code = self.applicationDB.getCreatedHierarchy(userId= self.userId,spaceId=spaceId)
+            hierarchys, status_code = await self.applicationDB.getCreatedHierarchy(userId= self.userId,spaceId=spaceId)
             if status_code == status.HTTP_404_NOT_FOUND:
                 return{
                     "status_code": status.HTTP_404_NOT_FOUND,
@@ -480,7 +482,7 @@ class Role:
                 "detail": f"{e}"
             }
 
-    def getHierarchyRoles(self, data: dict):
+    async def getHierarchyRoles(self, data: dict):
         try:
             hierarchyId = data["hierarchyId"]
             if not "admin" in self.role:
@@ -489,7 +491,7 @@ class Role:
                         "detail": "Unauthorized Access"
                 }
             
-            status_code = self.applicationDB.checkHierarchy(hierarchyId = hierarchyId)
+            status_code = await self.applicationDB.checkHierarchy(hierarchyId = hierarchyId)
             if status_code == 404:
                 return{
                     "status_code": status.HTTP_401_UNAUTHORIZED,
@@ -500,7 +502,7 @@ class Role:
                     "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
                     "detail": "Internal server error",
                 }
-            hierarchyRoles, status_code = self.applicationDB.getHierarchyRoles(hierarchyId=hierarchyId)
+            hierarchyRoles, status_code = await self.applicationDB.getHierarchyRoles(hierarchyId=hierarchyId)
             if status_code == status.HTTP_404_NOT_FOUND:
                 return {
                     "status_code": status.HTTP_404_NOT_FOUND,
@@ -523,7 +525,7 @@ class Role:
                 "detail": f"{e}"
             }
     
-    def getHierarchyAndSpaceNames(self, hierarchyIds: list):
+    async def getHierarchyAndSpaceNames(self, hierarchyIds: list):
         try:
             if not "user" in self.role:
                 return {
@@ -531,7 +533,7 @@ class Role:
                         "detail": "Unauthorized Access"
                 }
             
-            hierarchy_space_names, status_code = self.applicationDB.getHierarchyAndSpaceNames(hierarchyIds= hierarchyIds)
+            hierarchy_space_names, status_code = await self.applicationDB.getHierarchyAndSpaceNames(hierarchyIds= hierarchyIds)
             if status_code == status.HTTP_404_NOT_FOUND:
                 return {
                     "status_code": status.HTTP_404_NOT_FOUND,
@@ -554,14 +556,14 @@ class Role:
                 "detail": f"{e}"
             }
 
-    def getUseCaseId(self, hierarchyId: str):
+    async def getUseCaseId(self, hierarchyId: str):
         try:
             if "user" not in self.role and "admin" not in self.role:
                 return {
                         "status_code": status.HTTP_401_UNAUTHORIZED,
                         "detail": "Unauthorized Access"
                 }
-            status_code = self.applicationDB.checkHierarchy(hierarchyId = hierarchyId)
+            status_code = await self.applicationDB.checkHierarchy(hierarchyId = hierarchyId)
             if status_code == 404:
                 return{
                     "status_code": status.HTTP_401_UNAUTHORIZED,
@@ -572,7 +574,7 @@ class Role:
                     "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
                     "detail": "Internal server error",
                 }
-            useCaseId, status_code = self.applicationDB.getUseCaseId(hierarchyId= hierarchyId)
+            useCaseId, status_code = await self.applicationDB.getUseCaseId(hierarchyId= hierarchyId)
             if status_code == status.HTTP_404_NOT_FOUND:
                 return {
                     "status_code": status.HTTP_404_NOT_FOUND,
@@ -595,14 +597,14 @@ class Role:
                 "detail": f"{e}"
             }
     
-    def getHierarchyDetails(self):
+    async def getHierarchyDetails(self):
         try:
             if not "admin" in self.role:
                 return {
                     "status_code": status.HTTP_401_UNAUTHORIZED,
                     "detail": "Unauthorized Access",
                 }
-            hierarchyDetails, status_code = self.applicationDB.getHierarchyDetails(userId= self.userId)
+            hierarchyDetails, status_code = await self.applicationDB.getHierarchyDetails(userId= self.userId)
             if status_code == status.HTTP_404_NOT_FOUND:
                 return {
                         "status_code": status.HTTP_404_NOT_FOUND, 
@@ -671,7 +673,7 @@ class Role:
                 "detail": f"{e}"
             }'''
     
-    def updateHierarchyName(self, data: dict):
+    async def updateHierarchyName(self, data: dict):
         try:
             hierarchyName = data["hierarchyName"]
             hierarchyId = data["hierarchyId"]
@@ -682,7 +684,7 @@ class Role:
                     "detail":"Unauthorized Access",
                 }
             
-            status_code = self.applicationDB.checkHierarchy(hierarchyId= hierarchyId)
+            status_code = await self.applicationDB.checkHierarchy(hierarchyId= hierarchyId)
 
             if status_code == 404:
                 return {
@@ -696,7 +698,7 @@ class Role:
                     "detail": "Internal server error",
                 }
             
-            status_code = self.applicationDB.updateHierarchyName(hierarchyId= hierarchyId, hierarchyName= hierarchyName)
+            status_code = await self.applicationDB.updateHierarchyName(hierarchyId= hierarchyId, hierarchyName= hierarchyName)
 
             if not status_code == 200:
                 return HTTPException(
@@ -2,8 +2,9 @@ import os
 import logging
 import yaml
 from fastapi import  HTTPException, status
-from Database.applicationDataBase import ApplicationDataBase
 from Database.organizationDataBase import *
+from Database.asyncApplicationDataBase import AsyncApplicationDataBase
+from Database.asyncOrganizationDataBase import AsyncOrganizationDataBase
 import random
 import string
 
@@ -23,7 +24,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
     
 def initilizeApplicationDB():
-    applicationDB = ApplicationDataBase()
+    applicationDB = AsyncApplicationDataBase()
     return applicationDB
 
 def generate_space_id():
@@ -37,7 +38,7 @@ class Spaces:
         self.orgIds = orgIds
         self.applicationDB = initilizeApplicationDB()
 
-    def createSpace(self, data: dict):
+    async def createSpace(self, data: dict):
         try:
             if not isinstance(data, dict) or "spaceName" not in data or "orgIds" not in data or len(data) != 2:
                 return {
@@ -63,7 +64,7 @@ class Spaces:
                     }
 
                 # Initialize the organization database
-                organizationDB = OrganizationDataBase(orgId)
+                organizationDB = AsyncOrganizationDataBase(orgId)
                 
                 # Check if organizationDB is initialized successfully
                 if organizationDB.status_code != 200:
@@ -74,7 +75,7 @@ class Spaces:
 
                 # Create the space in the organization database
                 spaceId = generate_space_id()
-                status_code = organizationDB.createSpace(spaceName=spaceName, spaceId=spaceId, userId=self.userId)
+                status_code = await organizationDB.createSpace(spaceName=spaceName, spaceId=spaceId, userId=self.userId)
 
                 # Handle space creation statuses
                 if status_code == status.HTTP_400_BAD_REQUEST:
@@ -92,7 +93,7 @@ class Spaces:
                 # Handle spaceId conflict by regenerating spaceId
                 while status_code == status.HTTP_422_UNPROCESSABLE_ENTITY:
                     spaceId = generate_space_id()
-                    status_code = organizationDB.createSpace(spaceName=spaceName, spaceId=spaceId, userId=self.userId)
+                    status_code = await organizationDB.createSpace(spaceName=spaceName, spaceId=spaceId, userId=self.userId)
 
             # Return final status
             if status_code == status.HTTP_200_OK:
@@ -112,7 +113,7 @@ class Spaces:
                 "detail": str(e)
             }
         
-    def getSpacesInOrg(self, data):
+    async def getSpacesInOrg(self, data):
         try:
             # if not "admin" in self.role:
             #     return {
@@ -125,8 +126,8 @@ class Spaces:
                         "status_code": status.HTTP_401_UNAUTHORIZED,
                         "detail": "Unauthorized Access"
                 }
-            organizationDB = OrganizationDataBase(orgId)
-            spaces, status_code = organizationDB.getSpaceInOrg(self.role,self.userId)
+            organizationDB = AsyncOrganizationDataBase(orgId)
+            spaces, status_code = await organizationDB.getSpaceInOrg(self.role,self.userId)
 
             if status_code == status.HTTP_404_NOT_FOUND:
                 return {
@@ -152,7 +153,7 @@ class Spaces:
                 "detail": f"{e}"
             }      
     
-    def getAdminAllSpaces(self):
+    async def getAdminAllSpaces(self):
         try:
             if not "admin" in self.role:
                 return {
@@ -162,11 +163,11 @@ class Spaces:
             orgIds = self.orgIds
             spaces_data = []
             for orgId in orgIds:
-                applicationDB = ApplicationDataBase()
-                org_list,status = applicationDB.getOrgInfo(orgId=orgId)
+                applicationDB = AsyncApplicationDataBase()
+                org_list,status = await applicationDB.getOrgInfo(orgId=orgId)
                 spaceInfo= org_list
-                organizationDB = OrganizationDataBase(orgId)
-                spaces, status_code = organizationDB.getSpaceInOrg(self.userId)
+                organizationDB = AsyncOrganizationDataBase(orgId)
+                spaces, status_code = await organizationDB.getSpaceInOrg(self.userId)
                 spaceInfo["spaces"] = spaces
                 spaces_data.append(spaceInfo)
 
@@ -189,7 +190,7 @@ class Spaces:
                 "detail": f"{e}"
             } 
 
-    def assignSpace(self, data: dict):
+    async def assignSpace(self, data: dict):
         try:
             expected_keys = {"orgId", "spaceId", "userIds"}
             if not isinstance(data, dict) or not data.keys() == expected_keys:
@@ -219,8 +220,8 @@ class Spaces:
                     "detail":"Unauthorized Access",
                 }
             
-            organizationDB = OrganizationDataBase(orgId)
-            status_code = organizationDB.checkSpace(spaceId = spaceId)
+            organizationDB = AsyncOrganizationDataBase(orgId)
+            status_code = await organizationDB.checkSpace(spaceId = spaceId)
             if status_code == 400:
                 return {
                     "status_code": status.HTTP_400_BAD_REQUEST,
@@ -242,7 +243,7 @@ class Spaces:
             
             for userId in userIds:
      
-                status_code = self.applicationDB.assignSpace(orgId = orgId, userId= userId, spaceId= spaceId)
+                status_code = await self.applicationDB.assignSpace(orgId = orgId, userId= userId, spaceId= spaceId)
 
                 if status_code == 400:
                     return {
@@ -286,7 +287,7 @@ class Spaces:
                 "detail": f"{e}"
             }
         
-    def unassignSpace(self, data: dict):
+    async def unassignSpace(self, data: dict):
         try:
             expected_keys = {"orgId", "spaceId", "userIds"}
             if not isinstance(data, dict) or not data.keys() == expected_keys:
@@ -317,8 +318,8 @@ class Spaces:
                     "detail":"Unauthorized Access",
                 }
             
-            organizationDB = OrganizationDataBase(orgId)
-            status_code = organizationDB.checkSpace(spaceId = spaceId)
+            organizationDB = AsyncOrganizationDataBase(orgId)
+            status_code = await organizationDB.checkSpace(spaceId = spaceId)
             if status_code == 400:
                 return {
                     "status_code": status.HTTP_400_BAD_REQUEST,
@@ -346,7 +347,7 @@ class Spaces:
             
             for userId in userIds:
      
-                status_code = self.applicationDB.unassignSpace(orgId = orgId, userId= userId, spaceId= spaceId)
+                status_code = await self.applicationDB.unassignSpace(orgId = orgId, userId= userId, spaceId= spaceId)
 
                 if status_code == 400:
                     return {
@@ -384,7 +385,7 @@ class Spaces:
                 "detail": f"{e}"
             }
     
-    def getAssignedSpaces(self):
+    async def getAssignedSpaces(self):
         try:
             if not "admin" in self.role:
                 return {
@@ -421,7 +422,7 @@ class Spaces:
             spacesList = []
 
             for space in spaces:
-                spaceName, status_code = self.organizationDB.getSpaceName(spaceId = space)
+                spaceName, status_code = await self.organizationDB.getSpaceName(spaceId = space)
 
                 if status_code == 404:
                     return {
@@ -452,7 +453,7 @@ class Spaces:
             }
 
 
-    def getSpaceId(self, hierarchyId: str):
+    async def getSpaceId(self, hierarchyId: str):
         try:
             if not isinstance(hierarchyId, str):
                 return {
@@ -460,7 +461,7 @@ class Spaces:
                     "detail": "Invalid hierarchyId. Expected a string."
                 }
             
-            status_code = self.organizationDB.checkHierarchy(hierarchyId= hierarchyId)
+            status_code = await self.organizationDB.checkHierarchy(hierarchyId= hierarchyId)
 
             if status_code == 400:
                 return {
@@ -480,7 +481,7 @@ class Spaces:
                     "detail": "Internal server error",
                 }
             
-            spaceId, status_code = self.organizationDB.getSpaceId(hierarchyId= hierarchyId)
+            spaceId, status_code = await self.organizationDB.getSpaceId(hierarchyId= hierarchyId)
 
             if status_code == 400:
                 return {
@@ -509,7 +510,7 @@ class Spaces:
                 "detail": f"{e}"
             }
     
-    def getUnassignedUseCases(self, spaceId: str):
+    async def getUnassignedUseCases(self, spaceId: str):
         try:
             if not isinstance(spaceId, str):
                 return {
@@ -523,7 +524,7 @@ class Spaces:
                     "detail":"Unauthorized Access",
                 }
             
-            status_code = self.organizationDB.checkSpace(spaceId= spaceId)
+            status_code = await self.organizationDB.checkSpace(spaceId= spaceId)
 
             if status_code == 400:
                 return {
@@ -543,7 +544,7 @@ class Spaces:
                     "detail": "Internal server error",
                 }
             
-            unassignedUseCases, status_code = self.organizationDB.getUnassignedUseCases(spaceId= spaceId, configInstance= self.organizationconfigDB)
+            unassignedUseCases, status_code = await self.organizationDB.getUnassignedUseCases(spaceId= spaceId, configInstance= self.organizationconfigDB)
 
             if status_code == 400:
                 return {
@@ -575,7 +576,7 @@ class Spaces:
                 "detail": f"{e}"
             }
     
-    def getAssignedUseCases(self, spaceId: str):
+    async def getAssignedUseCases(self, spaceId: str):
         try:
             if not isinstance(spaceId, str):
                 return {
@@ -589,7 +590,7 @@ class Spaces:
                     "detail":"Unauthorized Access",
                 }
             
-            status_code = self.organizationDB.checkSpace(spaceId= spaceId)
+            status_code = await self.organizationDB.checkSpace(spaceId= spaceId)
 
             if status_code == 400:
                 return {
@@ -609,7 +610,7 @@ class Spaces:
                     "detail": "Internal server error",
                 }
             
-            assignedUseCases, status_code = self.organizationDB.getAssignedUseCases(spaceId= spaceId, configInstance= self.organizationconfigDB)
+            assignedUseCases, status_code = await self.organizationDB.getAssignedUseCases(spaceId= spaceId, configInstance= self.organizationconfigDB)
             
             if status_code == 400:
                 return {
@@ -640,7 +641,7 @@ class Spaces:
                 "detail":f"{e}"
             }
     
-    def assignUseCase(self, data: dict):
+    async def assignUseCase(self, data: dict):
         try:
             expected_keys = {"spaceId", "useCaseIds"}
 
@@ -665,7 +666,7 @@ class Spaces:
                     "detail":"Unauthorized Access",
                 }
             
-            status_code = self.organizationDB.checkSpace(spaceId= spaceId)
+            status_code = await self.organizationDB.checkSpace(spaceId= spaceId)
 
             if status_code == 400:
                 return {
@@ -706,7 +707,7 @@ class Spaces:
                         "detail": "Internal server error",
                     }
 
-            status_code = self.organizationDB.assignUseCase(spaceId= spaceId, useCaseIds= useCaseIds)
+            status_code = await self.organizationDB.assignUseCase(spaceId= spaceId, useCaseIds= useCaseIds)
 
             if status_code == 400:
                 return {
@@ -996,7 +997,7 @@ class Spaces:
                 "detail": f"{e}"
             }'''
     
-    def updateSpaceName(self, data: dict):
+    async def updateSpaceName(self, data: dict):
         try:
             spaceName = data["spaceName"]
             spaceId = data["spaceId"]
@@ -1012,8 +1013,8 @@ class Spaces:
                     "detail":"Unauthorized Access",
                 }
              # Initialize the organization database
-            organizationDB = OrganizationDataBase(orgId)
-            status_code = organizationDB.checkSpace(spaceId= spaceId)
+            organizationDB = AsyncOrganizationDataBase(orgId)
+            status_code = await organizationDB.checkSpace(spaceId= spaceId)
             if status_code == 400:
                 return {
                     "status_code": status.HTTP_400_BAD_REQUEST,
@@ -1031,7 +1032,7 @@ class Spaces:
                     "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
                     "detail": "Internal server error",
                 }
-            status_code = organizationDB.updateSpaceName(spaceId= spaceId, spaceName= spaceName)
+            status_code = await organizationDB.updateSpaceName(spaceId= spaceId, spaceName= spaceName)
             if status_code == status.HTTP_409_CONFLICT:
                 return {
                         "status_code": status.HTTP_409_CONFLICT,
@@ -1053,7 +1054,7 @@ class Spaces:
                 "detail": f"{e}"
             }
         
-    def removeSpace(self, data: dict):
+    async def removeSpace(self, data: dict):
         try:
             if not "admin" in self.role:
                 return {
@@ -1068,8 +1069,8 @@ class Spaces:
                         "detail": "Unauthorized Access"
                 }   
              # Initialize the organization database
-            organizationDB = OrganizationDataBase(orgId)
-            status_code = organizationDB.checkSpace(spaceId)
+            organizationDB = AsyncOrganizationDataBase(orgId)
+            status_code = await organizationDB.checkSpace(spaceId)
             if status_code == 400:
                 return {
                     "status_code": status.HTTP_400_BAD_REQUEST,
@@ -1087,7 +1088,7 @@ class Spaces:
                     "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
                     "detail": "Internal server error",
                 }
-            status_code = organizationDB.removeSpace(spaceId)
+            status_code = await organizationDB.removeSpace(spaceId)
             if status_code == 422:
                 return {
                     "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -1109,7 +1110,7 @@ class Spaces:
                 "detail": f"{e}"
             } 
 
-    def getUsersInOrg(self, data):
+    async def getUsersInOrg(self, data):
         try:
             if not "admin" in self.role:
                 return {
@@ -1117,7 +1118,9 @@ class Spaces:
                     "detail": "Unauthorized Access",
                 }
             
-            status_code, users = self.applicationDB.getUsersInOrg(data["orgId"])
+            status_code, users = await self.applicationDB.getUsersInOrg(
+                data["orgId"], page=data.get("page", 1), page_size=data.get("page_size", 0)
+            )
 
             if status_code == status.HTTP_404_NOT_FOUND:
                 return {
@@ -1142,7 +1145,7 @@ class Spaces:
                 "detail": f"{e}"
             }       
     
-    def getAllUsers(self):
+    async def getAllUsers(self, data: dict = None):
         try:
             if not "admin" in self.role:
                 return {
@@ -1150,7 +1153,10 @@ class Spaces:
                     "detail": "Unauthorized Access",
                 }
             
-            status_code, users = self.applicationDB.getAllUsers()
+            data = data or {}
+            status_code, users = await self.applicationDB.getAllUsers(
+                page=data.get("page", 1), page_size=data.get("page_size", 0)
+            )
 
             if status_code == status.HTTP_404_NOT_FOUND:
                 return {
@@ -1176,14 +1182,16 @@ class Spaces:
                 "detail": f"{e}"
             } 
 
-    def getAllAnalystsInOrg(self, data):
+    async def getAllAnalystsInOrg(self, data):
         try:
             if not "admin" in self.role:
                 return {
                     "status_code": status.HTTP_401_UNAUTHORIZED,
                     "detail": "Unauthorized Access",
                 }
-            status_code, analysts = self.applicationDB.getAnalystsInOrg( data["orgId"])
+            status_code, analysts = await self.applicationDB.getAnalystsInOrg(
+                data["orgId"], page=data.get("page", 1), page_size=data.get("page_size", 0)
+            )
             if status_code == status.HTTP_404_NOT_FOUND:
                 return {
                         "status_code": status.HTTP_404_NOT_FOUND, 
@@ -7,7 +7,7 @@ router = APIRouter()
 async def getOrganizationsforAdmin(request_data: dict = Body(...)):
     try:
         org = organization_instance[request_data["sessionId"]]
-        return  org.getOrganizationsforAdmin()
+        return  await org.getOrganizationsforAdmin()
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e)) 
     
@@ -15,7 +15,7 @@ async def getOrganizationsforAdmin(request_data: dict = Body(...)):
 async def createSpace(request_data: dict = Body(...)):
     try:
         space = space_instance[request_data["sessionId"]]
-        return  space.createSpace(request_data["data"])
+        return  await space.createSpace(request_data["data"])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
     
@@ -23,7 +23,7 @@ async def createSpace(request_data: dict = Body(...)):
 async def removeSpace(request_data: dict = Body(...)):
     try:
         space = space_instance[request_data["sessionId"]]
-        return  space.removeSpace(request_data["data"])
+        return  await space.removeSpace(request_data["data"])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
     
@@ -31,7 +31,7 @@ async def removeSpace(request_data: dict = Body(...)):
 async def updateSpace(request_data: dict = Body(...)):
     try:
         space = space_instance[request_data["sessionId"]]
-        return  space.updateSpaceName(request_data["data"])
+        return  await space.updateSpaceName(request_data["data"])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
     
@@ -39,7 +39,7 @@ async def updateSpace(request_data: dict = Body(...)):
 async def getSpacesInOrg(request_data: dict = Body(...)):
     try:
         space = space_instance[request_data["sessionId"]]
-        return  space.getSpacesInOrg(request_data["data"])
+        return  await space.getSpacesInOrg(request_data["data"])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
     
@@ -47,7 +47,7 @@ async def getSpacesInOrg(request_data: dict = Body(...)):
 async def assignOrg(request_data: dict = Body(...)):
     try:
         org = organization_instance[request_data["sessionId"]]
-        return  org.assignUsersToOrg(request_data["data"])
+        return  await org.assignUsersToOrg(request_data["data"])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
     
@@ -56,7 +56,7 @@ async def assignOrg(request_data: dict = Body(...)):
 async def unassignSpace(request_data: dict = Body(...)):
     try:
         org = organization_instance[request_data["sessionId"]]
-        return  org.unassignUsersToOrg(request_data["data"])
+        return  await org.unassignUsersToOrg(request_data["data"])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
 
@@ -64,7 +64,7 @@ async def unassignSpace(request_data: dict = Body(...)):
 async def assignSpace(request_data: dict = Body(...)):
     try:
         space = space_instance[request_data["sessionId"]]
-        return  space.assignSpace(request_data["data"])
+        return  await space.assignSpace(request_data["data"])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
     
@@ -73,7 +73,7 @@ async def assignSpace(request_data: dict = Body(...)):
 async def unassignSpace(request_data: dict = Body(...)):
     try:
         space = space_instance[request_data["sessionId"]]
-        return  space.unassignSpace(request_data["data"])
+        return  await space.unassignSpace(request_data["data"])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
     
@@ -81,7 +81,7 @@ async def unassignSpace(request_data: dict = Body(...)):
 async def getAllUsers(request_data: dict = Body(...)):
     try:
         space = space_instance[request_data["sessionId"]]
-        return  space.getAllUsers()
+        return  await space.getAllUsers(request_data.get("data"))
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
    
@@ -90,7 +90,7 @@ async def getAllUsers(request_data: dict = Body(...)):
 async def getUsersInOrg(request_data: dict = Body(...)):
     try:
         space = space_instance[request_data["sessionId"]]
-        return  space.getUsersInOrg(request_data["data"])
+        return  await space.getUsersInOrg(request_data["data"])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
 
@@ -98,7 +98,7 @@ async def getUsersInOrg(request_data: dict = Body(...)):
 async def getAdminAllSpaces(request_data: dict = Body(...)):
     try:
         space = space_instance[request_data["sessionId"]]
-        return  space.getAdminAllSpaces()
+        return  await space.getAdminAllSpaces()
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
 
@@ -106,7 +106,7 @@ async def getAdminAllSpaces(request_data: dict = Body(...)):
 async def getAllAnalystsInOrg(request_data: dict = Body(...)):
     try:
         space = space_instance[request_data["sessionId"]]
-        return  space.getAllAnalystsInOrg(request_data["data"])
+        return  await space.getAllAnalystsInOrg(request_data["data"])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
 
@@ -131,7 +131,7 @@ async def deleteSpaces(request_data: dict = Body(...)):
 async def createClientAPIKey(request_data: dict = Body(...)):
     try:
         auth = authorization_instance[request_data["sessionId"]]
-        return  auth.createClientAPIKey(request_data['data'])
+        return  await auth.createClientAPIKey(request_data['data'])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
     
@@ -139,7 +139,7 @@ async def createClientAPIKey(request_data: dict = Body(...)):
 async def getClientAPIKeys(request_data: dict = Body(...)):
     try:
         auth = authorization_instance[request_data["sessionId"]]
-        return  auth.getClientAPIKeys(request_data['data'])
+        return  await auth.getClientAPIKeys(request_data['data'])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
     
@@ -7,7 +7,7 @@ router = APIRouter()
 async def getRoles(request_data: dict = Body(...)):
     try:
         role = role_instance[request_data["sessionId"]]
-        return  role.getAnalystSpaces()
+        return  await role.getAnalystSpaces()
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e)) 
 
@@ -15,7 +15,7 @@ async def getRoles(request_data: dict = Body(...)):
 async def getSpaceIdRoles(request_data: dict = Body(...)):
     try:
         role = role_instance[request_data["sessionId"]]
-        return  role.getRolesInspace(request_data["data"])
+        return  await role.getRolesInspace(request_data["data"])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e)) 
     
@@ -23,7 +23,7 @@ async def getSpaceIdRoles(request_data: dict = Body(...)):
 async def getOrgIdSpaces(request_data: dict = Body(...)):
     try:
         role = role_instance[request_data["sessionId"]]
-        return  role.getAnalystSpaces()
+        return  await role.getAnalystSpaces()
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e)) 
  
@@ -31,7 +31,7 @@ async def getOrgIdSpaces(request_data: dict = Body(...)):
 async def createRole(request_data: dict = Body(...)):
     try:
         role = role_instance[request_data["sessionId"]]
-        return  role.createRole(request_data["data"])
+        return  await role.createRole(request_data["data"])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
     
@@ -39,7 +39,7 @@ async def createRole(request_data: dict = Body(...)):
 async def removeRole(request_data: dict = Body(...)):
     try:
         role = role_instance[request_data["sessionId"]]
-        return  role.removeRole(request_data["data"])
+        return  await role.removeRole(request_data["data"])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
     
@@ -47,7 +47,7 @@ async def removeRole(request_data: dict = Body(...)):
 async def updateRole(request_data: dict = Body(...)):
     try:
         role = role_instance[request_data["sessionId"]]
-        return  role.updateRole(request_data["data"])
+        return  await role.updateRole(request_data["data"])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
     
@@ -55,7 +55,7 @@ async def updateRole(request_data: dict = Body(...)):
 async def getSpacesInOrg(request_data: dict = Body(...)):
     try:
         space = space_instance[request_data["sessionId"]]
-        return  space.getSpacesInOrg(request_data["data"])
+        return  await space.getSpacesInOrg(request_data["data"])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
     
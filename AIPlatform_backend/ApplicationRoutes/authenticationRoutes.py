@@ -33,7 +33,7 @@ evaluation_instance = {}
 async def login(request_data: dict = Body(...)):
     try:
         auth = Authentication(username=request_data["username"])
-        data = auth.login(requestData=request_data)
+        data = await auth.login(requestData=request_data)
         if data["status_code"] == 200:
             sessionId = request_data["sessionId"]
             
@@ -86,7 +86,7 @@ async def login(request_data: dict = Body(...)):
 async def register(request_data: dict = Body(...)):
     try:
         auth = authorization_instance[request_data["sessionId"]]
-        return  auth.createUser(request_data['data'])
+        return  await auth.createUser(request_data['data'])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
 
@@ -94,7 +94,7 @@ async def register(request_data: dict = Body(...)):
 async def getProfile(request_data: dict = Body(...)):
     try:
         auth = authorization_instance[request_data["sessionId"]]
-        return  auth.getProfile()
+        return  await auth.getProfile()
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))  
     
@@ -102,7 +102,7 @@ async def getProfile(request_data: dict = Body(...)):
 async def updateProfile(request_data: dict = Body(...)):
     try:
         auth = authorization_instance[request_data["sessionId"]]
-        return  auth.updateProfile(request_data['data'])
+        return  await auth.updateProfile(request_data['data'])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
     
@@ -110,6 +110,6 @@ async def updateProfile(request_data: dict = Body(...)):
 async def updateUserDetails(request_data: dict = Body(...)):
     try:
         auth = authorization_instance[request_data["sessionId"]]
-        return  auth.updateUserDetails(request_data['data'])
+        return  await auth.updateUserDetails(request_data['data'])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
@@ -26,7 +26,7 @@ async def addPrompt(request_data: dict = Body(...)):
         prompts = prompts_instance[session_id]
         print("data",data)
         # Pass the filtered data (excluding sessionId) to addPrompt
-        return prompts.addPrompt(data)
+        return await prompts.addPrompt(data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -61,7 +61,7 @@ async def getPrompts(request_data: dict = Body(...)):
         request_data.pop("sessionId", None)
         
         # Call the `getPromptsData` method of the corresponding instance
-        response = prompts.getPromptsData()
+        response = await prompts.getPromptsData()
         return response
 
     except KeyError as e:
@@ -113,7 +113,7 @@ async def updatePrompt(request_data: dict = Body(...)):
         request_data.pop("sessionId", None)
         
         # Call the `getPromptsData` method of the corresponding instance
-        response = prompts.updatePrompt(data=request_data)
+        response = await prompts.updatePrompt(data=request_data)
         return response
 
     except KeyError as e:
@@ -160,7 +160,7 @@ async def deletePrompt(request_data: dict = Body(...)):
         data = request_data.get("data")
         
         # Call the `getPromptsData` method of the corresponding instance
-        response = prompts.deletePrompt(data)
+        response = await prompts.deletePrompt(data)
         return response
 
     except KeyError as e:
@@ -208,7 +208,7 @@ async def addPayload(request_data: dict = Body(...)):
         data = request_data.get("data")
         
         # Call the `getPromptsData` method of the corresponding instance
-        response = payload.addPayload(data)
+        response = await payload.addPayload(data)
         return response
 
     except KeyError as e:
@@ -254,7 +254,7 @@ async def getPayloadDetails(request_data: dict = Body(...)):
         request_data.pop("sessionId", None)
         
         # Call the `getPromptsData` method of the corresponding instance
-        response = payload.getPayloadDetails()
+        response = await payload.getPayloadDetails()
         return response
 
     except KeyError as e:
@@ -298,7 +298,7 @@ async def deletePayload(request_data: dict = Body(...)):
         request_data.pop("sessionId", None)
         data = request_data.get("data")
         # Call the `getPromptsData` method of the corresponding instance
-        response = payloads.deletePayload(data)
+        response = await payloads.deletePayload(data)
         return response
 
     except KeyError as e:
@@ -347,7 +347,7 @@ async def addModel(request_data: dict = Body(...)):
         data =request_data.get("data")
         
         # Call the `getPromptsData` method of the corresponding instance
-        response = model.addModel(data)
+        response = await model.addModel(data)
         return response
 
     except KeyError as e:
@@ -394,7 +394,7 @@ async def getModeldetails(request_data: dict = Body(...)):
         request_data.pop("sessionId", None)
         data=request_data.get("data")
         # Call the `getPromptsData` method of the corresponding instance
-        response = model.getModeldetails(data)
+        response = await model.getModeldetails(data)
         return response
 
     except KeyError as e:
@@ -439,7 +439,7 @@ async def deleteModel(request_data: dict = Body(...)):
         request_data.pop("sessionId", None)
         data = request_data.get("data")
         # Call the `getPromptsData` method of the corresponding instance
-        response = models.deleteModel(data)
+        response = await models.deleteModel(data)
         return response
 
     except KeyError as e:
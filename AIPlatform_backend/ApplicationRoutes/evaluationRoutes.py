@@ -70,6 +70,14 @@ async def view_result(request_data: dict = Body(...)):
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))      
     
+@router.post("/api/view/latency")
+async def view_latency_percentiles(request_data: dict = Body(...)):
+    try:
+        evaluation = evaluation_instance[request_data["sessionId"]]
+        return await evaluation.view_latency_percentiles(request_data["data"])
+    except Exception as e:
+        return HTTPException(status_code=500, detail=str(e))
+
 @router.post("/api/view/status")
 async def view_status_by_userid(request_data: dict = Body(...)):
     try:
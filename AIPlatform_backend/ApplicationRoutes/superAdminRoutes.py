@@ -7,7 +7,7 @@ router = APIRouter()
 async def createOrg(request_data: dict = Body(...)):
     try:
         org = organization_instance[request_data["sessionId"]]
-        return  org.createOrganization(data = request_data['data'])
+        return  await org.createOrganization(data = request_data['data'])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
     
@@ -15,7 +15,7 @@ async def createOrg(request_data: dict = Body(...)):
 async def getOrganizations(request_data: dict = Body(...)):
     try:
         org = organization_instance[request_data["sessionId"]]
-        return  org.getOrganizations()
+        return  await org.getOrganizations()
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
     
@@ -23,7 +23,7 @@ async def getOrganizations(request_data: dict = Body(...)):
 async def updateOrganization(request_data: dict = Body(...)):
     try:
         org = organization_instance[request_data["sessionId"]]
-        return  org.updateOrganization(request_data['data'])
+        return  await org.updateOrganization(request_data['data'])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
     
@@ -31,7 +31,7 @@ async def updateOrganization(request_data: dict = Body(...)):
 async def removeOrganization(request_data: dict = Body(...)):
     try:
         org = organization_instance[request_data["sessionId"]]
-        return  org.removeOrganization(request_data['data'])
+        return  await org.removeOrganization(request_data['data'])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
 
@@ -39,7 +39,7 @@ async def removeOrganization(request_data: dict = Body(...)):
 async def getAdminsDetails(request_data: dict = Body(...)):
     try:
         auth = authorization_instance[request_data["sessionId"]]
-        return  auth.getAdminsDetails()
+        return  await auth.getAdminsDetails()
     except Exception as e:
         return HTTPException(status_code=500, detail="Unauthorized access")
     
@@ -55,7 +55,7 @@ async def removeAdmin(request_data: dict = Body(...)):
 async def getassignedAdmins(request_data: dict = Body(...)):
     try:
         auth = authorization_instance[request_data["sessionId"]]
-        return  auth.getassignedAdmins(spaceId = request_data["spaceId"])
+        return  await auth.getassignedAdmins(spaceId = request_data["spaceId"])
     except Exception as e:
         return HTTPException(status_code=500, detail=str(e))
     
@@ -1,8 +1,8 @@
 import os
 import logging
-from pymongo.mongo_client import MongoClient
 from fastapi import status
 from pymongo.errors import OperationFailure
+from Database.connectionRegistry import get_client
 
 # Set up logging
 projectDirectory = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -28,7 +28,7 @@ class ApplicationSetup:
         
         try:
             db_uri = "mongodb://"+mongo_ip+":"+mongo_port+"/"
-            self.client = MongoClient(db_uri)
+            self.client = get_client(db_uri)
             self.applicationConfigDB = self._get_application_db()
             self.status_code = 200
         except OperationFailure as op_err:
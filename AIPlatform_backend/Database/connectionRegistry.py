@@ -0,0 +1,183 @@
+import logging
+import threading
+import time
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import MongoClient, monitoring
+from pymongo.errors import PyMongoError
+from db_config import config
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Connection pool counters of one MongoClient, fed by pymongo's pool events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.open_connections = 0
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.pool_clears = 0
+
+    def _checkout_wait(self):
+        started = getattr(self._local, "checkout_started", None)
+        self._local.checkout_started = None
+        return time.perf_counter() - started if started is not None else 0.0
+
+    def connection_check_out_started(self, event):
+        # Check-out events are published on the thread that asked for the connection
+        self._local.checkout_started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        wait = self._checkout_wait()
+        with self._lock:
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+            self.checkouts += 1
+            self.wait_time_total += wait
+            self.wait_time_max = max(self.wait_time_max, wait)
+
+    def connection_check_out_failed(self, event):
+        wait = self._checkout_wait()
+        with self._lock:
+            self.checkout_failures += 1
+            self.wait_time_total += wait
+            self.wait_time_max = max(self.wait_time_max, wait)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections -= 1
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def snapshot(self):
+        with self._lock:
+            attempts = self.checkouts + self.checkout_failures
+            return {
+                "open_connections": self.open_connections,
+                "checked_out": self.checked_out,
+                "max_checked_out": self.max_checked_out,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "mean_wait_ms": self.wait_time_total / attempts * 1000 if attempts else 0.0,
+                "max_wait_ms": self.wait_time_max * 1000,
+                "pool_clears": self.pool_clears
+            }
+
+
+# One MongoClient (and so one pool and one set of monitor threads) per URI for the whole process
+_clients = {}
+_metrics = {}
+# Same for the Motor clients of the async handlers (MongoDBHandler, JobQueue)
+_async_clients = {}
+_async_metrics = {}
+_lock = threading.Lock()
+
+
+def _pool_options():
+    return {
+        "maxPoolSize": config["mongoMaxPoolSize"],
+        "minPoolSize": config["mongoMinPoolSize"],
+        "maxIdleTimeMS": config["mongoMaxIdleTimeMS"],
+        "waitQueueTimeoutMS": config["mongoWaitQueueTimeoutMS"],
+        "serverSelectionTimeoutMS": config["mongoServerSelectionTimeoutMS"]
+    }
+
+
+def default_uri():
+    return "mongodb://" + config['mongoip'] + ":" + config['mongoport'] + "/"
+
+
+def get_client(uri: str = None) -> MongoClient:
+    """Return the shared MongoClient of a URI, creating it on first use."""
+    uri = uri or default_uri()
+    with _lock:
+        client = _clients.get(uri)
+        if client is None:
+            metrics = PoolMetrics()
+            client = MongoClient(uri, event_listeners=[metrics], **_pool_options())
+            _clients[uri] = client
+            _metrics[uri] = metrics
+        return client
+
+
+def get_async_client(uri: str) -> AsyncIOMotorClient:
+    """Return the shared AsyncIOMotorClient of a URI, creating it on first use."""
+    with _lock:
+        client = _async_clients.get(uri)
+        if client is None:
+            metrics = PoolMetrics()
+            client = AsyncIOMotorClient(uri, event_listeners=[metrics], **_pool_options())
+            _async_clients[uri] = client
+            _async_metrics[uri] = metrics
+        return client
+
+
+def get_database(name: str, uri: str = None):
+    return get_client(uri)[name]
+
+
+def check_health(uri: str = None) -> dict:
+    """Ping the server through the shared pool."""
+    started = time.perf_counter()
+    try:
+        get_client(uri).admin.command("ping")
+        return {"status": "ok", "latency_ms": (time.perf_counter() - started) * 1000}
+    except PyMongoError as e:
+        logger.error(f"MongoDB health check failed: {e}")
+        return {"status": "unavailable", "detail": str(e)}
+
+
+def get_pool_metrics() -> dict:
+    """Pool metrics of every shared client, keyed by host list (the URI may carry credentials)."""
+    with _lock:
+        clients = [(uri, client, _metrics[uri], "") for uri, client in _clients.items()]
+        clients += [(uri, client, _async_metrics[uri], " (async)") for uri, client in _async_clients.items()]
+    return {
+        (",".join(f"{host}:{port}" for host, port in client.topology_description.server_descriptions()) or uri.split("@")[-1]) + suffix:
+            metrics.snapshot()
+        for uri, client, metrics, suffix in clients
+    }
+
+
+def close_clients():
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+        _metrics.clear()
+
+
+def close_async_clients():
+    with _lock:
+        for client in _async_clients.values():
+            client.close()
+        _async_clients.clear()
+        _async_metrics.clear()
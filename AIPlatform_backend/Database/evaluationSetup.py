@@ -1,27 +1,76 @@
-from datetime import datetime
+import asyncio
+import base64
+from datetime import datetime, timedelta
 import json
 import logging
 from fastapi import HTTPException
 from flask import request
-from pymongo import MongoClient, UpdateOne
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, MongoClient, ReturnDocument, UpdateOne
+from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+import bson
 from utils import StatusRecord
+from ApplicationManagment.Handlers.latencyHistogram import LatencyHistogram
 from Database.organizationDataBase import OrganizationDataBase
+from Database import connectionRegistry
+from Database.statusWriter import status_writer
+from Database.statusHub import status_hub
 from db_config import bench_config, eval_config
 
 logger = logging.getLogger(__name__)
 
+# Indexes per collection attribute of the handler, created by ensure_indexes.
+# Named explicitly so re-running against an existing database is a no-op.
+COLLECTION_INDEXES = {
+    "status_collection": [
+        ([("process_id", ASCENDING)], "process_id"),
+        ([("user_id", ASCENDING), ("start_time", DESCENDING)], "user_id_start_time"),
+        ([("user_id", ASCENDING), ("timestamp", DESCENDING), ("process_id", DESCENDING)], "user_id_timestamp_process_id"),
+        ([("user_id", ASCENDING), ("overall_status", ASCENDING)], "user_id_overall_status"),
+        ([("metrics.metric_id", ASCENDING)], "metrics_metric_id"),
+    ],
+    "config_collection": [
+        ([("process_id", ASCENDING)], "process_id"),
+        ([("user_id", ASCENDING), ("timestamp", DESCENDING), ("process_id", DESCENDING)], "user_id_timestamp_process_id"),
+    ],
+    "results_collection": [
+        ([("process_id", ASCENDING)], "process_id"),
+    ],
+    "result_chunks_collection": [
+        ([("process_id", ASCENDING), ("model_id", ASCENDING), ("payload_index", ASCENDING), ("chunk_index", ASCENDING)],
+         "process_id_model_id_chunk"),
+    ],
+    "metrics_collection": [
+        ([("metric_id", ASCENDING)], "metric_id"),
+        ([("process_id", ASCENDING), ("metric_id", ASCENDING)], "process_id_metric_id"),
+    ],
+    "work_queue_collection": [
+        ([("status", ASCENDING), ("created_at", ASCENDING)], "status_created_at"),
+        ([("process_id", ASCENDING), ("model_id", ASCENDING), ("shard_index", ASCENDING)], "process_id_model_id_shard"),
+    ],
+}
+
+# Order of the results and metric history pages, unique per row so it can be used as a keyset
+RESULTS_SORT = [("timestamp", DESCENDING), ("process_id", DESCENDING)]
+
 class MongoDBHandler:
+    # Handlers by (MONGO_URI, DB_NAME, org_id), see get_handler
+    handlers = {}
+
     def __init__(self, config, org_id: str):
         # Initialize the organization database first
         # self.org_db = OrganizationDataBase(org_id)
-        self.client = AsyncIOMotorClient(config['MONGO_URI'])
+        # Every handler of a URI shares one Motor client and its connection pool
+        self.client = connectionRegistry.get_async_client(config['MONGO_URI'])
         # Now use the organization's database for evaluation collections
         self.db = self.client[config['DB_NAME']]
         self.results_collection = self.db[config['RESULTS_COLLECTION']]
         self.status_collection = self.db[config['STATUS_COLLECTION']]
         self.config_collection = self.db[config['CONFIG_COLLECTION']]
         self.metrics_collection = self.db[config['METRICS_COLLECTION']]
+        self.work_queue_collection = self.db[config['WORK_QUEUE_COLLECTION']] if 'WORK_QUEUE_COLLECTION' in config else None
+        self.result_chunks_collection = self.db[config['RESULT_CHUNKS_COLLECTION']] if 'RESULT_CHUNKS_COLLECTION' in config else None
+        self.result_files = AsyncIOMotorGridFSBucket(self.db, bucket_name=config['RESULT_GRIDFS_BUCKET']) if 'RESULT_GRIDFS_BUCKET' in config else None
+        self.config = config
         self.connect()
 
     def connect(self):
@@ -31,17 +80,83 @@ class MongoDBHandler:
             self.db = self.db
         except Exception as e:
             logger.error(f"An error occurred while connecting to MongoDB: {e}")
-            if self.client:
-                self.client.close()
 
-    
+    @classmethod
+    def get_handler(cls, config, org_id: str):
+        """Cached handler of a config and organization, created on first use."""
+        key = (config['MONGO_URI'], config['DB_NAME'], org_id)
+        handler = cls.handlers.get(key)
+        if handler is None:
+            handler = cls.handlers[key] = cls(config, org_id)
+        return handler
+
+    @classmethod
+    def close_all(cls):
+        """Drop the cached handlers and close the shared Motor clients, on application shutdown."""
+        cls.handlers.clear()
+        connectionRegistry.close_async_clients()
+
+
+    async def ensure_indexes(self):
+        """Create the indexes of COLLECTION_INDEXES, idempotent so it can run on every startup."""
+        for attribute, indexes in COLLECTION_INDEXES.items():
+            collection = getattr(self, attribute, None)
+            if collection is None:
+                continue
+            for keys, name in indexes:
+                try:
+                    await collection.create_index(keys, name=name)
+                except Exception as e:
+                    logger.error(f"Could not create index {name} on {collection.name}: {e}")
+
+    @staticmethod
+    def _plan_stages(plan):
+        """All stage names of an explain() plan tree."""
+        if isinstance(plan, dict):
+            stages = [plan["stage"]] if "stage" in plan else []
+            for value in plan.values():
+                stages.extend(MongoDBHandler._plan_stages(value))
+            return stages
+        if isinstance(plan, list):
+            return [stage for item in plan for stage in MongoDBHandler._plan_stages(item)]
+        return []
+
+    async def verify_query_plans(self):
+        """Explain the hot status and results queries and log those answered by a collection scan.
+
+        The planner picks an index by the shape of the query, so placeholder values are enough.
+        """
+        user_id, process_id = "__explain__", "__explain__"
+        queries = {
+            "get_process_status_by_userid": self.status_collection.find({"user_id": user_id}).sort("start_time", -1),
+            "get_process_results": self.config_collection.find({"user_id": user_id}).sort(RESULTS_SORT),
+            "get_process_results (status)": self.status_collection.find({"process_id": process_id}).limit(1),
+            "get_metric_results": self.status_collection.find(
+                {"user_id": user_id, "metrics": {"$exists": True, "$ne": []}}
+            ).sort(RESULTS_SORT),
+            "check_ongoing_task": self.status_collection.find(
+                {"user_id": user_id, "overall_status": "In Progress"}
+            ).limit(1),
+        }
+        collscans = []
+        for name, cursor in queries.items():
+            try:
+                explain = await cursor.explain()
+            except Exception as e:
+                logger.error(f"Could not explain {name}: {e}")
+                continue
+            if "COLLSCAN" in self._plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {})):
+                logger.warning(f"{name} on {self.db.name} falls back to a collection scan")
+                collscans.append(name)
+        return collscans
+
     async def get_mongo_handler(service: str, org_id: str):
         print("service", service)
         if service == "evaluation":
             print("hii, i am eval")
-            return MongoDBHandler(eval_config, org_id)  # Evaluation-specific handler
+            return MongoDBHandler.get_handler(eval_config, org_id)  # Evaluation-specific handler
         elif service == "benchmarking":
-            return MongoDBHandler(bench_config, org_id)  # Benchmarking-specific handler
+            return MongoDBHandler.get_handler(bench_config, org_id)  # Benchmarking-specific handler
         else:
             print("no service")
             raise HTTPException(status_code=400, detail="Invalid service")
@@ -62,7 +177,9 @@ class MongoDBHandler:
             raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
     async def update_status_record(self, status_record: dict):
-    
+        # Queued changes go first so they cannot land on top of this record
+        await status_writer.flush(self.status_collection, status_record["process_id"])
+        status_hub.publish_document(status_record)
         await self.status_collection.update_one(
             {"process_id": status_record["process_id"]},
             {
@@ -77,7 +194,18 @@ class MongoDBHandler:
             upsert=True
         )
     
+    async def queue_model_status(self, process_id: str, model_id: str, new_status: str, overall_status: str = None):
+        """Coalesced model status change, written within the status write interval or at once when terminal."""
+        status_hub.publish(process_id, {model_id: new_status}, overall_status)
+        await status_writer.set_model_status(self.status_collection, process_id, model_id, new_status, overall_status)
+
+    async def queue_metric_model_status(self, process_id: str, model_id: str, new_status: str, metric_id: str, overall_status: str):
+        """Coalesced update_metric_model_status, the metric must already exist (see update_metric_status_record)."""
+        await status_writer.set_metric_model_status(self.status_collection, process_id, metric_id, model_id, new_status, overall_status)
+
     async def update_model_status(self, process_id: str, model_id: str, new_status: str, overall_status: str):
+        await status_writer.flush(self.status_collection, process_id)
+        status_hub.publish(process_id, {model_id: new_status}, overall_status)
         await self.status_collection.update_one(
             {
                 "process_id": process_id,  # Find the process by its ID
@@ -91,35 +219,27 @@ class MongoDBHandler:
                 }
             }
         )
-        print("---bye")
     async def update_metric_model_status(self, process_id: str, model_id: str, new_status: str, metric_id: str, overall_status: str):
-        # Check if the metric_id already exists in the metrics array
-        existing_metric = await self.status_collection.find_one(
+        await status_writer.flush(self.status_collection, process_id)
+        # Update the model status inside the metric when the metric exists
+        result = await self.status_collection.update_one(
             {
-                "process_id": process_id,
-                "metrics.metric_id": metric_id
+                "process_id": process_id,  # Match the process by ID
+                "metrics.metric_id": metric_id  # Match the specific metric by ID
             },
-            {"metrics.$": 1}  # Only fetch the specific metric array for efficiency
+            {
+                "$set": {
+                    "metrics.$[metric].models.$[model].status": new_status,  # Update the model's status within the existing metric
+                    "metrics.$[metric].metric_overall_status": overall_status  # Update the overall status for the matched metric
+                }
+            },
+            array_filters=[
+                {"metric.metric_id": metric_id},
+                {"model.model_id": model_id}  # Filter for the correct model inside metrics' models
+            ]
         )
         
-        if existing_metric:
-            # If the metric exists, update the existing model status in that metric
-            await self.status_collection.update_one(
-                {
-                    "process_id": process_id,  # Match the process by ID
-                    "metrics.metric_id": metric_id  # Match the specific metric by ID
-                },
-                {
-                    "$set": {
-                        "metrics.$.models.$[model].status": new_status,  # Update the model's status within the existing metric
-                        "metrics.$.metric_overall_status": overall_status  # Update the overall status for the matched metric
-                    }
-                },
-                array_filters=[
-                    {"model.model_id": model_id}  # Filter for the correct model inside metrics' models
-                ]
-            )
-        else:
+        if result.matched_count == 0:
             # If the metric does not exist, add a new metric to the metrics array
             new_metric = {
                 "metric_id": metric_id,
@@ -134,7 +254,8 @@ class MongoDBHandler:
 
             await self.status_collection.update_one(
                 {
-                    "process_id": process_id  # Match the process by ID
+                    "process_id": process_id,  # Match the process by ID
+                    "metrics.metric_id": {"$ne": metric_id}  # Unless a concurrent call added it meanwhile
                 },
                 {
                     "$push": {
@@ -143,8 +264,6 @@ class MongoDBHandler:
                 }
             )
 
-
-        print("---bye")
     async def update_metric_status_record(self, status_record: StatusRecord, process_name):
         # Prepare the metrics object to add to the database
         metrics_data = {
@@ -191,7 +310,8 @@ class MongoDBHandler:
 
     async def update_overall_status(self, process_id: str, overall_status: str):
         """Update the status of a specific model within a process in the database."""
-        
+        await status_writer.flush(self.status_collection, process_id)
+        status_hub.publish(process_id, overall_status=overall_status)
         await self.status_collection.update_one(
             {
                 "process_id": process_id,  # Find the process by its ID
@@ -203,7 +323,7 @@ class MongoDBHandler:
             }
         )
     async def update_metric_overall_status(self, process_id: str, metric_id: str, overall_status: str):
-    
+        await status_writer.flush(self.status_collection, process_id)
         await self.status_collection.update_one(
             {
                 "process_id": process_id,  # Match the process
@@ -216,15 +336,326 @@ class MongoDBHandler:
             }
         )
 
-    async def update_results_record(self, process_id: str,process_name: str, user_id: str, config_type: str, model_id: str,model_name:str, results: dict):
-        """Update the status of a specific process in the database."""
+    async def update_results_record(self, process_id: str,process_name: str, user_id: str, config_type: str, model_id: str,model_name:str, results: dict,
+                                    latency_histograms: dict = None, streaming_histograms: dict = None):
+        """Store one model's results: the rows in chunk documents, the rest in the process summary document.
+
+        Keeping the rows out of the summary keeps it far below the 16 MB document limit whatever
+        the evaluation size, and lets readers load one model, or stream its rows, on their own.
+        """
         timestamp = datetime.utcnow()
+        if self.result_chunks_collection is not None and isinstance(results, dict):
+            model_record = {"model_id": model_id, "model_name": model_name, "chunked": True}
+            model_record.update(await self._write_result_chunks(process_id, model_id, results))
+        else:
+            model_record = {"model_id": model_id, "model_name": model_name, "results": results}
+        if latency_histograms is not None:
+            # Compact latency histograms (see LatencyHistogram.to_dict) keyed by payload set, plus "overall"
+            model_record["latency_histograms"] = latency_histograms
+        if streaming_histograms is not None:
+            # {"ttft": {...}, "inter_token": {...}} in the same compact form
+            model_record["streaming_histograms"] = streaming_histograms
+        # A re-run of the model (a re-claimed job) replaces its entry instead of adding a second one
+        await self.results_collection.update_one(
+                {"process_id": process_id},
+                {"$pull": {"models": {"model_id": model_id}}}
+        )
         await self.results_collection.update_one(
                 {"user_id": user_id, "process_id": process_id, "process_name": process_name, "config_type": config_type},
-                {"$push": {"models": {"model_id": model_id, "model_name": model_name, "results": results}}},
+                {"$push": {"models": model_record}},
                 upsert=True
         )
 
+    async def get_completed_model_ids(self, process_id: str):
+        """Models of a process that are Completed and have their results stored, e.g. by an earlier attempt of a re-claimed job."""
+        status_document, results_document = await asyncio.gather(
+            self.status_collection.find_one({"process_id": process_id}, {"models": 1}),
+            self.results_collection.find_one({"process_id": process_id}, {"models.model_id": 1})
+        )
+        if not status_document or not results_document:
+            return set()
+        stored = {model.get("model_id") for model in results_document.get("models", [])}
+        return {
+            model.get("model_id") for model in status_document.get("models", [])
+            if model.get("status") == "Completed" and model.get("model_id") in stored
+        }
+
+    def _chunk_rows(self, rows: list):
+        """Split rows into chunks bounded by RESULT_CHUNK_ROWS and RESULT_CHUNK_MAX_BYTES."""
+        max_rows = self.config.get("RESULT_CHUNK_ROWS", 500)
+        max_bytes = self.config.get("RESULT_CHUNK_MAX_BYTES", 8 * 1024 * 1024)
+        chunk, chunk_bytes = [], 0
+        for row in rows:
+            row_bytes = len(bson.encode({"row": row}))
+            if chunk and (len(chunk) >= max_rows or chunk_bytes + row_bytes > max_bytes):
+                yield chunk
+                chunk, chunk_bytes = [], 0
+            chunk.append(row)
+            chunk_bytes += row_bytes
+        if chunk:
+            yield chunk
+
+    async def _spill_large_fields(self, row, file_ids: list):
+        """Move texts above RESULT_GRIDFS_THRESHOLD_BYTES to GridFS, leaving their file ids in the row."""
+        threshold = self.config.get("RESULT_GRIDFS_THRESHOLD_BYTES", 0)
+        if not threshold or self.result_files is None or not isinstance(row, dict):
+            return row
+        spilled = {}
+        for field, value in row.items():
+            if isinstance(value, str) and len(value) > threshold // 4 and len(value.encode("utf-8")) > threshold:
+                spilled[field] = await self.result_files.upload_from_stream(field, value.encode("utf-8"))
+        if not spilled:
+            return row
+        file_ids.extend(spilled.values())
+        row = {field: (None if field in spilled else value) for field, value in row.items()}
+        row["_spilled"] = spilled
+        return row
+
+    async def _restore_spilled_fields(self, row):
+        if not isinstance(row, dict) or "_spilled" not in row:
+            return row
+        row = dict(row)
+        for field, file_id in row.pop("_spilled").items():
+            stream = await self.result_files.open_download_stream(file_id)
+            row[field] = (await stream.read()).decode("utf-8")
+        return row
+
+    async def delete_result_chunks(self, process_id: str, model_id: str):
+        """Remove the stored rows of a model, with the GridFS files they spilled to."""
+        async for chunk in self.result_chunks_collection.find(
+            {"process_id": process_id, "model_id": model_id, "files": {"$ne": []}}, {"files": 1}
+        ):
+            for file_id in chunk["files"]:
+                await self.result_files.delete(file_id)
+        await self.result_chunks_collection.delete_many({"process_id": process_id, "model_id": model_id})
+
+    async def _write_row_chunks(self, process_id: str, rows_key: str, rows: list):
+        """Replace the chunks stored under rows_key with one list of rows, e.g. a work item's or a metric's."""
+        await self.delete_result_chunks(process_id, rows_key)
+        chunks = []
+        for chunk_index, chunk_rows in enumerate(self._chunk_rows(rows)):
+            file_ids = []
+            chunk_rows = [await self._spill_large_fields(row, file_ids) for row in chunk_rows]
+            chunks.append({
+                "process_id": process_id,
+                "model_id": rows_key,
+                "payload_key": "rows",
+                "payload_index": 0,
+                "chunk_index": chunk_index,
+                "rows": chunk_rows,
+                "files": file_ids
+            })
+        if chunks:
+            await self.result_chunks_collection.insert_many(chunks)
+
+    async def _read_row_chunks(self, process_id: str, rows_key: str):
+        rows = []
+        async for chunk in self.result_chunks_collection.find(
+            {"process_id": process_id, "model_id": rows_key}, {"rows": 1}
+        ).sort([("payload_index", ASCENDING), ("chunk_index", ASCENDING)]):
+            for row in chunk["rows"]:
+                rows.append(await self._restore_spilled_fields(row))
+        return rows
+
+    async def _write_result_chunks(self, process_id: str, model_id: str, results: dict):
+        """Write the row lists of results as chunks and return what the summary keeps of them."""
+        # A re-run of the model replaces its rows
+        await self.delete_result_chunks(process_id, model_id)
+        fields, payloads, row_count = {}, [], 0
+        for payload_index, (payload_key, rows) in enumerate(results.items()):
+            if not isinstance(rows, list):
+                # Scalars such as the timestamp stay in the summary
+                fields[payload_key] = rows
+                continue
+            chunks = []
+            for chunk_index, chunk_rows in enumerate(self._chunk_rows(rows)):
+                file_ids = []
+                chunk_rows = [await self._spill_large_fields(row, file_ids) for row in chunk_rows]
+                chunks.append({
+                    "process_id": process_id,
+                    "model_id": model_id,
+                    "payload_key": payload_key,
+                    "payload_index": payload_index,
+                    "chunk_index": chunk_index,
+                    "rows": chunk_rows,
+                    "files": file_ids
+                })
+            if chunks:
+                await self.result_chunks_collection.insert_many(chunks)
+            payloads.append({"key": payload_key, "index": payload_index, "chunks": len(chunks), "rows": len(rows)})
+            row_count += len(rows)
+        return {"keys": list(results.keys()), "fields": fields, "payloads": payloads, "row_count": row_count}
+
+    async def _get_model_record(self, process_id: str, model_id: str):
+        document = await self.results_collection.find_one(
+            {"process_id": process_id}, {"models": {"$elemMatch": {"model_id": model_id}}}
+        )
+        models = document.get("models") if document else None
+        return models[0] if models else None
+
+    async def iter_model_rows(self, process_id: str, model_id: str, payload_key: str = None):
+        """Yield (payload_key, row) for the results of one model, holding a single chunk in memory."""
+        model_record = await self._get_model_record(process_id, model_id)
+        if model_record is None:
+            return
+        if not model_record.get("chunked"):
+            # Documents written before the results were chunked keep the rows inline
+            for key, rows in (model_record.get("results") or {}).items():
+                if isinstance(rows, list) and payload_key in (None, key):
+                    for row in rows:
+                        yield key, row
+            return
+        query = {"process_id": process_id, "model_id": model_id}
+        if payload_key is not None:
+            query["payload_key"] = payload_key
+        async for chunk in self.result_chunks_collection.find(query, {"payload_key": 1, "rows": 1}).sort(
+            [("payload_index", ASCENDING), ("chunk_index", ASCENDING)]
+        ):
+            for row in chunk["rows"]:
+                yield chunk["payload_key"], await self._restore_spilled_fields(row)
+
+    async def _assemble_model_results(self, process_id: str, model_record: dict):
+        """The results dict of a model as it was passed to update_results_record."""
+        if not model_record.get("chunked"):
+            return model_record.get("results")
+        fields = model_record.get("fields", {})
+        rows = {payload["key"]: [] for payload in model_record.get("payloads", [])}
+        async for payload_key, row in self.iter_model_rows(process_id, model_record["model_id"]):
+            rows[payload_key].append(row)
+        # Original key order, scalars included
+        return {key: fields[key] if key in fields else rows.get(key, []) for key in model_record.get("keys", [])}
+
+    async def _assemble_models(self, process_id: str, models: list):
+        assembled = []
+        for model_record in models:
+            model_record = dict(model_record)
+            model_record["results"] = await self._assemble_model_results(process_id, model_record)
+            for key in ("chunked", "keys", "fields", "payloads", "row_count"):
+                model_record.pop(key, None)
+            assembled.append(model_record)
+        return assembled
+
+    async def get_latency_percentiles(self, process_id: str, percentiles: list, model_id: str = None, payload_key: str = "overall"):
+        """Recompute latency percentiles from the stored histograms, merged across models unless model_id is given."""
+        document = await self.results_collection.find_one(
+            {"process_id": process_id},
+            {"models.model_id": 1, "models.latency_histograms": 1}
+        )
+        if not document:
+            raise HTTPException(status_code=404, detail="Document not found.")
+
+        histograms = [
+            LatencyHistogram.from_dict(model["latency_histograms"][payload_key])
+            for model in document.get("models", [])
+            if (model_id is None or model.get("model_id") == model_id)
+            and payload_key in model.get("latency_histograms", {})
+        ]
+        if not histograms:
+            return {}
+        merged = LatencyHistogram.merge_all(histograms, histograms[0].significant_figures)
+        return merged.percentiles(percentiles)
+
+    async def insert_work_items(self, process_id: str, model_id: str, shard_kwargs: list):
+        """Queue one work item per benchmark shard."""
+        created_at = datetime.utcnow()
+        await self.work_queue_collection.insert_many([
+            {
+                "process_id": process_id,
+                "model_id": model_id,
+                "shard_index": index,
+                "tester_kwargs": kwargs,
+                "status": "Pending",
+                "attempts": 0,
+                "lease_until": None,
+                "created_at": created_at
+            }
+            for index, kwargs in enumerate(shard_kwargs)
+        ])
+
+    def _work_item_lease(self):
+        return datetime.utcnow() + timedelta(seconds=self.config["WORK_QUEUE_LEASE_SECONDS"])
+
+    async def claim_work_item(self, worker_id: str):
+        """
+        Atomically take the oldest pending work item, or one whose worker stopped renewing its lease,
+        or return None if there is none.
+        """
+        now = datetime.utcnow()
+        return await self.work_queue_collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": "Pending"},
+                    {"status": "In Progress", "lease_until": {"$lt": now}}
+                ],
+                "attempts": {"$lt": self.config["WORK_QUEUE_MAX_ATTEMPTS"]}
+            },
+            {
+                "$set": {"status": "In Progress", "worker_id": worker_id, "claimed_at": now, "lease_until": self._work_item_lease()},
+                "$inc": {"attempts": 1}
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def renew_work_item(self, item_id, worker_id: str):
+        """Extend the lease of a running work item, False once another worker took it over."""
+        result = await self.work_queue_collection.update_one(
+            {"_id": item_id, "worker_id": worker_id, "status": "In Progress"},
+            {"$set": {"lease_until": self._work_item_lease()}}
+        )
+        return result.matched_count > 0
+
+    @staticmethod
+    def _work_item_rows_key(item: dict):
+        # Per attempt, so a worker that lost its lease cannot mix its rows with the new attempt's
+        return f"{item['model_id']}:shard{item['shard_index']}:{item['attempts']}"
+
+    async def complete_work_item(self, item: dict, worker_id: str, shard: dict):
+        """
+        Store a finished shard. Its rows go to result chunks like the results of a model,
+        the work item keeps the mergeable histograms and counters.
+        """
+        shard = dict(shard)
+        rows = shard.pop("rows", [])
+        rows_key = self._work_item_rows_key(item)
+        await self._write_row_chunks(item["process_id"], rows_key, rows)
+        shard["rows_key"] = rows_key
+        result = await self.work_queue_collection.update_one(
+            {"_id": item["_id"], "worker_id": worker_id, "status": "In Progress"},
+            {"$set": {"status": "Completed", "result": shard, "lease_until": None, "completed_at": datetime.utcnow()}}
+        )
+        if result.matched_count == 0:
+            # The lease ran out and the shard was handed to another worker, keep its result instead
+            await self.delete_result_chunks(item["process_id"], rows_key)
+            logger.error(f"Work item {item['_id']} was taken over by another worker, dropped this result")
+
+    async def get_work_item_rows(self, item: dict):
+        """Rows of a completed work item, in the order the worker produced them."""
+        return await self._read_row_chunks(item["process_id"], item["result"]["rows_key"])
+
+    async def delete_work_item_rows(self, items: list):
+        for item in items:
+            if item.get("result"):
+                await self.delete_result_chunks(item["process_id"], item["result"]["rows_key"])
+
+    async def fail_work_item(self, item_id, worker_id: str, error: str):
+        await self.work_queue_collection.update_one(
+            {"_id": item_id, "worker_id": worker_id},
+            {"$set": {"status": "Failed", "error": error, "lease_until": None, "completed_at": datetime.utcnow()}}
+        )
+
+    async def cancel_work_items(self, process_id: str, model_id: str):
+        """Withdraw the unfinished work items of a model, e.g. once its coordinator gave up on it."""
+        await self.work_queue_collection.update_many(
+            {"process_id": process_id, "model_id": model_id, "status": {"$in": ["Pending", "In Progress"]}},
+            {"$set": {"status": "Cancelled", "lease_until": None, "completed_at": datetime.utcnow()}}
+        )
+
+    async def get_work_items(self, process_id: str, model_id: str):
+        return await self.work_queue_collection.find(
+            {"process_id": process_id, "model_id": model_id}
+        ).sort("shard_index", 1).to_list(length=None)
+
     async def update_metric_ranges(self, metric_id, metric_name, new_ranges):
             # Find the document with the provided metric_id
             document = await self.metrics_collection.find_one({"metric_id": metric_id})
@@ -252,10 +683,20 @@ class MongoDBHandler:
         # If no document is found with the provided metric_id
     
 
-    async def update_metrics_results_record(self, process_id, user_id, config_type, object_id, metric_id, process_name, model_id, metrics_results):
-        # Check if the document exists for the given process_id and user_id
+    @staticmethod
+    def _metric_rows_key(metric_id: str, model_id: str):
+        return f"{model_id}:metric:{metric_id}"
+
+    async def update_metrics_results_record(self, process_id, user_id, config_type, object_id, metric_id, process_name, model_id, metrics_results,
+                                            row_scores: list = None):
+        """Store one model's scores in the metric document, its per-row scores (if any) in result chunks."""
         # Get the current timestamp as Unix time
         current_timestamp = int(datetime.utcnow().timestamp())
+        model_entry = {"model_id": model_id, "metrics_results": metrics_results}
+        if row_scores and self.result_chunks_collection is not None:
+            rows_key = self._metric_rows_key(metric_id, model_id)
+            await self._write_row_chunks(process_id, rows_key, row_scores)
+            model_entry["row_scores"] = {"rows_key": rows_key, "row_count": len(row_scores)}
 
         existing_document = await self.metrics_collection.find_one(
             {
@@ -281,10 +722,7 @@ class MongoDBHandler:
             },
             {
                 "$push": {
-                    "models": {
-                        "model_id": model_id,
-                        "metrics_results": metrics_results
-                    }
+                    "models": model_entry
                 },
                 # Update the timestamp for the record
                 "$set": {
@@ -303,12 +741,7 @@ class MongoDBHandler:
                     "eval_id" : object_id,
                     "metric_id": metric_id,
                     "timestamp": current_timestamp,
-                    "models": [
-                        {
-                            "model_id": model_id,
-                            "metrics_results": metrics_results
-                        }
-                    ]
+                    "models": [model_entry]
                 }
             )
     async def fetch_metrics_by_id(self, metric_id: str):
@@ -326,7 +759,27 @@ class MongoDBHandler:
     
         return metrics_results
 
+    async def get_metric_row_scores(self, process_id: str, metric_id: str, model_id: str):
+        """Per-row scores of one model in a metric run, in the order its responses were scored."""
+        return await self._read_row_chunks(process_id, self._metric_rows_key(metric_id, model_id))
+
     
+    async def update_unfinished_models_status(self, document: dict, status: str):
+        """Set every model that has not completed, and the overall status, to `status` in a single update."""
+        process_id = document["process_id"]
+        await status_writer.flush(self.status_collection, process_id)
+        if any(model['status'] != "Completed" for model in document['models']):
+            status_hub.publish(
+                process_id,
+                {model['model_id']: status for model in document['models'] if model['status'] != "Completed"},
+                status
+            )
+            await self.status_collection.update_one(
+                {"_id": document["_id"]},
+                {"$set": {"models.$[model].status": status, "overall_status": status}},
+                array_filters=[{"model.status": {"$ne": "Completed"}}]
+            )
+
     async def update_model_status_to_cancelled(self, process_id):
         print("db", process_id)
         
@@ -337,35 +790,7 @@ class MongoDBHandler:
         if not document:
             raise HTTPException(status_code=404, detail="Process not found")
 
-        # Prepare the updates for models and overall status
-        updates = []
-        overall_status_updated = False
-
-        for model in document['models']:
-            if model['status'] != "Completed":
-                # Prepare the update operation to change status to "Cancelled"
-                updates.append(
-                    UpdateOne(
-                        {"_id": document["_id"], "models.model_id": model["model_id"]},
-                        {"$set": {"models.$.status": "Cancelled"}}
-                    )
-                )
-                overall_status_updated = True  # Set flag if we update any model
-
-        # Update overall status if any model status was updated
-        if overall_status_updated:
-            updates.append(
-                UpdateOne(
-                    {"_id": document["_id"]},  # Target the same document
-                    {"$set": {"overall_status": "Cancelled"}}
-                )
-            )
-
-        # Execute the bulk updates if there are any changes
-        if updates:
-            result = await self.status_collection.bulk_write(updates)
-              # Print update result for debugging
-
+        await self.update_unfinished_models_status(document, "Cancelled")
         return {"status": "All non-completed model statuses updated to 'Cancelled'"}
 
 
@@ -373,17 +798,22 @@ class MongoDBHandler:
     async def insert_config_record(self, config_data: dict):
         print("Inserting to config db")
         
-        # Check if a record with the given user_id exists, and update it if found, else insert a new one
-       # Insert a new record every time, without checking for an existing user_id
-        await self.config_collection.insert_one({
-            "user_id": config_data['user_id'],  # Set the user_id
-            "process_id": config_data['process_id'],  # Set the process_id
-            "process_name": config_data["process_name"],  # Set the process_name
-            "model_id": config_data["model_id"],  # Set the model_id
-            "model_name": config_data["model_name"],  # Set the model_name
-            "payload_file_path": config_data["payload_file_path"],
-            "timestamp": int(datetime.utcnow().timestamp())  # Set the payload_file_path
-        })
+        # One record per process, a re-claimed job finds the record of its first attempt
+        await self.config_collection.update_one(
+            {"process_id": config_data['process_id']},
+            {
+                "$set": {
+                    "user_id": config_data['user_id'],  # Set the user_id
+                    "process_name": config_data["process_name"],  # Set the process_name
+                    "model_id": config_data["model_id"],  # Set the model_id
+                    "model_name": config_data["model_name"],  # Set the model_name
+                    "payload_file_path": config_data["payload_file_path"]
+                },
+                # The first attempt's timestamp keeps the process in place in the results listing
+                "$setOnInsert": {"timestamp": int(datetime.utcnow().timestamp())}
+            },
+            upsert=True
+        )
         
     async def insert_schedule_record(self, schedule_data: dict):
         # Check if a record with the given user_id exists
@@ -418,11 +848,11 @@ class MongoDBHandler:
     async def get_model_statuses_by_process_id(self, process_id: str):
         # Fetch the document associated with the given process_id
         result = await self.status_collection.find_one({"process_id": process_id})
-        
-        overall_status = result.get("overall_status", None)
         if not result or "models" not in result:
-            # If no result or models array not found, return an empty list
-            return []
+            # Not written yet, the status stream keeps checking
+            return None, "Process not found"
+
+        overall_status = result.get("overall_status", None)
 
         # Extract model_id and status from the models array
         model_statuses = []
@@ -496,86 +926,175 @@ class MongoDBHandler:
     # )
     #     return document if document else None
     
-    async def get_process_results(self, user_id: str, page: int, page_size: int):
-    # Calculate the number of documents to skip
-        skip = (page - 1) * page_size
-        # Find documents for the specific user_id with pagination and sort by timestamp in descending order
-        cursor = self.config_collection.find({"user_id": user_id}).sort("timestamp", -1).skip(skip).limit(page_size)
-        # Prepare the result list to store task details
-        results = []
-        # Iterate over each document in the paginated cursor
-        async for document in cursor:
-            process_id = document.get("process_id")
-            # Fetch the overall_status for the process_id from the status_collection
-            status_document = await self.status_collection.find_one({"process_id": str(process_id)})
-            overall_status = status_document.get("overall_status") if status_document else None
-            
-            # Append the task details directly from each document's fields
-            results.append({
-                "process_id": process_id,
+    @staticmethod
+    def _page_stages(page: int, page_size: int):
+        """$skip/$limit stages of a 1-based page, page_size 0 returns everything."""
+        if not page_size:
+            return []
+        return [{"$skip": (max(page, 1) - 1) * page_size}, {"$limit": page_size}]
+
+    @staticmethod
+    def encode_cursor(position: dict):
+        """Opaque page cursor of a keyset position."""
+        return base64.urlsafe_b64encode(json.dumps(position, separators=(",", ":")).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str):
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return position["timestamp"], position["process_id"], position.get("metric_index", 0)
+        except (ValueError, TypeError, KeyError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    @staticmethod
+    def _before(timestamp, process_id, inclusive: bool = False):
+        """Rows after (timestamp, process_id) in RESULTS_SORT order."""
+        return {"$or": [
+            {"timestamp": {"$lt": timestamp}},
+            {"timestamp": timestamp, "process_id": {"$lte" if inclusive else "$lt": process_id}}
+        ]}
+
+    async def get_process_results(self, user_id: str, page: int, page_size: int, cursor: str = None):
+        """A page of the user's evaluations with their overall_status, the total count and the next cursor.
+
+        With a cursor the page starts right after it through the (user_id, timestamp, process_id)
+        index, so deep pages cost the same as the first one. Without it page/page_size skip rows.
+        """
+        page_stages = [
+            {"$lookup": {
+                "from": self.status_collection.name,
+                "localField": "process_id",
+                "foreignField": "process_id",
+                "as": "status"
+            }},
+            {"$project": {
+                "_id": 0,
+                "process_id": 1,
+                "process_name": 1,
+                "model_id": 1,
+                "model_name": 1,
+                "payload_file_path": 1,
+                "timestamp": 1,
+                "overall_status": {"$arrayElemAt": ["$status.overall_status", 0]}
+            }}
+        ]
+        if cursor:
+            timestamp, process_id, _ = self.decode_cursor(cursor)
+            pipeline = [
+                {"$match": {"$and": [{"user_id": user_id}, self._before(timestamp, process_id)]}},
+                {"$sort": dict(RESULTS_SORT)}
+            ] + ([{"$limit": page_size}] if page_size else []) + page_stages
+            # The page and the count both only walk the index, run them side by side
+            documents, total_count = await asyncio.gather(
+                self.config_collection.aggregate(pipeline).to_list(length=None),
+                self.config_collection.count_documents({"user_id": user_id})
+            )
+        else:
+            # One round-trip: the page of configs joined with their overall_status, and the total count
+            pipeline = [
+                {"$match": {"user_id": user_id}},
+                {"$sort": dict(RESULTS_SORT)},
+                {"$facet": {
+                    "page": self._page_stages(page, page_size) + page_stages,
+                    "total": [{"$count": "count"}]
+                }}
+            ]
+            facet = (await self.config_collection.aggregate(pipeline).to_list(length=1))[0]
+            documents = facet["page"]
+            total_count = facet["total"][0]["count"] if facet["total"] else 0
+
+        results = [
+            {
+                "process_id": document.get("process_id"),
                 "process_name": document.get("process_name"),
                 "model_id": document.get("model_id"),
                 "model_name": document.get("model_name"),
                 "payload_path": document.get("payload_file_path"),
                 "timestamp": document.get("timestamp"),
-                "overall_status": overall_status
+                "overall_status": document.get("overall_status")
+            }
+            for document in documents
+        ]
+        next_cursor = None
+        if page_size and len(results) == page_size:
+            next_cursor = self.encode_cursor({"timestamp": results[-1]["timestamp"], "process_id": results[-1]["process_id"]})
 
-            })
-        
-        # Fetch the total count of documents for this user_id
-        total_count = await self.config_collection.count_documents({"user_id": user_id})
-        
-        # Calculate the total number of pages
-        total_pages = (total_count + page_size - 1) // page_size
-        
         # Return paginated results and metadata
-        return results,total_count
+        return results, total_count, next_cursor
     
-    async def get_metric_results(self, user_id: str, page: int, page_size: int):
-        # Calculate the number of documents to skip for pagination
-        skip = (page - 1) * page_size
-
-        # Step 1: Calculate the total doc_count (total metrics available)
-        total_metrics = 0
-        async for document in self.status_collection.find(
-            {"user_id": user_id, "metrics": {"$exists": True, "$ne": []}}
-        ):
-            if "metrics" in document:
-                total_metrics += len(document["metrics"])
+    async def get_metric_results(self, user_id: str, page: int, page_size: int, cursor: str = None):
+        """A page of the user's metric runs, the total count and the next cursor.
 
-        # Step 2: Fetch metrics with pagination logic
-        flattened_metrics = []
-        cursor = (
-            self.status_collection.find(
-                {"user_id": user_id, "metrics": {"$exists": True, "$ne": []}}
+        Each metric of a status document is a row, so the cursor also keeps the position
+        inside the metrics array of the document the previous page ended in.
+        """
+        match = {"user_id": user_id, "metrics": {"$exists": True, "$ne": []}}
+        page_stages = [
+            {"$project": {
+                "_id": 0,
+                "metric_id": "$metrics.metric_id",
+                "models": "$metrics.models",
+                "overall_status": "$metrics.metric_overall_status",
+                "process_name": 1,
+                "process_id": 1,
+                "metric_index": 1,
+                "timestamp": 1
+            }}
+        ]
+        unwind = {"$unwind": {"path": "$metrics", "includeArrayIndex": "metric_index"}}
+        if cursor:
+            timestamp, process_id, metric_index = self.decode_cursor(cursor)
+            pipeline = [
+                {"$match": {"$and": [match, self._before(timestamp, process_id, inclusive=True)]}},
+                {"$sort": dict(RESULTS_SORT)},
+                unwind,
+                # Skip the metrics of the last document that the previous page already returned
+                {"$match": {"$or": [{"process_id": {"$ne": process_id}}, {"metric_index": {"$gte": metric_index}}]}}
+            ] + ([{"$limit": page_size}] if page_size else []) + page_stages
+            count_pipeline = [
+                {"$match": match},
+                {"$group": {"_id": None, "count": {"$sum": {"$size": "$metrics"}}}}
+            ]
+            metrics, totals = await asyncio.gather(
+                self.status_collection.aggregate(pipeline).to_list(length=None),
+                self.status_collection.aggregate(count_pipeline).to_list(length=1)
             )
-            .sort("timestamp", -1)
-        )
-
-        async for document in cursor:
-            process_name = document.get("process_name")
-            timestamp = document.get("timestamp")
-
-            if "metrics" in document:
-                for metric in document["metrics"]:
-                    metric_info = {
-                        "metric_id": metric.get("metric_id"),
-                        "models": metric.get("models"),
-                        "overall_status": metric.get("metric_overall_status"),
-                        "process_name": process_name,
-                        "timestamp": timestamp
-                    }
-                    flattened_metrics.append(metric_info)
-
-            if len(flattened_metrics) >= (skip + page_size):
-                break
-
-        # Apply pagination to the flattened metrics
-        paginated_metrics = flattened_metrics[skip:skip + page_size]
+            doc_count = totals[0]["count"] if totals else 0
+        else:
+            # One round-trip: every metric of the user's status documents is a row, paged and counted in Mongo
+            pipeline = [
+                {"$match": match},
+                {"$sort": dict(RESULTS_SORT)},
+                unwind,
+                {"$facet": {
+                    "page": self._page_stages(page, page_size) + page_stages,
+                    "total": [{"$count": "count"}]
+                }}
+            ]
+            facet = (await self.status_collection.aggregate(pipeline).to_list(length=1))[0]
+            metrics = facet["page"]
+            doc_count = facet["total"][0]["count"] if facet["total"] else 0
 
-        doc_count = total_metrics
-        # Return the paginated results and the total count of metric_id
-        return paginated_metrics, doc_count
+        paginated_metrics = [
+            {
+                "metric_id": metric.get("metric_id"),
+                "models": metric.get("models"),
+                "overall_status": metric.get("overall_status"),
+                "process_name": metric.get("process_name"),
+                "timestamp": metric.get("timestamp")
+            }
+            for metric in metrics
+        ]
+        next_cursor = None
+        if page_size and len(metrics) == page_size:
+            last = metrics[-1]
+            next_cursor = self.encode_cursor({
+                "timestamp": last.get("timestamp"),
+                "process_id": last.get("process_id"),
+                "metric_index": last["metric_index"] + 1
+            })
+        # Return the paginated results, the total count of metric_id and the cursor of the next page
+        return paginated_metrics, doc_count, next_cursor
 
 
     async def get_results_by_process_id(self, process_id: str):
@@ -587,13 +1106,12 @@ class MongoDBHandler:
             # Check if the document exists
             if not document:
                 raise HTTPException(status_code=404, detail="Document not found.")
-            print("document", document)
             # Extract the 'models' array from the document
             models = document.get("models")
-            print("models", models)
             # Check if 'models' is not found in the document
             if models is None:
                 raise HTTPException(status_code=404, detail="'models' object not found in the document.")
+            models = await self._assemble_models(process_id, models)
             
             # Find the model with the matching model_id
             #model = next((m for m in models if m.get("model_id") == model_id), None)
@@ -636,7 +1154,7 @@ class MongoDBHandler:
                 raise HTTPException(status_code=404, detail="'results' object not found in the document.")
             
             # Return the 'results' object
-            return results
+            return await self._assemble_models(process_id, results)
         except Exception as e:
             # Handle any unexpected exceptions
             raise HTTPException(status_code=500, detail=str(e))
@@ -651,15 +1169,10 @@ class MongoDBHandler:
         return document['results_path'] if document and 'results_path' in document else None
     
     async def get_results_by_model_id(self, process_id, model_id):
-        # Query to find the document by process_id
-        process_doc = await self.results_collection.find_one({"process_id": process_id})
-
-        if process_doc:
-            # Iterate through the models array to find the specific model_id
-            for model in process_doc['models']:
-                if model['model_id'] == model_id:
-                    # Extract and return the results for the specific model_id
-                    return model.get('results', None)
+        # Only the summary entry of this model, then its own chunks
+        model_record = await self._get_model_record(process_id, model_id)
+        if model_record:
+            return await self._assemble_model_results(process_id, model_record)
         
         # Return None if no document or results found
         return None
@@ -669,5 +1182,5 @@ class MongoDBHandler:
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        if self.client:
-            self.client.close()
+        # The Motor client is shared, it is closed by close_all on shutdown
+        pass
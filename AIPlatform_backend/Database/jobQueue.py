@@ -0,0 +1,171 @@
+from datetime import datetime, timedelta
+import logging
+
+from pymongo import ASCENDING, ReturnDocument
+
+from Database import connectionRegistry
+from Database.evaluationSetup import MongoDBHandler
+from db_config import bench_config, eval_config, job_queue_config
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """Mongo-backed queue of evaluation, metrics and benchmark jobs, run by worker.py.
+
+    A claimed job holds a lease that its worker renews with heartbeats. A job whose lease
+    ran out (the worker crashed or lost the database) is claimed again by the next worker,
+    up to MAX_ATTEMPTS times. Cancellation is requested on the job document and picked up
+    by the worker on its next heartbeat.
+    """
+
+    def __init__(self, config: dict = job_queue_config):
+        self.config = config
+        self.client = connectionRegistry.get_async_client(config["MONGO_URI"])
+        self.db = self.client[config["DB_NAME"]]
+        self.jobs_collection = self.db[config["JOBS_COLLECTION"]]
+        self.workers_collection = self.db[config["WORKERS_COLLECTION"]]
+
+    async def ensure_indexes(self):
+        try:
+            await self.jobs_collection.create_index([("status", ASCENDING), ("created_at", ASCENDING)], name="status_created_at")
+            await self.jobs_collection.create_index([("process_id", ASCENDING)], name="process_id")
+            await self.workers_collection.create_index([("worker_id", ASCENDING)], name="worker_id", unique=True)
+        except Exception as e:
+            logger.error(f"Could not create job queue indexes: {e}")
+
+    def _lease_until(self):
+        return datetime.utcnow() + timedelta(seconds=self.config["LEASE_SECONDS"])
+
+    async def enqueue(self, kind: str, process_id: str, org_id: str, payload: dict, **kwargs):
+        """Queue a job, kind is "evaluation", "metrics" or "benchmark"."""
+        job = {
+            "kind": kind,
+            "process_id": process_id,
+            "org_id": org_id,
+            "payload": payload,
+            "status": "Pending",
+            "attempts": 0,
+            "cancel_requested": False,
+            "worker_id": None,
+            "lease_until": None,
+            "created_at": datetime.utcnow()
+        }
+        job.update(kwargs)
+        result = await self.jobs_collection.insert_one(job)
+        return result.inserted_id
+
+    async def claim(self, worker_id: str):
+        """Take the oldest pending job, or one whose lease expired, or return None."""
+        now = datetime.utcnow()
+        return await self.jobs_collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": "Pending"},
+                    {"status": "Running", "lease_until": {"$lt": now}}
+                ],
+                "attempts": {"$lt": self.config["MAX_ATTEMPTS"]},
+                "cancel_requested": False
+            },
+            {
+                "$set": {"status": "Running", "worker_id": worker_id, "lease_until": self._lease_until(), "claimed_at": now},
+                "$inc": {"attempts": 1}
+            },
+            sort=[("created_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def heartbeat(self, job_id, worker_id: str):
+        """Renew the lease, returns the job (to check cancel_requested) or None once the lease is lost."""
+        return await self.jobs_collection.find_one_and_update(
+            {"_id": job_id, "worker_id": worker_id, "status": "Running"},
+            {"$set": {"lease_until": self._lease_until(), "heartbeat_at": datetime.utcnow()}},
+            projection={"cancel_requested": 1},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def finish(self, job_id, worker_id: str, status: str, error: str = None):
+        """Mark a job Completed, Failed or Cancelled, if this worker still holds it."""
+        await self.jobs_collection.update_one(
+            {"_id": job_id, "worker_id": worker_id},
+            {"$set": {"status": status, "error": error, "lease_until": None, "finished_at": datetime.utcnow()}}
+        )
+
+    async def update_process_status(self, job: dict, status: str):
+        """Carry a Cancelled or Failed job over to the status document of its process or metric."""
+        config = bench_config if job["kind"] == "benchmark" else eval_config
+        mongo_handler = MongoDBHandler.get_handler(config, job.get("org_id"))
+        if job["kind"] == "metrics":
+            await mongo_handler.update_metric_overall_status(job["process_id"], job["metric_id"], status)
+            return
+        document = await mongo_handler.get_status_document_by_process_id(job["process_id"])
+        # A job still pending has not created its status document yet
+        if document:
+            await mongo_handler.update_unfinished_models_status(document, status)
+
+    async def fail_exhausted(self):
+        """Give up on jobs whose lease expired on their last attempt."""
+        now = datetime.utcnow()
+        async for job in self.jobs_collection.find(
+            {"status": "Running", "lease_until": {"$lt": now}, "attempts": {"$gte": self.config["MAX_ATTEMPTS"]}}
+        ):
+            result = await self.jobs_collection.update_one(
+                {"_id": job["_id"], "status": "Running", "lease_until": {"$lt": now}},
+                {"$set": {"status": "Failed", "error": "Lease expired on the last attempt", "lease_until": None, "finished_at": now}}
+            )
+            # Another worker may have retired it first
+            if result.modified_count:
+                await self.update_process_status(job, "Failed")
+
+    async def request_cancel(self, process_id: str):
+        """Cancel the jobs of a process: pending ones right away, running ones on their next heartbeat."""
+        cancelled = 0
+        async for job in self.jobs_collection.find({"process_id": process_id, "status": "Pending"}):
+            result = await self.jobs_collection.update_one(
+                {"_id": job["_id"], "status": "Pending"},
+                {"$set": {"status": "Cancelled", "cancel_requested": True, "finished_at": datetime.utcnow()}}
+            )
+            # Skipped if a worker claimed it meanwhile, the update below reaches it then
+            if result.modified_count:
+                cancelled += 1
+                await self.update_process_status(job, "Cancelled")
+        running = await self.jobs_collection.update_many(
+            {"process_id": process_id, "status": "Running"},
+            {"$set": {"cancel_requested": True}}
+        )
+        return cancelled + running.modified_count
+
+    async def record_worker(self, worker_id: str, running: int, completed: int = 0, failed: int = 0, busy_seconds: float = 0):
+        """Upsert the throughput counters of a worker."""
+        now = datetime.utcnow()
+        await self.workers_collection.update_one(
+            {"worker_id": worker_id},
+            {
+                "$set": {"running": running, "last_seen": now},
+                "$inc": {"jobs_completed": completed, "jobs_failed": failed, "busy_seconds": busy_seconds},
+                "$setOnInsert": {"started_at": now}
+            },
+            upsert=True
+        )
+
+    async def get_worker_stats(self):
+        """Jobs per minute and utilisation of every worker seen by the queue."""
+        stats = []
+        now = datetime.utcnow()
+        async for worker in self.workers_collection.find({}, {"_id": 0}):
+            uptime = max((now - worker["started_at"]).total_seconds(), 1)
+            worker["jobs_per_minute"] = round(worker.get("jobs_completed", 0) * 60 / uptime, 3)
+            worker["alive"] = (now - worker["last_seen"]).total_seconds() < self.config["LEASE_SECONDS"]
+            stats.append(worker)
+        return stats
+
+
+job_queue = None
+
+
+def get_job_queue():
+    """Process-wide JobQueue, created on first use."""
+    global job_queue
+    if job_queue is None:
+        job_queue = JobQueue()
+    return job_queue
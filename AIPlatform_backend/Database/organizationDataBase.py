@@ -2,7 +2,6 @@ import os
 import logging
 from bson import ObjectId
 from pymongo import UpdateOne
-from pymongo.mongo_client import MongoClient
 from fastapi import status
 from pymongo.errors import OperationFailure
 from werkzeug.security import check_password_hash
@@ -29,9 +28,9 @@ mongo_port = config['mongoport']
 
 
 import logging
-from pymongo import MongoClient
 from pymongo.errors import OperationFailure
 from fastapi import status
+from Database.connectionRegistry import get_client
 
 
 class OrganizationDataBase:
@@ -42,8 +41,7 @@ class OrganizationDataBase:
         self.orgId = orgId
         # self.applicationDB = ApplicationDataBase()
         try:
-            db_uri = f"mongodb://{mongo_ip}:{mongo_port}/"
-            self.client = MongoClient(db_uri)
+            self.client = get_client()
             self.organizationDB = self._get_organization_db(orgId)
             self.status_code = 200
         except OperationFailure as op_err:
@@ -59,18 +57,8 @@ class OrganizationDataBase:
                 logging.error("MongoClient is not initialized.")
                 self.status_code = 500
                 return None
-            
-            # Check if the database already exists
-            existing_dbs = self.client.list_database_names()
-            if orgId in existing_dbs:
-                logging.info(f"Database '{orgId}' already exists.")
-                return self.client[orgId]
-
-            # If the database does not exist, create it by accessing it
-            logging.info(f"Creating new database '{orgId}'.")
-            org_db = self.client[orgId]
-            
-            return org_db
+            # MongoDB creates the database on its first write, no need to list the existing ones
+            return self.client[orgId]
         except OperationFailure as op_err:
             logging.error(f"Error accessing or creating database: {op_err}")
             self.status_code = 500
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+
+from pymongo.errors import OperationFailure
+
+from db_config import status_hub_config
+
+logger = logging.getLogger(__name__)
+
+# Overall statuses after which a process sends no more updates
+FINAL_STATUSES = {"Completed", "Failed", "Cancelled"}
+
+
+class StatusHub:
+    """In-process pub/sub of process statuses for the SSE status streams.
+
+    MongoDBHandler publishes every status transition it writes. Transitions written by
+    other workers arrive through one change stream per status collection, or through one
+    polling query per interval for all subscribed processes where change streams are not
+    available. Subscribers only receive the fields that changed.
+
+    Snapshots are only kept while a process has subscribers, since nothing watches it
+    otherwise; the first subscriber of a process reads its statuses again (load_snapshot).
+    """
+
+    def __init__(self):
+        # process_id -> {"models": {model_id: status}, "overall_status": str}
+        self.snapshots = {}
+        # process_id -> set of subscriber queues
+        self.subscribers = {}
+        # Processes whose statuses were read since their first subscriber
+        self.loaded = set()
+        # service -> status collection, used by the watchers and for the first snapshot of a process
+        self.collections = {}
+        self.watchers = []
+
+    def publish(self, process_id: str, models: dict = None, overall_status: str = None):
+        """Merge a transition into the snapshot and pass what changed to the subscribers."""
+        queues = self.subscribers.get(process_id)
+        if not queues:
+            # Nobody is listening, the next subscriber reads the statuses again
+            self.snapshots.pop(process_id, None)
+            return
+        snapshot = self.snapshots.setdefault(process_id, {"models": {}, "overall_status": None})
+        delta = {}
+        for model_id, status in (models or {}).items():
+            if snapshot["models"].get(model_id) != status:
+                snapshot["models"][model_id] = status
+                delta.setdefault("models", {})[model_id] = status
+        if overall_status is not None and snapshot["overall_status"] != overall_status:
+            snapshot["overall_status"] = overall_status
+            delta["overall_status"] = overall_status
+
+        if delta:
+            for queue in queues:
+                try:
+                    queue.put_nowait(delta)
+                except asyncio.QueueFull:
+                    # A stalled client gets the full snapshot instead of the backlog
+                    while not queue.empty():
+                        queue.get_nowait()
+                    queue.put_nowait(self.snapshot(process_id))
+
+    def publish_document(self, document: dict):
+        """Publish the statuses of an EvalStatus/BenchStatus document."""
+        models = {model.get("model_id"): model.get("status") for model in document.get("models", [])}
+        self.publish(document.get("process_id"), models, document.get("overall_status"))
+
+    def snapshot(self, process_id: str):
+        snapshot = self.snapshots.get(process_id)
+        if snapshot is None:
+            return None
+        return {"models": dict(snapshot["models"]), "overall_status": snapshot["overall_status"]}
+
+    def is_final(self, process_id: str):
+        snapshot = self.snapshots.get(process_id)
+        if snapshot is None:
+            return False
+        statuses = snapshot["models"].values()
+        return snapshot["overall_status"] in FINAL_STATUSES or (
+            bool(statuses) and all(status in FINAL_STATUSES for status in statuses)
+        )
+
+    def subscribe(self, process_id: str):
+        queue = asyncio.Queue(maxsize=status_hub_config["SUBSCRIBER_QUEUE_SIZE"])
+        self.subscribers.setdefault(process_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, process_id: str, queue):
+        queues = self.subscribers.get(process_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self.subscribers[process_id]
+                # Not watched any more, a snapshot kept now would go stale
+                self.snapshots.pop(process_id, None)
+                self.loaded.discard(process_id)
+
+    async def load_snapshot(self, process_id: str, read_statuses):
+        """
+        Snapshot of a subscribed process, read with read_statuses() the first time it is asked for.
+
+        read_statuses is a coroutine function returning ([{"model_id", "status"}], overall_status),
+        or (None, error) when the process is not found yet, in which case None is returned.
+        """
+        if process_id not in self.loaded:
+            model_statuses, overall_status = await read_statuses()
+            if model_statuses is None:
+                return None
+            models = {model["model_id"]: model["status"] for model in model_statuses}
+            current = self.snapshots.get(process_id)
+            if current is not None:
+                # Transitions published while reading are newer than what was read
+                models.update(current["models"])
+                overall_status = current["overall_status"] or overall_status
+            self.publish(process_id, models, overall_status)
+            if process_id not in self.subscribers:
+                return None
+            self.loaded.add(process_id)
+        return self.snapshot(process_id)
+
+    def start(self, collections: dict):
+        """Start one watcher per status collection, keyed by service name."""
+        self.collections.update(collections)
+        for collection in collections.values():
+            self.watchers.append(asyncio.create_task(self._watch(collection)))
+
+    async def stop(self):
+        for watcher in self.watchers:
+            watcher.cancel()
+        await asyncio.gather(*self.watchers, return_exceptions=True)
+        self.watchers = []
+
+    async def _watch(self, collection):
+        pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}}]
+        while True:
+            try:
+                async with collection.watch(pipeline, full_document="updateLookup") as stream:
+                    async for change in stream:
+                        document = change.get("fullDocument")
+                        if document and document.get("process_id") in self.subscribers:
+                            self.publish_document(document)
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                # Standalone servers have no change streams
+                logger.info(f"Change stream on {collection.full_name} unavailable ({e}), polling instead")
+                await self._poll(collection)
+                return
+            except Exception as e:
+                logger.error(f"Status watcher on {collection.full_name} failed: {e}")
+                await asyncio.sleep(status_hub_config["POLL_SECONDS"])
+
+    async def _poll(self, collection):
+        # One query per interval for every subscribed process, whatever the number of clients
+        while True:
+            process_ids = list(self.subscribers)
+            if process_ids:
+                try:
+                    async for document in collection.find(
+                        {"process_id": {"$in": process_ids}}, {"process_id": 1, "models": 1, "overall_status": 1}
+                    ):
+                        self.publish_document(document)
+                except Exception as e:
+                    logger.error(f"Status poll on {collection.full_name} failed: {e}")
+            await asyncio.sleep(status_hub_config["POLL_SECONDS"])
+
+
+status_hub = StatusHub()
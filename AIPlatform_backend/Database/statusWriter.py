@@ -0,0 +1,140 @@
+import asyncio
+import logging
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from db_config import config
+
+logger = logging.getLogger(__name__)
+
+# Statuses written right away, every other change waits for the next flush
+TERMINAL_STATUSES = {
+    "Completed",
+    "Failed",
+    "Cancelled",
+    "Metrics Calculation Completed",
+    "Metrics Calculation Failed",
+}
+
+
+class StatusWriter:
+    """Coalesces status changes per process_id into at most one write per interval.
+
+    Changes are merged in memory and written by a background flush every interval,
+    as one targeted $set (arrayFilters on models/metrics) per process and one
+    bulk_write per status collection. Terminal statuses flush their process at once.
+    A batch that fails to reach the server is queued again for the next flush.
+    """
+
+    def __init__(self, interval_seconds: float):
+        self.interval = interval_seconds
+        # (collection full name, process_id) -> pending changes of the process
+        self.pending = {}
+        self.flusher = None
+        self.lock = None
+
+    def _get_lock(self):
+        # Created on first use so it belongs to the running event loop
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        return self.lock
+
+    def _entry(self, collection, process_id: str):
+        entry = self.pending.get((collection.full_name, process_id))
+        if entry is None:
+            entry = {"collection": collection, "fields": {}, "models": {}, "metrics": {}}
+            self.pending[(collection.full_name, process_id)] = entry
+        return entry
+
+    def _metric_entry(self, collection, process_id: str, metric_id: str):
+        return self._entry(collection, process_id)["metrics"].setdefault(metric_id, {"overall": None, "models": {}})
+
+    async def set_model_status(self, collection, process_id: str, model_id: str, status: str, overall_status: str = None):
+        entry = self._entry(collection, process_id)
+        entry["models"][model_id] = status
+        if overall_status is not None:
+            entry["fields"]["overall_status"] = overall_status
+        await self._schedule(collection, process_id, status in TERMINAL_STATUSES or overall_status in TERMINAL_STATUSES)
+
+    async def set_metric_model_status(self, collection, process_id: str, metric_id: str, model_id: str, status: str,
+                                      metric_overall_status: str = None):
+        metric = self._metric_entry(collection, process_id, metric_id)
+        metric["models"][model_id] = status
+        if metric_overall_status is not None:
+            metric["overall"] = metric_overall_status
+        await self._schedule(collection, process_id, status in TERMINAL_STATUSES or metric_overall_status in TERMINAL_STATUSES)
+
+    async def _schedule(self, collection, process_id: str, terminal: bool):
+        if terminal:
+            await self.flush(collection, process_id)
+        elif self.flusher is None:
+            self.flusher = asyncio.create_task(self._run())
+
+    def _requeue(self, key, entry: dict):
+        """Put back the changes of a failed write, under any change queued for the process since."""
+        newer = self.pending.get(key)
+        if newer is not None:
+            entry["fields"].update(newer["fields"])
+            entry["models"].update(newer["models"])
+            for metric_id, metric in newer["metrics"].items():
+                merged = entry["metrics"].setdefault(metric_id, {"overall": None, "models": {}})
+                if metric["overall"] is not None:
+                    merged["overall"] = metric["overall"]
+                merged["models"].update(metric["models"])
+        self.pending[key] = entry
+        if self.flusher is None:
+            self.flusher = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while self.pending:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+        self.flusher = None
+
+    @staticmethod
+    def build_update(process_id: str, entry: dict):
+        """One UpdateOne setting every pending change of a process through arrayFilters."""
+        fields = dict(entry["fields"])
+        array_filters = []
+        for i, (model_id, status) in enumerate(entry["models"].items()):
+            fields[f"models.$[m{i}].status"] = status
+            array_filters.append({f"m{i}.model_id": model_id})
+        for j, (metric_id, metric) in enumerate(entry["metrics"].items()):
+            array_filters.append({f"x{j}.metric_id": metric_id})
+            if metric["overall"] is not None:
+                fields[f"metrics.$[x{j}].metric_overall_status"] = metric["overall"]
+            for i, (model_id, status) in enumerate(metric["models"].items()):
+                fields[f"metrics.$[x{j}].models.$[x{j}m{i}].status"] = status
+                array_filters.append({f"x{j}m{i}.model_id": model_id})
+        return UpdateOne({"process_id": process_id}, {"$set": fields}, array_filters=array_filters or None)
+
+    async def flush(self, collection=None, process_id: str = None):
+        """Write the pending changes of one process, or of every process when none is given."""
+        async with self._get_lock():
+            if process_id is None:
+                entries, self.pending = self.pending, {}
+            else:
+                key = (collection.full_name, process_id)
+                entries = {key: self.pending.pop(key)} if key in self.pending else {}
+
+            batches = {}
+            for key, entry in entries.items():
+                batch = batches.setdefault(key[0], (entry["collection"], []))
+                batch[1].append(key)
+
+            for full_name, (status_collection, keys) in batches.items():
+                updates = [self.build_update(key[1], entries[key]) for key in keys]
+                try:
+                    await status_collection.bulk_write(updates, ordered=False)
+                except BulkWriteError as e:
+                    # The server rejected these updates, writing them again would fail the same way
+                    logger.error(f"Status updates rejected by {full_name}: {e.details.get('writeErrors')}")
+                except Exception as e:
+                    # Nothing is known to be written, retry the whole batch with the next flush
+                    logger.error(f"Error writing {len(updates)} status updates to {full_name}, retrying: {e}")
+                    for key in keys:
+                        self._requeue(key, entries[key])
+
+
+status_writer = StatusWriter(config["statusWriteIntervalMS"] / 1000)
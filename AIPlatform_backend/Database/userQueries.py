@@ -0,0 +1,61 @@
+from pymongo import ASCENDING
+
+# Collections of the application database that hold the user accounts, created by setup.py
+USER_COLLECTIONS = ["users", "userAuthentication", "userAttributes", "refreshTokens"]
+
+# Fields rendered by the user and analyst listings, never the password hash or contact number
+USER_LIST_PROJECTION = {"username": 1, "email": 1, "firstName": 1, "lastName": 1, "role": 1, "orgIds": 1}
+
+# Fields of the profile page, the role map stays server side
+USER_PROFILE_PROJECTION = {"_id": 0, "role": 0}
+
+# Order of the listings, the trailing _id of every listing index
+USER_LIST_SORT = [("_id", ASCENDING)]
+
+# Indexes of the users collection, created at startup by ensureIndexes, as (keys, name, options).
+# A missing role.user is the [null, null] range of a regular index, and _id last gives the listing sort.
+# role.admin and role.superadmin are arrays, which cannot share a compound index with orgIds, so their
+# $exists: false predicates stay filters on the few documents the index returns.
+USER_INDEXES = [
+    ([("orgIds", ASCENDING), ("role.user", ASCENDING), ("_id", ASCENDING)], "orgIds_role_user", {}),
+    ([("role.user", ASCENDING), ("_id", ASCENDING)], "role_user", {}),
+    ([("orgIds", ASCENDING), ("_id", ASCENDING)], "orgIds_analysts",
+     {"partialFilterExpression": {"role.analyst": {"$exists": True}}}),
+    ([("username", ASCENDING)], "username", {}),
+    ([("email", ASCENDING)], "email", {}),
+]
+# Indexes of earlier releases that USER_INDEXES replaces, dropped by ensureIndexes
+REPLACED_USER_INDEXES = ["orgIds", "role_wildcard"]
+
+
+def existing_user_query(username: str, email: str) -> dict:
+    """Users that already hold the username or the email."""
+    return {"$or": [{"username": username}, {"email": email}]}
+
+
+def plain_users_query(orgId: str = None) -> dict:
+    """Users without an admin, superadmin or user role, of one organization when orgId is given."""
+    query = {
+        "role.admin": {"$exists": False},
+        "role.superadmin": {"$exists": False},
+        "role.user": {"$exists": False},
+    }
+    if orgId is not None:
+        # orgIds is an array, equality matches any element through the multikey index
+        query = {"orgIds": orgId, **query}
+    return query
+
+
+def analysts_query(orgId: str = None) -> dict:
+    """Users with an analyst role, of one organization when orgId is given."""
+    query = {"role.analyst": {"$exists": True}}
+    if orgId is not None:
+        query = {"orgIds": orgId, **query}
+    return query
+
+
+def page_bounds(page: int, page_size: int):
+    """(skip, limit) of a listing page, page_size 0 is every match."""
+    if not page_size:
+        return 0, 0
+    return (max(page, 1) - 1) * page_size, page_size
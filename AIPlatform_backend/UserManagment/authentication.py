@@ -4,6 +4,7 @@ import yaml
 from fastapi import HTTPException, Body, status
 from Database.applicationSetup import *
 from Database.applicationDataBase import *
+from Database.asyncApplicationDataBase import AsyncApplicationDataBase
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from random import randint
@@ -28,7 +29,7 @@ logger = logging.getLogger(__name__)
 
     
 def initilizeApplicationDB():
-    applicationDB = ApplicationDataBase()
+    applicationDB = AsyncApplicationDataBase()
     return applicationDB
 
 
@@ -109,7 +110,7 @@ class Authentication:
                 status.HTTP_401_UNAUTHORIZED
             }
         
-    def login(self, requestData: dict):
+    async def login(self, requestData: dict):
         try:
             additional_fields = set(requestData.keys()) - {
                 "username",
@@ -207,7 +208,7 @@ class Authentication:
                             "detail":"Internal server error",
                         }'''
             else:
-                status_code, UserCredentials = self.applicationDB.checkUserCredentials(
+                status_code, UserCredentials = await self.applicationDB.checkUserCredentials(
                     username=username, password=password
                 )
                 print("response",UserCredentials,status_code)
@@ -255,14 +256,14 @@ class Authentication:
                         "detail":"Internal server error",
                     }'''
                 
-                status_code = self.applicationDB.addRefreshToken(
+                status_code = await self.applicationDB.addRefreshToken(
                     userId = userId, deviceHash= deviceHash, refreshToken= refreshToken
                 )
 
                 self.refreshToken =  refreshToken
 
                 # Authentication successful
-                status_code = self.applicationDB.update_last_login(userId = userId)
+                status_code = await self.applicationDB.update_last_login(userId = userId)
                 
                 return {
                     "status_code": status_code,
@@ -282,7 +283,7 @@ class Authentication:
                 "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR, "detail": str(e)
             }
 
-    def new_access_token(self, requestData: dict = Body(...)):
+    async def new_access_token(self, requestData: dict = Body(...)):
         try:
             additional_fields = set(requestData.keys()) - {
                 "deviceHash"
@@ -314,7 +315,7 @@ class Authentication:
             roles = refresh_data["user_data"]["role"]
             refreshTokenDeviceHash = refresh_data["user_data"]["deviceHash"]
 
-            status_code, userId = self.applicationDB.getUserId(username=username, role=roles)
+            status_code, userId = await self.applicationDB.getUserId(username=username, role=roles)
 
             if status_code == 404:
                 return {
@@ -354,14 +355,14 @@ class Authentication:
                 "detail":str(e)
             }
 
-    def logout(self, deviceHash: str):
+    async def logout(self, deviceHash: str):
         try:
             # Update the user_active column to 'inactive'
             userId = self.userId
             if not userId:
                 return HTTPException(status_code=400, detail="UserID is required")
             
-            status_code = self.applicationDB.deleteUserAttributes(
+            status_code = await self.applicationDB.deleteUserAttributes(
                 userId=userId, deviceHash= deviceHash
             )
 
@@ -377,7 +378,7 @@ class Authentication:
                     detail="Internal server error",
                 )
             
-            status_code = self.applicationDB.deleteRefreshTokens(
+            status_code = await self.applicationDB.deleteRefreshTokens(
                 userId=userId, deviceHash= deviceHash
             )
 
@@ -423,9 +424,9 @@ class Authentication:
             logger.error(f"Error sending email to {email}: {e}")
             return False
     
-    def resetPassword(self, emailId: str):
+    async def resetPassword(self, emailId: str):
         try:
-            status_code, userId = self.applicationDB.getUserInfo(emailId= emailId)
+            status_code, userId = await self.applicationDB.getUserInfo(emailId= emailId)
 
             if status_code == 404:
                 return {
@@ -439,7 +440,7 @@ class Authentication:
                     "detail": "Internal Server Error"
                 }
             
-            status_code, authenticationDetails = self.applicationDB.getAuthenticationDetails(userId= userId)
+            status_code, authenticationDetails = await self.applicationDB.getAuthenticationDetails(userId= userId)
 
             if status_code == 404:
                 return {
@@ -469,7 +470,7 @@ class Authentication:
                         "otpSendCount": 0,
                         "otpSendLockedUntil": None
                     }
-                    status_code = self.applicationDB.updateAuthenticationDetails(userId= userId, data= data)
+                    status_code = await self.applicationDB.updateAuthenticationDetails(userId= userId, data= data)
 
                     if status_code == 304:
                         return {
@@ -483,7 +484,7 @@ class Authentication:
                             "detail": "Internal Server Error"
                         }
             
-            status_code, authenticationDetails = self.applicationDB.getAuthenticationDetails(userId= userId)
+            status_code, authenticationDetails = await self.applicationDB.getAuthenticationDetails(userId= userId)
 
             if status_code == 404:
                 return {
@@ -516,7 +517,7 @@ class Authentication:
                         "otpSendCount": otpSendCount + 1
                     }
 
-                    status_code = self.applicationDB.updateAuthenticationDetails(userId= userId, data= data)
+                    status_code = await self.applicationDB.updateAuthenticationDetails(userId= userId, data= data)
 
                     if status_code == 304:
                         return {
@@ -549,7 +550,7 @@ class Authentication:
                     "otpSendLockedUntil" : otpSendLockedUntil
                 }
                 
-                status_code = self.applicationDB.updateAuthenticationDetails(userId= userId, data= data)
+                status_code = await self.applicationDB.updateAuthenticationDetails(userId= userId, data= data)
 
                 if status_code == 304:
                     return {
@@ -581,9 +582,9 @@ class Authentication:
 
         return timeElapsed > validityPeriod 
     
-    def verifyOtp(self, requestData: dict):
+    async def verifyOtp(self, requestData: dict):
         try:
-            status_code, userId = self.applicationDB.getUserInfo(emailId= requestData["emailId"])
+            status_code, userId = await self.applicationDB.getUserInfo(emailId= requestData["emailId"])
 
             if status_code == 404:
                 return {
@@ -597,7 +598,7 @@ class Authentication:
                     "detail": "Internal Server Error"
                 }
             
-            status_code, authenticationDetails = self.applicationDB.getAuthenticationDetails(userId= userId)
+            status_code, authenticationDetails = await self.applicationDB.getAuthenticationDetails(userId= userId)
 
             if status_code == 404:
                 return {
@@ -627,7 +628,7 @@ class Authentication:
                         "otpAttemptsCount": 0,
                         "otpCoolDown": None
                     }
-                    status_code = self.applicationDB.updateAuthenticationDetails(userId= userId, data= data)
+                    status_code = await self.applicationDB.updateAuthenticationDetails(userId= userId, data= data)
 
                     if status_code == 304:
                         return {
@@ -641,7 +642,7 @@ class Authentication:
                             "detail": "Internal Server Error"
                         }
                     
-            status_code, authenticationDetails = self.applicationDB.getAuthenticationDetails(userId= userId)
+            status_code, authenticationDetails = await self.applicationDB.getAuthenticationDetails(userId= userId)
 
             if status_code == 404:
                 return {
@@ -666,7 +667,7 @@ class Authentication:
                     "otpCoolDown": otpCoolDown
                 }
 
-                status_code = self.applicationDB.updateAuthenticationDetails(userId= userId, data= data)
+                status_code = await self.applicationDB.updateAuthenticationDetails(userId= userId, data= data)
 
                 if status_code == 304:
                     return {
@@ -690,7 +691,7 @@ class Authentication:
                     "otpAttemptsCount": otpAttemptsCount + 1
                 }
 
-                status_code = self.applicationDB.updateAuthenticationDetails(userId= userId, data= data)
+                status_code = await self.applicationDB.updateAuthenticationDetails(userId= userId, data= data)
 
                 if status_code == 304:
                     return {
@@ -716,7 +717,7 @@ class Authentication:
                     "otpSendLastTimestamp": None
                 }
 
-                status_code = self.applicationDB.updateAuthenticationDetails(userId= userId, data= data)
+                status_code = await self.applicationDB.updateAuthenticationDetails(userId= userId, data= data)
 
                 if status_code == 304:
                     return {
@@ -744,7 +745,7 @@ class Authentication:
                 "otpAttemptLocked": False
             }
 
-            status_code = self.applicationDB.updateAuthenticationDetails(userId= userId, data= data)
+            status_code = await self.applicationDB.updateAuthenticationDetails(userId= userId, data= data)
 
             if status_code == 304:
                 return {
@@ -770,9 +771,9 @@ class Authentication:
                 "detail":str(e)
             }
     
-    def updatePassword(self, requestData: dict):
+    async def updatePassword(self, requestData: dict):
         try:
-            status_code, userId = self.applicationDB.getUserInfo(emailId= requestData["emailId"])
+            status_code, userId = await self.applicationDB.getUserInfo(emailId= requestData["emailId"])
 
             if status_code == 404:
                 return {
@@ -789,7 +790,7 @@ class Authentication:
             newPassword = requestData["newPassword"]
             password = generate_password_hash(newPassword, method="sha256")
 
-            status_code= self.applicationDB.updatePassword(userId= userId, password= password)
+            status_code= await self.applicationDB.updatePassword(userId= userId, password= password)
             if status_code == 304:
                 return {
                     "status_code": status.HTTP_304_NOT_MODIFIED,
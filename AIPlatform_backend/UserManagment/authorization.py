@@ -6,6 +6,7 @@ from fastapi import HTTPException, Body, status
 from werkzeug.security import generate_password_hash
 from Database.applicationSetup import *
 from Database.applicationDataBase import *
+from Database.asyncApplicationDataBase import AsyncApplicationDataBase
 import random
 import string
 import re
@@ -41,7 +42,7 @@ def load_config():
         logging.error(f"Error loading config: {e}")
 
 def initilizeApplicationDB():
-    applicationDB = ApplicationDataBase()
+    applicationDB = AsyncApplicationDataBase()
     return applicationDB
 
     
@@ -94,10 +95,10 @@ class Authorization:
         self.applicationDB = initilizeApplicationDB()
 
 
-    def createUser(self, data: dict = Body(...)):
+    async def createUser(self, data: dict = Body(...)):
         try:
             # Check if user already exists by username or email
-            if self.applicationDB.checkExistingUser(data["username"], data["email"]):
+            if await self.applicationDB.checkExistingUser(data["username"], data["email"]):
                 return {
                     "status_code" :status.HTTP_409_CONFLICT,
                     "detail" :"Email or username already registered"
@@ -160,7 +161,7 @@ class Authorization:
         
             # Insert user data into the `users` table
             data.pop("password")
-            user_id = self.applicationDB.insertData("users", data)
+            user_id = await self.applicationDB.insertData("users", data)
             print(user_id)
             # Insert user credentials into `userCredentials` table
 
@@ -169,7 +170,7 @@ class Authorization:
                 "password": hashed_password,
                 "lastLogin": None  # Initial login is None as the user hasn't logged in yet
             }
-            self.applicationDB.insertData("userCredentials", user_credentials_data)
+            await self.applicationDB.insertData("userCredentials", user_credentials_data)
 
             return {
                 "status_code": status.HTTP_200_OK,
@@ -181,7 +182,7 @@ class Authorization:
             return {"status_code":500, "detail":"Internal Server Error"}
 
     
-    def getUnassignedAdmins(self, spaceId: str):
+    async def getUnassignedAdmins(self, spaceId: str):
         try:
             if not isinstance(spaceId, str):
                 return {
@@ -195,7 +196,7 @@ class Authorization:
                     "detail": "Unauthorized Access",
                 }
             
-            status_code = self.applicationDB.checkSpace(spaceId = spaceId)
+            status_code = await self.applicationDB.checkSpace(spaceId = spaceId)
 
             if status_code == 400:
                 return {
@@ -215,7 +216,7 @@ class Authorization:
                     "detail": "Internal server error",
                 }
             
-            status_code, unassignedAdmins = self.applicationDB.unassignedAdmins(spaceId= spaceId)
+            status_code, unassignedAdmins = await self.applicationDB.unassignedAdmins(spaceId= spaceId)
 
             if status_code == 400:
                 return {
@@ -247,7 +248,7 @@ class Authorization:
                 "detail":str(e)
             }
         
-    def getassignedAdmins(self, spaceId: str):
+    async def getassignedAdmins(self, spaceId: str):
         try:
             # Validate spaceId
             if not isinstance(spaceId, str):
@@ -263,7 +264,7 @@ class Authorization:
                 }
             
             # Check if space exists
-            status_code = self.applicationDB.checkSpace(spaceId = spaceId)
+            status_code = await self.applicationDB.checkSpace(spaceId = spaceId)
 
             if status_code == 400:
                 return {
@@ -283,7 +284,7 @@ class Authorization:
                     "detail": "Internal server error",
                 }
             
-            status_code, assignedAdmins = self.applicationDB.assignedAdmins(spaceId= spaceId)
+            status_code, assignedAdmins = await self.applicationDB.assignedAdmins(spaceId= spaceId)
 
             if status_code == 400:
                 return {
@@ -314,7 +315,7 @@ class Authorization:
                 "status_code":500, "detail":str(e)
             }
         
-    def getUnassignedUsers(self, hierarchyId: str):
+    async def getUnassignedUsers(self, hierarchyId: str):
         try:
             if not "admin" in self.role:
                 return {
@@ -322,7 +323,7 @@ class Authorization:
                     "detail": "Unauthorized Access",
                 }
             
-            status_code = self.applicationDB.checkHierarchy(hierarchyId= hierarchyId)
+            status_code = await self.applicationDB.checkHierarchy(hierarchyId= hierarchyId)
             if status_code == 404:
                 return {
                     "status_code": status.HTTP_401_UNAUTHORIZED,
@@ -334,7 +335,7 @@ class Authorization:
                     "detail": "Internal server error",
                 }
             
-            status_code, unassignedUsers = self.applicationDB.unassignedUsers(hierarchyId = hierarchyId)
+            status_code, unassignedUsers = await self.applicationDB.unassignedUsers(hierarchyId = hierarchyId)
             if status_code == 404:
                 return {
                     "status_code": status.HTTP_404_NOT_FOUND,
@@ -356,7 +357,7 @@ class Authorization:
                 "detail": str(e)
             }
         
-    def getassignedUsers(self, hierarchyId: str, useCaseRole: str):
+    async def getassignedUsers(self, hierarchyId: str, useCaseRole: str):
         try:
             if not "admin" in self.role:
                 return {
@@ -364,7 +365,7 @@ class Authorization:
                     "detail": "Unauthorized Access",
                 }
             
-            status_code = self.applicationDB.checkHierarchy(hierarchyId= hierarchyId)
+            status_code = await self.applicationDB.checkHierarchy(hierarchyId= hierarchyId)
             if status_code == 404:
                 return {
                     "status_code": status.HTTP_401_UNAUTHORIZED,
@@ -376,7 +377,7 @@ class Authorization:
                     "detail": "Internal server error",
                 }
             
-            status_code, assignedUsers = self.applicationDB.assignedUsers(hierarchyId = hierarchyId, useCaseRole = useCaseRole)
+            status_code, assignedUsers = await self.applicationDB.assignedUsers(hierarchyId = hierarchyId, useCaseRole = useCaseRole)
             if status_code == 404:
                 return {
                     "status_code": status.HTTP_404_NOT_FOUND,
@@ -398,9 +399,9 @@ class Authorization:
                 "detail": str(e)
             }
     
-    def getAdminsDetails(self):
+    async def getAdminsDetails(self):
         try:
-            status_code, adminsDetails =  self.applicationDB.getAdminsDetails()
+            status_code, adminsDetails =  await self.applicationDB.getAdminsDetails()
             if not status_code == 200:
                 return {
                     "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -417,14 +418,14 @@ class Authorization:
                 "detail": str(e)
             }
     
-    def updateProfile(self, data: dict):
+    async def updateProfile(self, data: dict):
         try:
             if data.get("email") or data.get("username"):
                 return {
                     "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY,
                     "detail": "Email or username cannot be updated",
                 }
-            status_code =  self.applicationDB.updateProfile(data, self.userId)
+            status_code =  await self.applicationDB.updateProfile(data, self.userId)
             if status_code == 404:
                 return {
                     "status_code": status.HTTP_404_NOT_FOUND,
@@ -456,9 +457,9 @@ class Authorization:
                 "detail": str(e)
             }
         
-    def getProfile(self):
+    async def getProfile(self):
         try:           
-            status_code, userdata =  self.applicationDB.getProfile(self.userId)
+            status_code, userdata =  await self.applicationDB.getProfile(self.userId)
             if status_code == 404:
                 return {
                     "status_code": status.HTTP_404_NOT_FOUND,
@@ -486,9 +487,9 @@ class Authorization:
             }
     
     
-    def updateUserDetails(self, data: dict):
+    async def updateUserDetails(self, data: dict):
         try:
-            status_code =  self.applicationDB.updateUserDetails(data)
+            status_code =  await self.applicationDB.updateUserDetails(data)
             if status_code == 404:
                 return {
                     "status_code": status.HTTP_404_NOT_FOUND,
@@ -520,7 +521,7 @@ class Authorization:
                 "detail": str(e)
             }
         
-    def createClientAPIKey(self, data: dict):
+    async def createClientAPIKey(self, data: dict):
         try:
             if not isinstance(data, dict):
                 return {
@@ -532,7 +533,7 @@ class Authorization:
                     "status_code":status.HTTP_400_BAD_REQUEST,
                     "detail": "No orgId or keyName provided"
                 }
-            status_code, clientApiKey = self.applicationDB.createClientAPIKey(self.userId, data["orgId"], data["keyName"])
+            status_code, clientApiKey = await self.applicationDB.createClientAPIKey(self.userId, data["orgId"], data["keyName"])
             print(status_code,clientApiKey)
             if status_code == 403:
                 return {
@@ -557,7 +558,7 @@ class Authorization:
                 "detail": str(e)
             }
         
-    def getClientAPIKeys(self, data: dict):
+    async def getClientAPIKeys(self, data: dict):
         try:
             if not isinstance(data, dict):
                 return {
@@ -569,7 +570,7 @@ class Authorization:
                     "status_code":status.HTTP_400_BAD_REQUEST,
                     "detail": "No orgId provided"
                 }
-            status_code, keys = self.applicationDB.getClientAPIKeys(self.userId, data["orgId"])
+            status_code, keys = await self.applicationDB.getClientAPIKeys(self.userId, data["orgId"])
             if status_code == 403:
                 return {
                     "status_code":status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,35 @@
+"""BLEU-1..4 of the per-pair sentence_bleu loop Metrics.calculate_bleu used against bleuEngine.
+
+Run from AIPlatform_backend: python -m benchmarks.bench_bleu [rows ...]
+"""
+import sys
+
+from benchmarks.common import random_token_pairs, report, timed
+
+from nltk.translate.bleu_score import SmoothingFunction, sentence_bleu
+
+from ApplicationManagment.Handlers.bleuEngine import bleu_scores
+
+
+def per_pair_bleu(prediction_tokens, reference_tokens):
+    """The previous calculate_bleu: sentence_bleu four times per pair."""
+    smooth = SmoothingFunction().method1
+    scores = {f"bleu-{n}": 0.0 for n in range(1, 5)}
+    for prediction, reference in zip(prediction_tokens, reference_tokens):
+        for n in range(1, 5):
+            weights = tuple([1. / n] * n + [0.] * (4 - n))
+            scores[f"bleu-{n}"] += sentence_bleu([reference], prediction, weights=weights, smoothing_function=smooth)
+    return {key: value / len(prediction_tokens) for key, value in scores.items()}
+
+
+def main(sizes):
+    for count in sizes:
+        predictions, references = random_token_pairs(count)
+        before, before_seconds = timed(per_pair_bleu, predictions, references)
+        after, after_seconds = timed(bleu_scores, predictions, references)
+        assert all(abs(before[key] - after[key]) < 1e-9 for key in before)
+        report("BLEU", count, before_seconds, after_seconds)
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [1000, 10000, 100000])
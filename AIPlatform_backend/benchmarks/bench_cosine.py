@@ -0,0 +1,47 @@
+"""Cosine similarity scoring of the per-pair path ScoreCalculator used against the shared EmbeddingEngine.
+
+Run from AIPlatform_backend: python -m benchmarks.bench_cosine [rows ...]
+
+The per-pair path loads the model for every pair, so it is timed on at most BEFORE_MAX_ROWS rows and
+extrapolated linearly to the full set. The embedding cache is disabled so the engine encodes every row.
+"""
+import sys
+
+from benchmarks.common import random_texts, report, timed
+
+from sentence_transformers import SentenceTransformer, util
+
+from db_config import embedding_cache_config, embedding_config
+
+embedding_cache_config["ENABLED"] = False
+
+from ApplicationManagment.Handlers.embeddingEngine import EmbeddingEngine
+
+BEFORE_MAX_ROWS = 50
+
+
+def per_pair_cosine(predictions, references):
+    """The previous calculate_cosine_similarity, called once per row."""
+    scores = []
+    for prediction, reference in zip(predictions, references):
+        model = SentenceTransformer(embedding_config["MODEL_NAME"])
+        embedding1 = model.encode(prediction, convert_to_tensor=True)
+        embedding2 = model.encode(reference, convert_to_tensor=True)
+        scores.append(util.pytorch_cos_sim(embedding1, embedding2).item() * 100)
+    return scores
+
+
+def main(sizes):
+    engine, load_seconds = timed(EmbeddingEngine.get_instance)
+    print(f"Engine model loaded once in {load_seconds:.2f}s")
+    for count in sizes:
+        predictions, references = random_texts(count, seed=0), random_texts(count, seed=1)
+        sample = min(count, BEFORE_MAX_ROWS)
+        before, before_seconds = timed(per_pair_cosine, predictions[:sample], references[:sample])
+        after, after_seconds = timed(engine.pairwise_similarity, predictions, references)
+        assert all(abs(score - similarity * 100) < 1e-3 for score, similarity in zip(before, after))
+        report("Cosine", count, before_seconds * count / sample, after_seconds)
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [100, 1000, 10000])
@@ -0,0 +1,121 @@
+"""Admin data calls under a running benchmark, blocking pymongo calls against AsyncApplicationDataBase.
+
+Run from AIPlatform_backend against a MongoDB at the configured mongoip/mongoport:
+    python -m benchmarks.bench_data_layer [admins] [seconds]
+
+Both runs share one event loop with a stand-in benchmark: a task that wakes every 10 ms and writes a status
+update through Motor, as a running benchmark does. "before" calls the synchronous class directly in the
+coroutines, as the routes did before the data layer was async, with the same queries and projections from
+Database.userQueries; "after" awaits the Motor class. Reported are
+the p50/p99 latency of the admin calls (getUsersInOrg, getProfile) and the p99 lateness of the benchmark ticks.
+Everything goes to a scratch database that is dropped at the end.
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+import benchmarks.common  # noqa: F401, puts the backend on the path
+
+from bson import ObjectId
+
+from Database.asyncApplicationDataBase import AsyncApplicationDataBase
+from Database.connectionRegistry import default_uri, get_async_client, get_client
+from Database.userQueries import USER_LIST_PROJECTION, USER_LIST_SORT, USER_PROFILE_PROJECTION, page_bounds, plain_users_query
+
+SCRATCH_DB = "benchmarkApplicationDB"
+ORG_ID = "bench-org"
+USERS = 5000
+TICK_SECONDS = 0.01
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] if ordered else 0.0
+
+
+def seed():
+    database = get_client()[SCRATCH_DB]
+    database["users"].drop()
+    result = database["users"].insert_many([
+        {"username": f"user{i}", "email": f"user{i}@example.com", "firstName": "Bench", "lastName": str(i),
+         "orgIds": [ORG_ID], "role": {"analyst": {ORG_ID: []}}}
+        for i in range(USERS)
+    ])
+    return [str(user_id) for user_id in result.inserted_ids[:100]]
+
+
+async def benchmark_ticker(stop: asyncio.Event, lateness: list):
+    """A running benchmark: a status write every tick, lateness is how long the loop kept it waiting."""
+    status_collection = get_async_client(default_uri())[SCRATCH_DB]["status"]
+    expected = time.perf_counter() + TICK_SECONDS
+    while not stop.is_set():
+        await asyncio.sleep(max(expected - time.perf_counter(), 0))
+        lateness.append(max(time.perf_counter() - expected, 0))
+        await status_collection.update_one({"_id": "process"}, {"$inc": {"ticks": 1}}, upsert=True)
+        expected = time.perf_counter() + TICK_SECONDS
+
+
+def blocking_calls(database, page: int, user_id: str):
+    """getUsersInOrg and getProfile on the synchronous client."""
+    skip, limit = page_bounds(page, 50)
+    list(database["users"].find(plain_users_query(ORG_ID), USER_LIST_PROJECTION).sort(USER_LIST_SORT).skip(skip).limit(limit))
+    database["users"].find_one({"_id": ObjectId(user_id)}, USER_PROFILE_PROJECTION)
+
+
+async def admin(database, blocking: bool, user_ids, stop: asyncio.Event, latencies: list):
+    i = 0
+    while not stop.is_set():
+        user_id = user_ids[i % len(user_ids)]
+        started = time.perf_counter()
+        if blocking:
+            blocking_calls(database, i % 20 + 1, user_id)
+            # Let the other coroutines in, as the route would when it returns
+            await asyncio.sleep(0)
+        else:
+            await database.getUsersInOrg(ORG_ID, page=i % 20 + 1, page_size=50)
+            await database.getProfile(user_id)
+        latencies.append(time.perf_counter() - started)
+        i += 1
+
+
+async def run(blocking: bool, admins: int, seconds: float, user_ids):
+    if blocking:
+        database = get_client()[SCRATCH_DB]
+    else:
+        database = AsyncApplicationDataBase()
+        database.applicationDB = database.client[SCRATCH_DB]
+    stop = asyncio.Event()
+    latencies, lateness = [], []
+    tasks = [asyncio.create_task(benchmark_ticker(stop, lateness))]
+    tasks += [asyncio.create_task(admin(database, blocking, user_ids, stop, latencies)) for _ in range(admins)]
+    await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return latencies, lateness
+
+
+async def compare(admins: int, seconds: float, user_ids):
+    # One loop for both runs, the shared Motor client stays bound to the loop it first ran on
+    p99 = {}
+    for name, blocking in (("before", True), ("after", False)):
+        latencies, lateness = await run(blocking, admins, seconds, user_ids)
+        p99[name] = percentile(latencies, 0.99)
+        print(
+            f"{name:<6} {admins} admins: {len(latencies) / seconds:8.1f} calls/s  "
+            f"p50 {statistics.median(latencies) * 1000:7.1f} ms  p99 {p99[name] * 1000:7.1f} ms  "
+            f"benchmark tick p99 late {percentile(lateness, 0.99) * 1000:7.1f} ms"
+        )
+    print(f"admin p99 {p99['before'] / max(p99['after'], 1e-9):.1f}x lower after")
+
+
+def main(admins: int, seconds: float):
+    user_ids = seed()
+    try:
+        asyncio.run(compare(admins, seconds, user_ids))
+    finally:
+        get_client().drop_database(SCRATCH_DB)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50, float(sys.argv[2]) if len(sys.argv) > 2 else 10)
@@ -0,0 +1,73 @@
+"""METEOR of the per-pair nltk meteor_score loop Metrics.calculate_meteor used against meteorEngine.
+
+Run from AIPlatform_backend: python -m benchmarks.bench_meteor [rows ...]
+
+Without the WordNet data a stand-in with a few synonym groups is used, and the engine runs serially
+(the pool processes would look up the real WordNet).
+"""
+import sys
+
+from benchmarks.common import random_token_pairs, report, timed
+
+import nltk
+from nltk.translate.meteor_score import meteor_score
+
+from ApplicationManagment.Handlers import meteorEngine
+from db_config import eval_config
+
+
+class StandInLemma:
+    def __init__(self, name):
+        self._name = name
+
+    def name(self):
+        return self._name
+
+
+class StandInSynset:
+    def __init__(self, group):
+        self.group = group
+
+    def lemmas(self):
+        return [StandInLemma(word) for word in self.group]
+
+
+class StandInWordnet:
+    GROUPS = [["big", "larg", "huge", "great"], ["quick", "fast", "rapid"], ["car", "auto", "automobil", "machin"],
+              ["run", "race", "go", "move"], ["happi", "glad"], ["small", "littl", "minor", "tini"]]
+
+    def synsets(self, word):
+        return [StandInSynset(group) for group in self.GROUPS if word in group]
+
+
+def load_wordnet():
+    try:
+        nltk.data.find("corpora/wordnet")
+        from nltk.corpus import wordnet
+        return wordnet
+    except LookupError:
+        print("WordNet data not found, using a stand-in and scoring serially")
+        meteorEngine.wordnet = StandInWordnet()
+        eval_config["SCORING_PARALLEL_MIN_ROWS"] = sys.maxsize
+        return meteorEngine.wordnet
+
+
+def per_pair_meteor(prediction_tokens, reference_tokens, wordnet):
+    """The previous calculate_meteor: nltk meteor_score per pair."""
+    total = sum(meteor_score([reference], prediction, wordnet=wordnet)
+                for prediction, reference in zip(prediction_tokens, reference_tokens))
+    return total / len(prediction_tokens)
+
+
+def main(sizes):
+    wordnet = load_wordnet()
+    for count in sizes:
+        predictions, references = random_token_pairs(count)
+        before, before_seconds = timed(per_pair_meteor, predictions, references, wordnet)
+        after, after_seconds = timed(meteorEngine.meteor_mean, predictions, references)
+        assert abs(before - after) < 1e-9
+        report("METEOR", count, before_seconds, after_seconds)
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [1000, 10000, 100000])
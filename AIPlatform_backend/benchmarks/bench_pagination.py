@@ -0,0 +1,79 @@
+"""Deep pages of a large evaluation history, with page/page_size against the (timestamp, process_id) cursor.
+
+Run from AIPlatform_backend against a MongoDB at the configured MONGO_URI:
+    python -m benchmarks.bench_pagination [documents] [page_size]
+
+Seeds one user's synthetic history (1M configs by default, several per second so timestamps tie) into a
+scratch database, builds the handler's indexes and fetches pages at growing depths through
+get_process_results: "before" with page/page_size, which skips every earlier row, "after" with the cursor
+of the row right before the page. Both must return the same rows. The scratch database is dropped at the end.
+"""
+import asyncio
+import sys
+import time
+
+import benchmarks.common  # noqa: F401, puts the backend on the path
+
+from Database.connectionRegistry import get_client
+from Database.evaluationSetup import RESULTS_SORT, MongoDBHandler
+from db_config import eval_config
+
+SCRATCH_DB = "benchmarkEvaluation"
+USER_ID = "bench-user"
+BATCH = 10000
+PROCESSES_PER_SECOND = 4
+
+
+def seed(documents: int):
+    configs = get_client(eval_config["MONGO_URI"])[SCRATCH_DB][eval_config["CONFIG_COLLECTION"]]
+    configs.drop()
+    started = 1_600_000_000
+    for offset in range(0, documents, BATCH):
+        configs.insert_many([
+            {"process_id": f"process-{i:08d}", "process_name": f"run {i}", "user_id": USER_ID,
+             "model_id": "bench-model", "model_name": "bench", "payload_file_path": f"payloads/{i}.csv",
+             "timestamp": started + i // PROCESSES_PER_SECOND}
+            for i in range(offset, min(offset + BATCH, documents))
+        ], ordered=False)
+    return configs
+
+
+def cursor_before(configs, row: int):
+    """Cursor a client holds after reading the first row rows, taken from the collection, not timed."""
+    if row == 0:
+        return None
+    previous = next(configs.find({"user_id": USER_ID}, {"timestamp": 1, "process_id": 1}).sort(RESULTS_SORT).skip(row - 1).limit(1))
+    return MongoDBHandler.encode_cursor({"timestamp": previous["timestamp"], "process_id": previous["process_id"]})
+
+
+async def timed_page(handler, page: int, page_size: int, cursor=None):
+    started = time.perf_counter()
+    results, _, _ = await handler.get_process_results(USER_ID, page, page_size, cursor)
+    return results, time.perf_counter() - started
+
+
+async def compare(configs, documents: int, page_size: int):
+    handler = MongoDBHandler(dict(eval_config, DB_NAME=SCRATCH_DB), "bench-org")
+    await handler.ensure_indexes()
+    depths = sorted({1, 100, documents // (page_size * 10), documents // (page_size * 2), documents // page_size})
+    for page in (depth for depth in depths if depth >= 1):
+        cursor = cursor_before(configs, (page - 1) * page_size)
+        skipped, before = await timed_page(handler, page, page_size)
+        keyed, after = await timed_page(handler, page, page_size, cursor)
+        assert [row["process_id"] for row in skipped] == [row["process_id"] for row in keyed]
+        print(
+            f"page {page:>7} (row {(page - 1) * page_size:>9}): "
+            f"before {before * 1000:9.1f} ms  after {after * 1000:7.1f} ms  {before / max(after, 1e-9):7.1f}x"
+        )
+
+
+def main(documents: int, page_size: int):
+    configs = seed(documents)
+    try:
+        asyncio.run(compare(configs, documents, page_size))
+    finally:
+        get_client(eval_config["MONGO_URI"]).drop_database(SCRATCH_DB)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000, int(sys.argv[2]) if len(sys.argv) > 2 else 50)
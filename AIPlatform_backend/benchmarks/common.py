@@ -0,0 +1,41 @@
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# The Database modules log to <project>/logs/backend/logger.log on import
+os.makedirs(os.path.join(BACKEND_DIR, "..", "logs", "backend"), exist_ok=True)
+
+WORDS = (
+    "the a an is are was were it this that model answer question context large big huge great quick fast rapid "
+    "car cars auto automobile machine running runs ran race going moves happy glad small little minor tiny cat "
+    "cats dog dogs sat on mat over under , . ? !"
+).split()
+
+
+def random_texts(count: int, seed: int = 0, max_words: int = 40):
+    """`count` random sentences, with repeats as real evaluation sets have them."""
+    rng = random.Random(seed)
+    distinct = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, max_words))) for _ in range(max(count // 4, 1))]
+    return [rng.choice(distinct) for _ in range(count)]
+
+
+def random_token_pairs(count: int, seed: int = 0):
+    predictions = [text.split() for text in random_texts(count, seed)]
+    references = [text.split() for text in random_texts(count, seed + 1)]
+    return predictions, references
+
+
+def timed(function, *args, **kwargs):
+    """(result, seconds) of one call."""
+    started = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def report(name: str, count: int, before: float, after: float):
+    print(f"{name:<10} {count:>8} rows  before {before:8.2f}s  after {after:8.2f}s  speedup {before / max(after, 1e-9):6.1f}x")
@@ -15,7 +15,15 @@ config = {
     "refreshTokenExpireDays": 7,
     "secretKey": "BrilliusAI",
     "userIdLength": 4,
-    "userIdChunkSize": 4
+    "userIdChunkSize": 4,
+    # Connection pool of the process-wide MongoClient shared by the Database classes
+    "mongoMaxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", 100)),
+    "mongoMinPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", 0)),
+    "mongoMaxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_TIME_MS", 60000)),
+    "mongoWaitQueueTimeoutMS": int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", 10000)),
+    "mongoServerSelectionTimeoutMS": int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000)),
+    # Non-terminal status changes of a process are coalesced into one write per interval
+    "statusWriteIntervalMS": int(os.getenv("STATUS_WRITE_INTERVAL_MS", 1000))
   }
 
 eval_config = {
@@ -27,9 +35,31 @@ eval_config = {
     "RESULTS_COLLECTION": "EvalResults",
     "METRICS_COLLECTION": "Metrics",
     "METRIC_CONFIG":"MetricConfig",
+    # Result rows of each model, in chunks next to the slim summary document in RESULTS_COLLECTION
+    "RESULT_CHUNKS_COLLECTION": "EvalResultChunks",
+    "RESULT_CHUNK_ROWS": 500,
+    "RESULT_CHUNK_MAX_BYTES": 8 * 1024 * 1024,
+    # Response texts longer than this go to GridFS instead of the chunk, 0 disables the spill
+    "RESULT_GRIDFS_BUCKET": "EvalResultFiles",
+    "RESULT_GRIDFS_THRESHOLD_BYTES": int(os.getenv("RESULT_GRIDFS_THRESHOLD_BYTES", 1024 * 1024)),
     # Endpoint to backend server
     "SERVER_ENDPOINT": f"http://{IP_ADDRESS}:4001/accelerator/server",
-    "SCORE_ENDPOINT": f"http://{IP_ADDRESS}:4001"
+    "SCORE_ENDPOINT": f"http://{IP_ADDRESS}:4001",
+    # In-flight requests allowed per deployment, shared by all evaluations in the process
+    "CONCURRENCY_PER_DEPLOYMENT": 8,
+    # Models evaluated concurrently, across all evaluations in the process
+    "MAX_CONCURRENT_MODELS": 4,
+    # Retries of 5xx responses and timeouts, with jittered exponential backoff
+    "MAX_RETRIES": 3,
+    "RETRY_BACKOFF_SECONDS": 0.5,
+    "RETRY_BACKOFF_MAX_SECONDS": 10,
+    # Worker processes scoring models in parallel, each keeps its own copy of the metric models
+    "METRICS_WORKERS": int(os.getenv("METRICS_WORKERS", 2)),
+    # Text metrics (ROUGE, BLEU) of sets with at least this many rows are scored in chunks
+    # across SCORING_WORKERS processes (0 = one per CPU)
+    "SCORING_PARALLEL_MIN_ROWS": int(os.getenv("SCORING_PARALLEL_MIN_ROWS", 20000)),
+    "SCORING_CHUNK_ROWS": 5000,
+    "SCORING_WORKERS": int(os.getenv("SCORING_WORKERS", 0))
 }
     
 bench_config ={ 
@@ -39,14 +69,96 @@ bench_config ={
     "CONFIG_COLLECTION" : "BenchConfig",
     "RESULTS_COLLECTION" : "BenchResults",
     "METRICS_COLLECTION": "Metrics",
+    "RESULT_CHUNKS_COLLECTION": "BenchResultChunks",
+    "RESULT_CHUNK_ROWS": 500,
+    "RESULT_CHUNK_MAX_BYTES": 8 * 1024 * 1024,
+    "RESULT_GRIDFS_BUCKET": "BenchResultFiles",
+    "RESULT_GRIDFS_THRESHOLD_BYTES": int(os.getenv("RESULT_GRIDFS_THRESHOLD_BYTES", 1024 * 1024)),
+    # Shards of distributed benchmarks waiting for a worker
+    "WORK_QUEUE_COLLECTION": "BenchWorkQueue",
+    "WORK_QUEUE_POLL_SECONDS": 2,
+    # A worker renews the lease of its shard every HEARTBEAT seconds, a shard whose lease ran out is run again
+    "WORK_QUEUE_LEASE_SECONDS": 60,
+    "WORK_QUEUE_HEARTBEAT_SECONDS": 15,
+    "WORK_QUEUE_MAX_ATTEMPTS": 3,
+    # The coordinator gives up on a model whose shards are not all done after this long
+    "WORK_QUEUE_TIMEOUT_SECONDS": int(os.getenv("WORK_QUEUE_TIMEOUT_SECONDS", 6 * 60 * 60)),
      # Endpoint to backend server
     "SERVER_ENDPOINT" : f"http://{IP_ADDRESS}:4001/accelerator/server",
 }
 
-    
+# Shared HTTP client pool used by the benchmark and evaluation handlers
+http_client_config = {
+    "MAX_CONNECTIONS": int(os.getenv("HTTP_MAX_CONNECTIONS", 200)),
+    "MAX_KEEPALIVE_CONNECTIONS": int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", 100)),
+    "KEEPALIVE_EXPIRY": 30,
+    # Needs the optional "h2" package, falls back to HTTP/1.1 without it
+    "HTTP2": os.getenv("HTTP2_ENABLED", "false").lower() == "true",
+    # Timeouts per phase, in seconds
+    "CONNECT_TIMEOUT": 10,
+    "READ_TIMEOUT": 3000,
+    "WRITE_TIMEOUT": 30,
+    "POOL_TIMEOUT": 3000,
+    # Connections opened before the timed window of a benchmark starts
+    "WARMUP_CONNECTIONS": 10
+}
+
+# Durable queue of evaluation, metrics and benchmark jobs, run by worker.py when enabled
+job_queue_config = {
+    # Off: jobs run as background tasks of the API process, as before
+    "ENABLED": os.getenv("JOB_QUEUE_ENABLED", "false").lower() == "true",
+    "MONGO_URI": os.getenv("MONGO_URI", f"mongodb://{MONGO_IP}:27017"),
+    "DB_NAME": "evaluation",
+    "JOBS_COLLECTION": "Jobs",
+    "WORKERS_COLLECTION": "JobWorkers",
+    # A job whose worker missed its heartbeats for this long is claimed again
+    "LEASE_SECONDS": 60,
+    "HEARTBEAT_SECONDS": 15,
+    "POLL_SECONDS": 2,
+    "MAX_ATTEMPTS": 3,
+    # Jobs run concurrently by one worker process
+    "CONCURRENCY": int(os.getenv("JOB_WORKER_CONCURRENCY", 4))
+}
 
+# Live status streams (SSE) fed by the in-process status hub
+status_hub_config = {
+    # Comment line sent when nothing changed, keeps proxies from closing the stream
+    "HEARTBEAT_SECONDS": 15,
+    # Interval of the status poll used when the server has no change streams (standalone mongod)
+    "POLL_SECONDS": 2,
+    # Deltas buffered per client before it is resynced with a full snapshot
+    "SUBSCRIBER_QUEUE_SIZE": 100
+}
 
-   
-   
+# Sentence embedding model shared by the Cosine Similarity scorers
+embedding_config = {
+    "MODEL_NAME": os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2"),
+    "BATCH_SIZE": int(os.getenv("EMBEDDING_BATCH_SIZE", 256)),
+    # CPU threads used by torch, 0 keeps the torch default
+    "NUM_THREADS": int(os.getenv("EMBEDDING_NUM_THREADS", 0))
+}
 
+# BERTScore model kept resident in every metrics worker process
+bert_score_config = {
+    "LANG": "en",
+    # Sentences embedded per forward pass, batches are built from sentences of similar token length
+    "BATCH_SIZE": int(os.getenv("BERT_SCORE_BATCH_SIZE", 64)),
+    # CPU threads used by torch, 0 keeps the torch default (or the split set by the metrics pool)
+    "NUM_THREADS": int(os.getenv("BERT_SCORE_NUM_THREADS", 0)),
+    # int8 dynamic quantization of the Linear layers: faster on CPU, scores drift slightly from bert_score
+    "QUANTIZE": os.getenv("BERT_SCORE_QUANTIZE", "false").lower() == "true",
+    # Keep the token embeddings of the references (answers) in the embedding cache across models and runs
+    "CACHE_REFERENCES": os.getenv("BERT_SCORE_CACHE_REFERENCES", "true").lower() == "true"
+}
 
+# Embedding cache: in-process LRU in front of a Mongo collection of packed float32 vectors
+embedding_cache_config = {
+    "ENABLED": os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true",
+    # In-process LRU budget per namespace (embedding model)
+    "MEMORY_MB": int(os.getenv("EMBEDDING_CACHE_MEMORY_MB", 256)),
+    "MONGO_URI": os.getenv("MONGO_URI", f"mongodb://{MONGO_IP}:27017"),
+    "DB_NAME": "evaluation",
+    "COLLECTION": "EmbeddingCache",
+    # Data size budget of the collection, least recently used vectors beyond it are evicted; 0 disables the persistent tier
+    "PERSISTENT_MB": int(os.getenv("EMBEDDING_CACHE_PERSISTENT_MB", 2048))
+}
@@ -9,6 +9,13 @@ from ApplicationRoutes.analystRoutes import router as analyst_router
 from ApplicationRoutes.dataEngineerRoutes import router as dataEngineer_router
 from ApplicationRoutes.evaluationRoutes import router as evaluation_router
 from fastapi.middleware.cors import CORSMiddleware
+from ApplicationManagment.Handlers.httpClient import close_clients
+from Database import connectionRegistry
+from Database.asyncApplicationDataBase import AsyncApplicationDataBase
+from Database.evaluationSetup import MongoDBHandler
+from Database.statusHub import status_hub
+from Database.jobQueue import get_job_queue
+from db_config import bench_config, eval_config, job_queue_config
 
 app = FastAPI()
 
@@ -53,6 +60,43 @@ app.include_router(dataEngineer_router)
 
 app.include_router(evaluation_router)
 
+@app.get("/api/health/db")
+def database_health():
+    # Ping plus the connection pool metrics of the shared MongoClient
+    return {"health": connectionRegistry.check_health(), "pools": connectionRegistry.get_pool_metrics()}
+
+@app.get("/api/jobs/workers")
+async def job_workers():
+    # Throughput of the workers running queued jobs (worker.py)
+    return {"workers": await get_job_queue().get_worker_stats()}
+
+@app.on_event("startup")
+async def startup_event():
+    # Indexes behind the user and analyst listings
+    await AsyncApplicationDataBase().ensureIndexes()
+    # Indexes of the evaluation and benchmarking databases, then a check that the hot queries use them
+    for db_config in (eval_config, bench_config):
+        handler = MongoDBHandler.get_handler(db_config, None)
+        await handler.ensure_indexes()
+        await handler.verify_query_plans()
+    # Status streams: one watcher per status collection feeds transitions written by other workers
+    app.state.status_handlers = {
+        "evaluation": MongoDBHandler.get_handler(eval_config, None),
+        "benchmarking": MongoDBHandler.get_handler(bench_config, None)
+    }
+    if job_queue_config["ENABLED"]:
+        await get_job_queue().ensure_indexes()
+    status_hub.start({service: handler.status_collection for service, handler in app.state.status_handlers.items()})
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Close the shared HTTP connection pools
+    await close_clients()
+    await status_hub.stop()
+    # Cached MongoDBHandlers and their shared Motor clients
+    MongoDBHandler.close_all()
+    connectionRegistry.close_clients()
+
 # Entry point
 if __name__ == "__main__":
     import uvicorn
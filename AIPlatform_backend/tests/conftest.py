@@ -0,0 +1,47 @@
+import os
+import random
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+# The Database modules log to <project>/logs/backend/logger.log on import
+os.makedirs(os.path.join(BACKEND_DIR, "..", "logs", "backend"), exist_ok=True)
+
+WORDS = (
+    "the running runs ran cat cats dog's généralement naïve café e-mail 3.14 hello, world! Connection connected "
+    "connecting a an is are was eating eats ate x y z QUICK brown fox jumps over lazy dogs (quoted) \"text\""
+).split()
+
+
+@pytest.fixture
+def text_pairs():
+    """Random predictions/references with repeats, plus empty, punctuation-only and accented edge cases."""
+    rng = random.Random(7)
+
+    def text():
+        return " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 40)))
+
+    predictions = [text() for _ in range(500)]
+    references = [text() for _ in range(500)]
+    predictions += ["", "", "!!! ... ???", "a", "café naïve", "Hello, WORLD!", predictions[0]]
+    references += ["", "a", "a", "!!! ... ???", "cafe naive", "hello world", references[0]]
+    return predictions, references
+
+
+@pytest.fixture
+def parallel_scoring(monkeypatch):
+    """Send small sets through the scoring process pool, in several chunks."""
+    from db_config import eval_config
+    monkeypatch.setitem(eval_config, "SCORING_PARALLEL_MIN_ROWS", 100)
+    monkeypatch.setitem(eval_config, "SCORING_CHUNK_ROWS", 150)
+    monkeypatch.setitem(eval_config, "SCORING_WORKERS", 2)
+
+
+@pytest.fixture
+def token_pairs(text_pairs):
+    """text_pairs split into lowercased tokens, as Metrics.tokenize_texts hands them to the engines."""
+    predictions, references = text_pairs
+    return [text.lower().split() for text in predictions], [text.lower().split() for text in references]
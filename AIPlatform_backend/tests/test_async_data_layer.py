@@ -0,0 +1,14 @@
+from Database.asyncApplicationDataBase import AsyncApplicationDataBase
+from Database.asyncOrganizationDataBase import AsyncOrganizationDataBase
+
+
+def test_async_classes_use_the_shared_motor_client():
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from Database import connectionRegistry
+    try:
+        application, organization = AsyncApplicationDataBase(), AsyncOrganizationDataBase("org1")
+        assert isinstance(application.client, AsyncIOMotorClient)
+        assert application.client is organization.client is connectionRegistry.get_async_client(connectionRegistry.default_uri())
+        assert organization.organizationDB.name == "org1"
+    finally:
+        connectionRegistry.close_async_clients()
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+bert_score = pytest.importorskip("bert_score")
+pytest.importorskip("sentence_transformers")
+
+from ApplicationManagment.Handlers.Metrics import BertScoreEngine
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return BertScoreEngine("en", batch_size=8, cache_references=False)
+
+
+def test_scores_match_bert_score(engine, text_pairs):
+    predictions, references = (values[:60] for values in text_pairs)
+    # Identical and repeated sentences exercise the per-text embedding reuse
+    predictions += ["The quick brown fox.", "The quick brown fox."]
+    references += ["The quick brown fox.", "A fast brown fox jumps."]
+
+    P, R, F1 = bert_score.score(predictions, references, lang="en", rescale_with_baseline=True, batch_size=8)
+    scores = engine.score(predictions, references)
+    np.testing.assert_allclose(scores["precision"], P.numpy(), atol=1e-4)
+    np.testing.assert_allclose(scores["recall"], R.numpy(), atol=1e-4)
+    np.testing.assert_allclose(scores["f1"], F1.numpy(), atol=1e-4)
+
+
+def test_batch_size_does_not_change_scores(engine, text_pairs):
+    predictions, references = (values[:40] for values in text_pairs)
+    batched = engine.score(predictions, references)
+    engine.batch_size = 1
+    try:
+        single = engine.score(predictions, references)
+    finally:
+        engine.batch_size = 8
+    for key in ("precision", "recall", "f1"):
+        np.testing.assert_allclose(batched[key], single[key], atol=1e-5)
+
+
+def test_length_mismatch_and_empty_input(engine):
+    with pytest.raises(ValueError):
+        engine.score(["a"], [])
+    assert all(len(values) == 0 for values in engine.score([], []).values())
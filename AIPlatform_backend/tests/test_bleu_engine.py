@@ -0,0 +1,46 @@
+import pytest
+from nltk.translate.bleu_score import SmoothingFunction, corpus_bleu, sentence_bleu
+
+from ApplicationManagment.Handlers.bleuEngine import MAX_ORDER, BleuEngine, bleu_from_counts, bleu_scores
+
+
+def weights(order):
+    return tuple([1. / order] * order + [0.] * (MAX_ORDER - order))
+
+
+def test_sentence_bleu_matches_nltk(token_pairs):
+    smoothing = SmoothingFunction().method1
+    engine = BleuEngine()
+    for hypothesis, reference in zip(*token_pairs):
+        numerators, denominators = engine.pair_counts(hypothesis, reference)
+        for order in range(1, MAX_ORDER + 1):
+            expected = sentence_bleu([reference], hypothesis, weights=weights(order), smoothing_function=smoothing)
+            actual = bleu_from_counts(numerators, denominators, len(hypothesis), len(reference), order)
+            assert actual == pytest.approx(expected, abs=1e-12)
+
+
+def test_bleu_scores_match_nltk(token_pairs):
+    predictions, references = token_pairs
+    smoothing = SmoothingFunction().method1
+    scores = bleu_scores(predictions, references)
+    for order in range(1, MAX_ORDER + 1):
+        sentence_mean = sum(
+            sentence_bleu([reference], hypothesis, weights=weights(order), smoothing_function=smoothing)
+            for hypothesis, reference in zip(predictions, references)
+        ) / len(predictions)
+        corpus = corpus_bleu([[reference] for reference in references], predictions, weights=weights(order),
+                             smoothing_function=smoothing)
+        assert scores[f"bleu-{order}"] == pytest.approx(sentence_mean, abs=1e-12)
+        assert scores[f"corpus-bleu-{order}"] == pytest.approx(corpus, abs=1e-12)
+
+
+def test_empty_input():
+    assert bleu_scores([], []) == {**{f"bleu-{n}": 0.0 for n in range(1, 5)}, **{f"corpus-bleu-{n}": 0.0 for n in range(1, 5)}}
+
+
+def test_parallel_chunks_match_serial(token_pairs, parallel_scoring, monkeypatch):
+    from db_config import eval_config
+    predictions, references = token_pairs
+    parallel = bleu_scores(predictions, references)
+    monkeypatch.setitem(eval_config, "SCORING_PARALLEL_MIN_ROWS", len(predictions) + 1)
+    assert parallel == pytest.approx(bleu_scores(predictions, references), abs=1e-12)
@@ -0,0 +1,101 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from ApplicationManagment.Handlers.benchmarkingHandler import BenchmarkHandler
+from Database import connectionRegistry
+from Database.applicationDataBase import ApplicationDataBase
+from Database.evaluationSetup import MongoDBHandler
+from Database.jobQueue import JobQueue
+from Database.organizationDataBase import OrganizationDataBase
+from db_config import bench_config, eval_config
+
+
+@pytest.fixture
+def client_counts(monkeypatch):
+    """Number of MongoClient/AsyncIOMotorClient objects created, with a clean registry around the test."""
+    counts = {"sync": 0, "async": 0}
+    sync_client, async_client = connectionRegistry.MongoClient, connectionRegistry.AsyncIOMotorClient
+
+    def counting_sync_client(*args, **kwargs):
+        counts["sync"] += 1
+        return sync_client(*args, **kwargs)
+
+    def counting_async_client(*args, **kwargs):
+        counts["async"] += 1
+        return async_client(*args, **kwargs)
+
+    MongoDBHandler.close_all()
+    connectionRegistry.close_clients()
+    monkeypatch.setattr(connectionRegistry, "MongoClient", counting_sync_client)
+    monkeypatch.setattr(connectionRegistry, "AsyncIOMotorClient", counting_async_client)
+    yield counts
+    MongoDBHandler.close_all()
+    connectionRegistry.close_clients()
+
+
+def test_get_handler_reuses_handler_and_client(client_counts):
+    handlers = [MongoDBHandler.get_handler(eval_config, "org1") for _ in range(50)]
+    assert all(handler is handlers[0] for handler in handlers)
+    assert client_counts["async"] == 1
+
+    other_org = MongoDBHandler.get_handler(eval_config, "org2")
+    assert other_org is not handlers[0]
+    assert other_org.client is handlers[0].client
+    assert client_counts["async"] == 1
+
+
+def test_configs_and_job_queue_share_the_client_of_a_uri(client_counts, monkeypatch):
+    monkeypatch.setitem(bench_config, "MONGO_URI", eval_config["MONGO_URI"])
+    evaluation = MongoDBHandler.get_handler(eval_config, None)
+    benchmark = MongoDBHandler.get_handler(bench_config, None)
+    assert benchmark is not evaluation
+    assert benchmark.client is evaluation.client
+    assert JobQueue({**eval_config, "DB_NAME": "jobs", "JOBS_COLLECTION": "jobs", "WORKERS_COLLECTION": "workers"}).client is evaluation.client
+    assert client_counts["async"] == 1
+
+
+def test_sync_databases_share_one_client(client_counts):
+    databases = [ApplicationDataBase() for _ in range(20)] + [OrganizationDataBase(f"org{i}") for i in range(20)]
+    assert all(database.client is databases[0].client for database in databases)
+    assert client_counts["sync"] == 1
+
+
+def test_close_all_drops_the_clients(client_counts):
+    first = MongoDBHandler.get_handler(eval_config, "org1")
+    MongoDBHandler.close_all()
+    second = MongoDBHandler.get_handler(eval_config, "org1")
+    assert second is not first and second.client is not first.client
+    assert client_counts["async"] == 2
+
+
+class StatusCollection:
+    async def find_one(self, query, projection=None):
+        return {"process_id": query["process_id"], "overall_status": "In Progress",
+                "models": [{"model_id": "m-1", "model_name": "model", "status": "In Progress"}]}
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="counts open descriptors through /proc")
+def test_status_polls_do_not_leak_sockets_or_threads(client_counts):
+    async def poll(count):
+        for _ in range(count):
+            model_statuses, overall_status = await BenchmarkHandler.get_status_details("p-1", "benchmarking")
+            assert overall_status == "In Progress" and model_statuses
+            assert await MongoDBHandler.get_mongo_handler("benchmarking", None) is handler
+
+    async def polls():
+        # The first poll creates the cached handler on the shared client, later polls must reuse them
+        await poll(1)
+        before = threading.active_count(), len(os.listdir("/proc/self/fd"))
+        await poll(1000)
+        return before, (threading.active_count(), len(os.listdir("/proc/self/fd")))
+
+    handler = MongoDBHandler.get_handler(bench_config, None)
+    handler.status_collection = StatusCollection()
+    (threads_before, fds_before), (threads_after, fds_after) = asyncio.run(polls())
+    # No growth, monitor threads of the clients closed by earlier tests may still be exiting
+    assert threads_after <= threads_before
+    assert fds_after <= fds_before
+    assert client_counts["async"] == 1
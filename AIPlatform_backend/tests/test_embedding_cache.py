@@ -0,0 +1,80 @@
+import numpy as np
+
+from ApplicationManagment.Handlers.embeddingCache import EmbeddingCache
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, key, direction):
+        self.documents = sorted(self.documents, key=lambda document: document[key], reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self.documents = self.documents[:count]
+        return self
+
+    def __iter__(self):
+        return iter(self.documents)
+
+
+class FakeVectorCollection:
+    """The calls EmbeddingCache makes, with a data size of the vector bytes plus 100 bytes per document."""
+
+    def __init__(self):
+        self.documents = {}
+
+    def size(self):
+        return sum(len(document["vector"]) + 100 for document in self.documents.values())
+
+    def aggregate(self, pipeline):
+        count = len(self.documents)
+        yield {"storageStats": {"size": self.size(), "avgObjSize": self.size() // count if count else 0}}
+
+    def bulk_write(self, operations, ordered=True):
+        for operation in operations:
+            key = operation._filter["_id"]
+            self.documents.setdefault(key, {"_id": key}).update(operation._doc["$set"])
+
+    def find(self, query, projection=None):
+        if "_id" in query:
+            return FakeCursor([self.documents[key] for key in query["_id"]["$in"] if key in self.documents])
+        return FakeCursor(list(self.documents.values()))
+
+    def update_many(self, query, update):
+        pass
+
+    def delete_many(self, query):
+        keys = [key for key in query["_id"]["$in"] if key in self.documents]
+        for key in keys:
+            del self.documents[key]
+        return type("DeleteResult", (), {"deleted_count": len(keys)})()
+
+
+def test_memory_tier_is_bounded_in_bytes():
+    cache = EmbeddingCache("test", memory_bytes=10 * 384 * 4)
+    cache.put_many({f"text {i}": np.ones(384) for i in range(25)})
+    assert cache.get_stats()["memory_bytes"] <= 10 * 384 * 4
+    assert set(cache.get_many([f"text {i}" for i in range(25)])) == {f"text {i}" for i in range(15, 25)}
+
+
+def test_normalized_texts_share_an_entry():
+    cache = EmbeddingCache("test", memory_bytes=1024 * 1024)
+    cache.put_many({"Hello   world ": np.ones(4)})
+    assert "Hello world" in cache.get_many(["Hello world"])
+
+
+def test_persistent_tier_is_evicted_by_size():
+    collection = FakeVectorCollection()
+    # Room for about 20 vectors of 384 float32s
+    cache = EmbeddingCache("test", memory_bytes=1024, collection=collection, persistent_bytes=20 * (384 * 4 + 100))
+    for batch in range(5):
+        cache.put_many({f"text {batch}-{i}": np.full(384, batch, dtype=np.float32) for i in range(10)})
+    assert collection.size() <= 20 * (384 * 4 + 100)
+    assert cache.get_stats()["persistent_evictions"] == 30
+    # The most recent vectors survive and come back from the collection
+    found = EmbeddingCache("test", memory_bytes=1024, collection=collection, persistent_bytes=1).get_many(
+        [f"text 4-{i}" for i in range(10)]
+    )
+    assert len(found) == 10 and all((vector == 4).all() for vector in found.values())
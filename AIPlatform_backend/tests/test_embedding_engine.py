@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("sentence_transformers")
+
+from ApplicationManagment.Handlers.embeddingCache import EmbeddingCache
+from ApplicationManagment.Handlers.embeddingEngine import EmbeddingEngine
+
+
+class RecordingModel:
+    """Stand-in SentenceTransformer embedding each text by its length, recording what it was given."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def get_sentence_embedding_dimension(self):
+        return 2
+
+    def encode(self, texts, **kwargs):
+        self.encoded.extend(texts)
+        vectors = np.array([[len(text) + 1.0, 1.0] for text in texts], dtype=np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def make_engine(cache):
+    import threading
+    engine = EmbeddingEngine.__new__(EmbeddingEngine)
+    engine.model_name, engine.batch_size, engine.model = "stand-in", 32, RecordingModel()
+    engine._encode_lock = threading.Lock()
+    engine.cache = cache
+    return engine
+
+
+@pytest.mark.parametrize("cache", [None, EmbeddingCache("test", 1024 * 1024)])
+def test_model_encodes_original_text(cache):
+    engine = make_engine(cache)
+    texts = ["  Hello\tworld ", "Hello world", "café"]
+    embeddings = engine.encode(texts)
+    assert embeddings.shape == (3, 2)
+    # Normalization only groups texts for the cache, the model gets them as they were written
+    assert all(text in texts for text in engine.model.encoded)
+    assert "café" in engine.model.encoded
+    if cache is not None:
+        assert len(engine.model.encoded) == 2
+        np.testing.assert_array_equal(embeddings[0], embeddings[1])
+
+
+def test_pairwise_similarity_is_the_diagonal():
+    engine = make_engine(None)
+    predictions, references = ["a", "abc", "abc", None], ["abc", "abc", "a", ""]
+    similarity = engine.pairwise_similarity(predictions, references)
+    full = engine.encode(predictions) @ engine.encode(references).T
+    np.testing.assert_allclose(similarity, np.diag(full), rtol=1e-6)
+    with pytest.raises(ValueError):
+        engine.pairwise_similarity(["a"], [])
@@ -0,0 +1,21 @@
+import asyncio
+
+from ApplicationManagment.Handlers.evaluationHandler import EvaluationHandler
+
+
+async def acquire_budgets():
+    model_semaphore = EvaluationHandler.get_model_semaphore()
+    deployment_semaphore = EvaluationHandler.get_deployment_semaphore("deployment-1")
+    async with model_semaphore, deployment_semaphore:
+        assert EvaluationHandler.get_model_semaphore() is model_semaphore
+        assert EvaluationHandler.get_deployment_semaphore("deployment-1") is deployment_semaphore
+        assert EvaluationHandler.get_deployment_semaphore("deployment-2") is not deployment_semaphore
+    return model_semaphore, deployment_semaphore
+
+
+def test_semaphores_are_shared_on_a_loop_and_not_across_loops():
+    first = asyncio.run(acquire_budgets())
+    # A second loop, as a new worker run, gets its own budgets instead of ones bound to the dead loop
+    second = asyncio.run(acquire_budgets())
+    assert first[0] is not second[0]
+    assert first[1] is not second[1]
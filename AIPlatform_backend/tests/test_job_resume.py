@@ -0,0 +1,84 @@
+import asyncio
+
+from Database.evaluationSetup import MongoDBHandler
+
+
+class DocumentCollection:
+    """Just enough of a Motor collection for the upserts of the results, config and status records."""
+
+    def __init__(self, documents=None):
+        self.documents = documents or []
+
+    def _matches(self, document, query):
+        return all(document.get(key) == value for key, value in query.items())
+
+    async def find_one(self, query, projection=None):
+        return next((document for document in self.documents if self._matches(document, query)), None)
+
+    async def update_one(self, query, update, upsert=False):
+        document = await self.find_one(query)
+        if document is None:
+            if not upsert:
+                return
+            document = dict(query)
+            document.update(update.get("$setOnInsert", {}))
+            self.documents.append(document)
+        document.update(update.get("$set", {}))
+        for field, condition in update.get("$pull", {}).items():
+            document[field] = [item for item in document.get(field, []) if not self._matches(item, condition)]
+        for field, value in update.get("$push", {}).items():
+            document.setdefault(field, []).append(value)
+
+
+def make_handler(status_documents=None):
+    handler = MongoDBHandler.__new__(MongoDBHandler)
+    handler.results_collection = DocumentCollection()
+    handler.config_collection = DocumentCollection()
+    handler.status_collection = DocumentCollection(status_documents)
+    handler.result_chunks_collection = None
+    return handler
+
+
+def test_rerun_model_replaces_its_results():
+    handler = make_handler()
+
+    async def run():
+        for attempt in range(2):
+            for model_id in ["m1", "m2"]:
+                await handler.update_results_record("p1", "run", "u1", "LLM", model_id, model_id, {"attempt": attempt})
+
+    asyncio.run(run())
+    [summary] = handler.results_collection.documents
+    assert sorted(model["model_id"] for model in summary["models"]) == ["m1", "m2"]
+    assert all(model["results"] == {"attempt": 1} for model in summary["models"])
+
+
+def test_config_record_is_written_once_per_process():
+    handler = make_handler()
+    config = {"user_id": "u1", "process_id": "p1", "process_name": "run", "model_id": ["m1"],
+              "model_name": ["m1"], "payload_file_path": "payload.yaml"}
+
+    asyncio.run(handler.insert_config_record(config))
+    # As written by the first attempt of the job
+    handler.config_collection.documents[0]["timestamp"] = 1700000000
+    asyncio.run(handler.insert_config_record(config))
+    assert len(handler.config_collection.documents) == 1
+    assert handler.config_collection.documents[0]["timestamp"] == 1700000000
+
+
+def test_completed_models_need_stored_results():
+    handler = make_handler([{"process_id": "p1", "models": [
+        {"model_id": "m1", "status": "Completed"},
+        {"model_id": "m2", "status": "Completed"},
+        {"model_id": "m3", "status": "In Progress"},
+    ]}])
+
+    async def run():
+        assert await handler.get_completed_model_ids("p1") == set()
+        for model_id in ["m1", "m3"]:
+            await handler.update_results_record("p1", "run", "u1", "LLM", model_id, model_id, {})
+        return await handler.get_completed_model_ids("p1")
+
+    # m2 is Completed but its results were never stored, m3 has results but did not finish
+    assert asyncio.run(run()) == {"m1"}
+    assert asyncio.run(make_handler().get_completed_model_ids("unknown")) == set()
@@ -0,0 +1,95 @@
+import asyncio
+import json
+import random
+
+import numpy
+import pytest
+
+from ApplicationManagment.Handlers.latencyHistogram import LatencyHistogram
+from Database.evaluationSetup import MongoDBHandler
+
+PERCENTILES = [1, 25, 50, 75, 90.5, 95, 99, 99.9, 100]
+
+
+@pytest.fixture
+def latencies():
+    """Seconds from 1 us to several seconds, long tailed like request latencies, with repeats."""
+    rng = random.Random(3)
+    values = [rng.lognormvariate(-3, 1.5) for _ in range(20000)]
+    return values + [0.000001, 0.0001, 0.25, 0.25, 0.25, 7.5]
+
+
+def histogram_of(values, significant_figures=2):
+    histogram = LatencyHistogram(significant_figures)
+    for value in values:
+        histogram.record(value)
+    return histogram
+
+
+def test_every_value_falls_in_its_bucket_range():
+    histogram = LatencyHistogram()
+    for value in list(range(5000)) + [2 ** shift + offset for shift in range(12, 40) for offset in (-1, 0, 1)]:
+        low, high = histogram._bucket_range(histogram._bucket_index(value))
+        assert low <= value <= high
+        # Bucket width within the 2 significant figures
+        assert high - low <= max(value, 1) / 100
+
+
+def test_percentiles_match_numpy(latencies):
+    histogram = histogram_of(latencies)
+    # Nearest rank on the microsecond values the histogram records
+    recorded = numpy.round(numpy.array(latencies) / LatencyHistogram.UNIT_SECONDS) * LatencyHistogram.UNIT_SECONDS
+    for percentile in PERCENTILES:
+        expected = numpy.percentile(recorded, percentile, method="inverted_cdf")
+        assert histogram.percentile(percentile) == pytest.approx(expected, rel=1e-2), percentile
+    assert histogram.percentile(0) == pytest.approx(recorded.min(), rel=1e-2)
+    assert histogram.mean() == pytest.approx(recorded.mean())
+    assert histogram.total_count == len(latencies)
+
+
+def test_empty_histogram_has_no_percentiles():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) is None and histogram.mean() is None
+    assert LatencyHistogram.merge_all([]).percentile(99) is None
+
+
+def test_merge_all_equals_one_histogram_of_every_value(latencies):
+    parts = [histogram_of(latencies[start::4]) for start in range(4)] + [LatencyHistogram()]
+    merged = LatencyHistogram.merge_all(parts)
+    assert merged.to_dict() == histogram_of(latencies).to_dict()
+    assert merged.percentiles(PERCENTILES) == histogram_of(latencies).percentiles(PERCENTILES)
+
+
+def test_merge_rejects_a_different_precision():
+    with pytest.raises(ValueError):
+        LatencyHistogram(2).merge(LatencyHistogram(3))
+
+
+def test_dict_round_trip(latencies):
+    histogram = histogram_of(latencies, significant_figures=3)
+    # Through JSON, as a shard result or a stored results document
+    restored = LatencyHistogram.from_dict(json.loads(json.dumps(histogram.to_dict())))
+    assert restored.to_dict() == histogram.to_dict()
+    assert restored.percentiles(PERCENTILES) == histogram.percentiles(PERCENTILES)
+    assert LatencyHistogram.from_dict(LatencyHistogram().to_dict()).to_dict() == LatencyHistogram().to_dict()
+
+
+class ResultsCollection:
+    def __init__(self, document):
+        self.document = document
+
+    async def find_one(self, query, projection=None):
+        return self.document
+
+
+def test_stored_percentiles_merge_the_models(latencies):
+    first, second = latencies[::2], latencies[1::2]
+    handler = MongoDBHandler.__new__(MongoDBHandler)
+    handler.results_collection = ResultsCollection({"process_id": "p-1", "models": [
+        {"model_id": "m-1", "latency_histograms": {"overall": histogram_of(first).to_dict()}},
+        {"model_id": "m-2", "latency_histograms": {"overall": histogram_of(second).to_dict()}},
+        {"model_id": "m-3"},
+    ]})
+    assert asyncio.run(handler.get_latency_percentiles("p-1", [50, 99])) == histogram_of(latencies).percentiles([50, 99])
+    assert asyncio.run(handler.get_latency_percentiles("p-1", [50], model_id="m-2")) == histogram_of(second).percentiles([50])
+    assert asyncio.run(handler.get_latency_percentiles("p-1", [50], model_id="m-3")) == {}
@@ -0,0 +1,40 @@
+import pytest
+
+from ApplicationManagment.Handlers.asynctester import AsyncTester
+from ApplicationManagment.Handlers.latencyHistogram import LatencyHistogram
+
+
+def make_shard(worker_index, start, end, requests=100):
+    histogram = LatencyHistogram()
+    histogram.record(0.5)
+    return {
+        "worker_index": worker_index,
+        "rows": [],
+        "rate_stats": {"Payload1": {"load_profile": "constant", "target_rate": 10.0, "achieved_rate": 10.0}},
+        "windows": {"Payload1": {"start": start, "end": end, "first_send": start, "last_send": end,
+                                 "requests": requests, "sends": requests}},
+        "latency_histograms": {"Payload1": histogram.to_dict()},
+        "stream_stats": {}
+    }
+
+
+def merge(shards):
+    tester = AsyncTester("payload.yaml", "user", "session", "http://endpoint", "config", "config-id", "key", 200,
+                         load_profile="constant", target_rps=20, verbose=False)
+    tester.merge_shards(shards)
+    return tester
+
+
+def test_concurrent_shards_add_up():
+    tester = merge([make_shard(0, 1000.0, 1010.0), make_shard(1, 1000.0, 1010.0)])
+    assert tester.set_throughputs["Payload1"] == pytest.approx(20.0)
+    assert tester.rate_stats["Payload1"]["target_rate"] == 20.0
+    assert tester.rate_stats["Payload1"]["achieved_rate"] == pytest.approx(199 / 10)
+
+
+def test_shards_run_one_after_another_are_not_counted_as_concurrent():
+    # One queue worker ran both shards, the run took twice as long at the rate of one shard
+    tester = merge([make_shard(1, 1010.0, 1020.0), make_shard(0, 1000.0, 1010.0)])
+    assert tester.set_throughputs["Payload1"] == pytest.approx(10.0)
+    assert tester.rate_stats["Payload1"]["achieved_rate"] == pytest.approx(199 / 20)
+    assert tester.latency_histograms["Payload1"].total_count == 2
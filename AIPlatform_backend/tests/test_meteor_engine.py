@@ -0,0 +1,95 @@
+import nltk
+import pytest
+from nltk.translate.meteor_score import single_meteor_score
+
+from ApplicationManagment.Handlers import meteorEngine
+
+# Synonym groups of the stand-in WordNet, written as the stems the synonym stage looks up
+SYNONYM_GROUPS = [
+    ["big", "larg", "huge", "great"], ["quick", "fast", "rapid"], ["car", "auto", "automobil", "machin"],
+    ["run", "race", "go", "move", "travel"], ["happi", "glad", "content"], ["small", "littl", "minor", "tini"],
+]
+VOCABULARY = (
+    "the a big large huge great quick fast rapid car cars auto automobile machine running runs ran race going "
+    "moves happy glad small little minor tiny , . is was Café naïve"
+).split()
+
+
+class Lemma:
+    def __init__(self, name):
+        self._name = name
+
+    def name(self):
+        return self._name
+
+
+class Synset:
+    def __init__(self, group):
+        self.group = group
+
+    def lemmas(self):
+        # Multi-word lemmas are skipped by both implementations
+        return [Lemma(word) for word in self.group] + [Lemma("multi_word")]
+
+
+class FakeWordnet:
+    def synsets(self, word):
+        return [Synset(group) for group in SYNONYM_GROUPS if word in group]
+
+
+def has_wordnet():
+    try:
+        nltk.data.find("corpora/wordnet")
+        return True
+    except LookupError:
+        return False
+
+
+@pytest.fixture
+def fake_wordnet(monkeypatch):
+    wordnet = FakeWordnet()
+    monkeypatch.setattr(meteorEngine, "wordnet", wordnet)
+    meteorEngine.synonyms.cache_clear()
+    yield wordnet
+    meteorEngine.synonyms.cache_clear()
+
+
+@pytest.fixture
+def synonym_pairs():
+    import random
+    rng = random.Random(3)
+
+    def tokens():
+        return [rng.choice(VOCABULARY) for _ in range(rng.randint(0, 30))]
+
+    predictions = [tokens() for _ in range(500)] + [[], ["x"], ["The", "BIG", "car"], ["a", "a", "a"]]
+    references = [tokens() for _ in range(500)] + [["a"], [], ["the", "large", "autos"], ["a"]]
+    return predictions, references
+
+
+def test_meteor_matches_nltk(synonym_pairs, fake_wordnet):
+    for prediction, reference in zip(*synonym_pairs):
+        expected = single_meteor_score(reference, prediction, wordnet=fake_wordnet)
+        assert meteorEngine.meteor(reference, prediction) == pytest.approx(expected, abs=1e-12)
+
+
+def test_meteor_mean_matches_nltk(token_pairs, fake_wordnet):
+    predictions, references = token_pairs
+    expected = sum(
+        single_meteor_score(reference, prediction, wordnet=fake_wordnet)
+        for prediction, reference in zip(predictions, references)
+    ) / len(predictions)
+    assert meteorEngine.meteor_mean(predictions, references) == pytest.approx(expected, abs=1e-12)
+    assert meteorEngine.meteor_mean([], []) == 0.0
+
+
+@pytest.mark.skipif(not has_wordnet(), reason="WordNet data is not installed")
+def test_parallel_chunks_match_nltk_wordnet(token_pairs, parallel_scoring):
+    # The pool processes load the real WordNet, so this one can't use the stand-in
+    from nltk.corpus import wordnet
+    predictions, references = token_pairs
+    expected = sum(
+        single_meteor_score(reference, prediction, wordnet=wordnet)
+        for prediction, reference in zip(predictions, references)
+    ) / len(predictions)
+    assert meteorEngine.meteor_mean(predictions, references) == pytest.approx(expected, abs=1e-12)
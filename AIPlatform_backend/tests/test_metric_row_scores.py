@@ -0,0 +1,79 @@
+import asyncio
+
+from Database.evaluationSetup import MongoDBHandler
+
+
+class Cursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, keys):
+        for field, direction in reversed(keys):
+            self.documents.sort(key=lambda document: document[field], reverse=direction < 0)
+        return self
+
+    def __aiter__(self):
+        async def iterate():
+            for document in self.documents:
+                yield document
+        return iterate()
+
+
+class Collection:
+    def __init__(self):
+        self.documents = []
+
+    def _matches(self, document, query):
+        return all(
+            document.get(key) != value["$ne"] if isinstance(value, dict) else document.get(key) == value
+            for key, value in query.items()
+        )
+
+    def find(self, query, projection=None):
+        return Cursor([document for document in self.documents if self._matches(document, query)])
+
+    async def find_one(self, query, projection=None):
+        return next((document for document in self.documents if self._matches(document, query)), None)
+
+    async def insert_one(self, document):
+        self.documents.append(document)
+
+    async def insert_many(self, documents):
+        self.documents.extend(documents)
+
+    async def update_one(self, query, update):
+        document = await self.find_one(query)
+        document.update(update.get("$set", {}))
+        for field, value in update.get("$push", {}).items():
+            document[field].append(value)
+
+    async def delete_many(self, query):
+        self.documents = [document for document in self.documents if not self._matches(document, query)]
+
+
+def test_metric_document_keeps_scores_and_chunks_keep_rows():
+    handler = MongoDBHandler.__new__(MongoDBHandler)
+    handler.metrics_collection = Collection()
+    handler.result_chunks_collection = Collection()
+    handler.result_files = None
+    handler.config = {"RESULT_CHUNK_ROWS": 2}
+    rows = [{"query": f"q{i}", "BERT f1": i / 10} for i in range(5)]
+
+    async def run():
+        for model_id in ["m1", "m2"]:
+            await handler.update_metrics_results_record(
+                "p1", "u1", "LLM", "eval-1", "metric-1", "run", model_id, {"BERT_score": {"f1": 0.2}}, row_scores=rows
+            )
+        # A second run of the metric for m1 replaces its rows
+        await handler.update_metrics_results_record(
+            "p1", "u1", "LLM", "eval-1", "metric-1", "run", "m1", {"BERT_score": {"f1": 0.2}}, row_scores=rows[:1]
+        )
+        return await handler.get_metric_row_scores("p1", "metric-1", "m1"), await handler.get_metric_row_scores("p1", "metric-1", "m2")
+
+    m1_rows, m2_rows = asyncio.run(run())
+    assert m1_rows == rows[:1]
+    assert m2_rows == rows
+    [document] = handler.metrics_collection.documents
+    assert all("rows" not in str(model["metrics_results"]) for model in document["models"])
+    assert document["models"][0]["row_scores"] == {"rows_key": "m1:metric:metric-1", "row_count": 5}
+    assert len(handler.result_chunks_collection.documents) == 3 + 1
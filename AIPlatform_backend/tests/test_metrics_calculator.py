@@ -0,0 +1,32 @@
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("bert_score")
+pytest.importorskip("sentence_transformers")
+
+from ApplicationManagment.Handlers.MetricsCalculator import MetricsCalculator
+
+METRICS = ["ROUGE Score"]
+
+
+def rows():
+    return [
+        {"query": "q1", "response": "the cat sat on the mat", "answer": "the cat sat on the mat"},
+        {"query": "q2", "response": "a dog ran in the park", "answer": "the dog ran through the park"},
+    ]
+
+
+def test_failed_requests_are_not_scored():
+    failed = {"query": "q3", "response": "", "answer": "a reference nobody answered", "status_code": 500, "error": "Request failed"}
+    scored = MetricsCalculator.calculate_metrics({"Payload1": rows()}, METRICS)["data"]
+    with_failure = MetricsCalculator.calculate_metrics({"Payload1": rows() + [failed]}, METRICS)["data"]
+    assert with_failure["failed_count"] == 1
+    assert scored["failed_count"] == 0
+    assert with_failure["ROUGE_score"] == scored["ROUGE_score"]
+
+
+def test_result_keeps_scores_only():
+    data = {"timestamp": "01012026_1200", "Payload1": rows()}
+    result = MetricsCalculator.calculate_metrics(data, METRICS)
+    assert set(result["data"]) == {"failed_count", "ROUGE_score"}
+    assert result["rows"] is None
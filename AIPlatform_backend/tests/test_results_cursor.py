@@ -0,0 +1,25 @@
+import base64
+
+import pytest
+from fastapi import HTTPException
+
+from Database.evaluationSetup import MongoDBHandler
+
+
+def test_cursor_round_trip():
+    cursor = MongoDBHandler.encode_cursor({"timestamp": 1700000000, "process_id": "p-1", "metric_index": 3})
+    assert MongoDBHandler.decode_cursor(cursor) == (1700000000, "p-1", 3)
+    cursor = MongoDBHandler.encode_cursor({"timestamp": 1700000000, "process_id": "p-1"})
+    assert MongoDBHandler.decode_cursor(cursor) == (1700000000, "p-1", 0)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    base64.urlsafe_b64encode(b'{"timestamp": 1}').decode(),
+    base64.urlsafe_b64encode(b"[1, 2]").decode(),
+])
+def test_invalid_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as error:
+        MongoDBHandler.decode_cursor(cursor)
+    assert error.value.status_code == 400
@@ -0,0 +1,43 @@
+import pytest
+from rouge_score import rouge_scorer
+
+from ApplicationManagment.Handlers.rougeEngine import RougeEngine, lcs_length, rouge_f1
+
+
+def test_lcs_length_matches_dynamic_programming():
+    def reference_lcs(a, b):
+        table = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+        for i in range(len(a)):
+            for j in range(len(b)):
+                table[i + 1][j + 1] = table[i][j] + 1 if a[i] == b[j] else max(table[i][j + 1], table[i + 1][j])
+        return table[-1][-1]
+
+    cases = [((), ()), ((1,), ()), ((1, 2, 3), (3, 2, 1)), ((1, 2, 1, 3, 1), (1, 1, 1)), (tuple(range(70)), tuple(range(0, 140, 2)))]
+    for a, b in cases:
+        assert lcs_length(a, b) == reference_lcs(a, b)
+
+
+def test_scores_match_rouge_score(text_pairs):
+    predictions, references = text_pairs
+    scorer = rouge_scorer.RougeScorer(["rouge1", "rouge2", "rougeL"], use_stemmer=True)
+    engine = RougeEngine()
+    for prediction, reference in zip(predictions, references):
+        expected = scorer.score(reference, prediction)
+        actual = engine.score(reference, prediction)
+        for variant in ("rouge1", "rouge2", "rougeL"):
+            assert actual[variant] == pytest.approx(tuple(expected[variant]), abs=1e-12)
+
+
+def test_rouge_f1_is_the_mean_f1(text_pairs):
+    predictions, references = text_pairs
+    scorer = rouge_scorer.RougeScorer(["rouge1", "rouge2", "rougeL"], use_stemmer=True)
+    scores = [scorer.score(reference, prediction) for prediction, reference in zip(predictions, references)]
+    expected = tuple(sum(score[variant].fmeasure for score in scores) / len(scores) for variant in ("rouge1", "rouge2", "rougeL"))
+    assert rouge_f1(predictions, references) == pytest.approx(expected, abs=1e-12)
+    assert rouge_f1([], []) == (0.0, 0.0, 0.0)
+
+
+def test_parallel_chunks_match_serial(text_pairs, parallel_scoring):
+    predictions, references = text_pairs
+    serial = RougeEngine().f1_sums(predictions, references)
+    assert rouge_f1(predictions, references) == pytest.approx(tuple(total / len(predictions) for total in serial), abs=1e-12)
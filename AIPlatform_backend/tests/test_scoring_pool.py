@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from ApplicationManagment.Handlers import scoringPool
+from db_config import eval_config
+
+
+@pytest.fixture
+def worker_share(monkeypatch):
+    monkeypatch.setattr(scoringPool, "_worker_share", None)
+    monkeypatch.setitem(eval_config, "SCORING_PARALLEL_MIN_ROWS", 100)
+
+
+def test_pool_uses_every_cpu_outside_metrics_workers(worker_share, monkeypatch):
+    monkeypatch.setitem(eval_config, "SCORING_WORKERS", 0)
+    assert scoringPool.pool_size() == (os.cpu_count() or 1)
+
+
+def test_metrics_worker_share_caps_the_pool(worker_share, monkeypatch):
+    monkeypatch.setitem(eval_config, "SCORING_WORKERS", 8)
+    scoringPool.limit_workers(3)
+    assert scoringPool.pool_size() == 3
+    assert scoringPool.is_large(100)
+
+
+def test_share_of_one_scores_in_process(worker_share, monkeypatch):
+    monkeypatch.setitem(eval_config, "SCORING_WORKERS", 8)
+    scoringPool.limit_workers(1)
+    assert scoringPool.pool_size() == 1
+    assert not scoringPool.is_large(10 ** 6)
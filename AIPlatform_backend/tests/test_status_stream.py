@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import pytest
+
+from ApplicationManagment.Handlers.benchmarkingHandler import BenchmarkHandler
+from Database.evaluationSetup import MongoDBHandler
+from Database.statusHub import status_hub
+from db_config import status_hub_config
+
+
+class StatusCollection:
+    def __init__(self, document=None):
+        self.document = document
+
+    async def find_one(self, query, projection=None):
+        return self.document
+
+
+@pytest.fixture
+def status_document(monkeypatch):
+    """Status document every get_mongo_handler handler reads, None for a process that is not written yet."""
+    collection = StatusCollection()
+    handler = MongoDBHandler.__new__(MongoDBHandler)
+    handler.status_collection = collection
+
+    async def get_mongo_handler(service, org_id):
+        return handler
+
+    monkeypatch.setattr(MongoDBHandler, "get_mongo_handler", staticmethod(get_mongo_handler))
+    return collection
+
+
+@pytest.mark.parametrize("document", [None, {"process_id": "unknown", "overall_status": "In Progress"}])
+def test_unknown_process_has_no_status_details(status_document, document):
+    status_document.document = document
+    assert asyncio.run(BenchmarkHandler.get_status_details("unknown", "evaluation")) == (None, "Process not found")
+
+    async def load():
+        queue = status_hub.subscribe("unknown")
+        try:
+            return await status_hub.load_snapshot("unknown", lambda: BenchmarkHandler.get_status_details("unknown", "evaluation"))
+        finally:
+            status_hub.unsubscribe("unknown", queue)
+
+    assert asyncio.run(load()) is None
+
+
+def test_stream_of_unknown_process_keeps_checking(status_document, monkeypatch):
+    pytest.importorskip("sentence_transformers")
+    pytest.importorskip("bert_score")
+    from ApplicationManagment.evaluation import Evaluation
+
+    monkeypatch.setitem(status_hub_config, "POLL_SECONDS", 0.01)
+    evaluation = Evaluation.__new__(Evaluation)
+
+    async def first_messages(count):
+        response = await evaluation.check_process_status("unknown", "evaluation")
+        messages = []
+        async for message in response.body_iterator:
+            messages.append(json.loads(message[len("data: "):]))
+            if len(messages) == count:
+                break
+        await response.body_iterator.aclose()
+        return messages
+
+    assert asyncio.run(first_messages(3)) == [{"error": "Process not found"}] * 3
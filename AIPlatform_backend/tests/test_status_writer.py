@@ -0,0 +1,66 @@
+import asyncio
+
+from pymongo import UpdateOne
+from pymongo.errors import AutoReconnect
+
+from Database.statusWriter import StatusWriter
+
+
+class FlakyStatusCollection:
+    """Status collection whose first bulk_write calls fail like a dropped connection."""
+
+    full_name = "evaluation.EvalStatus"
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.writes = []
+
+    async def bulk_write(self, updates, ordered=True):
+        await asyncio.sleep(0)
+        if self.failures:
+            self.failures -= 1
+            raise AutoReconnect("connection closed")
+        self.writes.extend(updates)
+
+
+def test_failed_flush_is_written_by_the_next_one():
+    async def run():
+        writer = StatusWriter(interval_seconds=3600)
+        collection = FlakyStatusCollection(failures=1)
+        await writer.set_model_status(collection, "p1", "m1", "Completed", "Completed")
+        assert collection.writes == []
+        assert ("evaluation.EvalStatus", "p1") in writer.pending
+        writer.flusher.cancel()
+        await writer.flush()
+        return collection.writes
+
+    writes = asyncio.run(run())
+    assert writes == [UpdateOne(
+        {"process_id": "p1"},
+        {"$set": {"overall_status": "Completed", "models.$[m0].status": "Completed"}},
+        array_filters=[{"m0.model_id": "m1"}]
+    )]
+
+
+def test_requeued_changes_do_not_override_newer_ones():
+    async def run():
+        writer = StatusWriter(interval_seconds=3600)
+        collection = FlakyStatusCollection(failures=1)
+        await writer.set_model_status(collection, "p1", "m1", "Running")
+        await writer.set_model_status(collection, "p1", "m2", "Running")
+        writer.flusher.cancel()
+        writer.flusher = None
+        failed = writer.flush()
+        # A newer change lands while the failing write is in flight
+        newer = writer.set_model_status(collection, "p1", "m1", "Evaluating")
+        await asyncio.gather(failed, newer)
+        writer.flusher.cancel()
+        await writer.flush()
+        return collection.writes
+
+    writes = asyncio.run(run())
+    assert writes == [UpdateOne(
+        {"process_id": "p1"},
+        {"$set": {"models.$[m0].status": "Evaluating", "models.$[m1].status": "Running"}},
+        array_filters=[{"m0.model_id": "m1"}, {"m1.model_id": "m2"}]
+    )]
@@ -0,0 +1,45 @@
+import asyncio
+
+from Database.asyncApplicationDataBase import AsyncApplicationDataBase
+from Database.userQueries import REPLACED_USER_INDEXES, USER_INDEXES, analysts_query, plain_users_query
+
+
+class RecordingUsers:
+    """users collection that already has the indexes of an earlier release."""
+
+    def __init__(self):
+        self.indexes = {"_id_": {}, "orgIds": {}, "role_wildcard": {}}
+
+    async def create_index(self, keys, name, **options):
+        self.indexes[name] = {"key": keys, **options}
+
+    async def index_information(self):
+        return dict(self.indexes)
+
+    async def drop_index(self, name):
+        del self.indexes[name]
+
+
+def test_no_wildcard_or_array_role_paths_in_user_indexes():
+    for keys, _, _ in USER_INDEXES:
+        fields = [field for field, _ in keys]
+        assert not any("$**" in field for field in fields)
+        # Array fields, a compound index with orgIds would reject users that have both
+        assert "role.admin" not in fields and "role.superadmin" not in fields
+
+
+def test_ensure_indexes_replaces_earlier_indexes():
+    users = RecordingUsers()
+    database = AsyncApplicationDataBase.__new__(AsyncApplicationDataBase)
+    database.applicationDB = {"users": users}
+    assert asyncio.run(database.ensureIndexes()) == 200
+    assert set(users.indexes) == {"_id_"} | {name for _, name, _ in USER_INDEXES}
+    assert not set(REPLACED_USER_INDEXES) & set(users.indexes)
+    assert users.indexes["orgIds_analysts"]["partialFilterExpression"] == {"role.analyst": {"$exists": True}}
+
+
+def test_org_listings_lead_with_the_indexed_org():
+    # orgIds first, the prefix of orgIds_role_user and orgIds_analysts
+    assert list(plain_users_query("org1"))[0] == "orgIds"
+    assert list(analysts_query("org1")) == ["orgIds", "role.analyst"]
+    assert "orgIds" not in plain_users_query() and "orgIds" not in analysts_query()
@@ -1,7 +1,7 @@
 # models.py
 from datetime import datetime
 from pydantic import BaseModel, validator
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
 
 class Payload(BaseModel):
     payload_file_path: str
@@ -22,6 +22,31 @@ class BenchPayload(BaseModel):
     config_id: List[Dict[str, str]]
     client_api_key: str
     total_requests: int
+    # Load profile: "closed" (concurrency-limited) or an open-loop schedule: "constant", "poisson", "step", "ramp"
+    load_profile: str = "closed"
+    target_rps: float = 0
+    # Final request rate for the "step" and "ramp" profiles
+    end_rps: float = 0
+    ramp_steps: int = 1
+    # Latency percentiles reported per payload set
+    percentiles: List[float] = [50, 75, 90.5, 95, 99]
+    # Consume the response as a stream to measure time to first token and inter-token latency
+    stream: bool = False
+    # Split the load over several worker processes: "local" process pool or "queue" (Mongo work queue, any host)
+    worker_count: int = 1
+    worker_mode: str = "local"
+
+    @validator("load_profile")
+    def check_load_profile(cls, value):
+        if value not in ["closed", "constant", "poisson", "step", "ramp"]:
+            raise ValueError(f"Invalid load_profile '{value}'")
+        return value
+
+    @validator("worker_mode")
+    def check_worker_mode(cls, value):
+        if value not in ["local", "queue"]:
+            raise ValueError(f"Invalid worker_mode '{value}'")
+        return value
     
 class ScheduleDetails(BaseModel):
     service: str
@@ -67,14 +92,17 @@ class ResultDetails(BaseModel):
 class Pagination(BaseModel):
     service : str
     user_id: str
-    page : int
+    page : int = 1
     page_size : int
     orgId:str
+    # next_cursor of the previous response, takes precedence over page
+    cursor: Optional[str] = None
 
 class metric(BaseModel):
     user_id: str
-    page : int
+    page : int = 1
     page_size : int
+    cursor: Optional[str] = None
 
 class RangeUpdateRequest(BaseModel):
     metric_id: str
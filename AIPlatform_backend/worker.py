@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+
+from ApplicationManagment.Handlers.benchmarkingHandler import BenchmarkHandler
+from ApplicationManagment.Handlers.evaluationHandler import EvaluationHandler
+from ApplicationManagment.Handlers.MetricsCalculator import MetricsCalculator
+from Database.evaluationSetup import MongoDBHandler
+from Database.jobQueue import JobQueue
+from db_config import bench_config, eval_config, job_queue_config
+from utils import BenchPayload, Payload
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """Runs jobs from the JobQueue, several at a time, until stopped.
+
+    Start one or more with `python worker.py` next to an API started with JOB_QUEUE_ENABLED=true.
+    """
+
+    def __init__(self, queue: JobQueue, concurrency: int):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.running = 0
+
+    async def run_job(self, job: dict):
+        """Run a job to completion with the handler of its kind."""
+        kind, process_id, org_id, payload = job["kind"], job["process_id"], job.get("org_id"), job["payload"]
+        if kind == "evaluation":
+            handler = EvaluationHandler(MongoDBHandler.get_handler(eval_config, org_id), Payload(**payload))
+            try:
+                await handler.background_evaluation(process_id)
+            finally:
+                # The worker outlives its jobs, their in-memory statuses must not pile up
+                EvaluationHandler.task_statuses.pop(process_id, None)
+        elif kind == "metrics":
+            calculator = MetricsCalculator(MongoDBHandler.get_handler(eval_config, org_id), payload)
+            await calculator.do_metrics(job["metric_id"])
+        elif kind == "benchmark":
+            handler = BenchmarkHandler(MongoDBHandler.get_handler(bench_config, org_id), BenchPayload(**payload))
+            try:
+                await handler.background_benchmark(process_id)
+                # background_benchmark only starts the run
+                await BenchmarkHandler.task_statuses[process_id]["async_task"]
+            finally:
+                BenchmarkHandler.task_statuses.pop(process_id, None)
+        else:
+            raise ValueError(f"Unknown job kind {kind}")
+
+    async def process(self, job: dict):
+        """Run one claimed job, renewing its lease and watching for cancellation meanwhile."""
+        job_id = job["_id"]
+        print(f"Worker {self.worker_id} running {job['kind']} job of process {job['process_id']} (attempt {job['attempts']})")
+        started = time.monotonic()
+        task = asyncio.create_task(self.run_job(job))
+        outcome, error = "Completed", None
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=self.queue.config["HEARTBEAT_SECONDS"])
+            if done:
+                break
+            lease = await self.queue.heartbeat(job_id, self.worker_id)
+            if lease is None or lease.get("cancel_requested"):
+                # Cancelled by a user, or the lease was lost and the job is someone else's now
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                if lease is None:
+                    logger.error(f"Lease of job {job_id} lost, dropped it")
+                    return
+                outcome = "Cancelled"
+                await self.queue.update_process_status(job, "Cancelled")
+                break
+        if outcome == "Completed":
+            try:
+                task.result()
+            except Exception as e:
+                logger.error(f"Job {job_id} failed: {e}")
+                outcome, error = "Failed", str(e)
+        await self.queue.finish(job_id, self.worker_id, outcome, error)
+        await self.queue.record_worker(
+            self.worker_id, max(self.running - 1, 0),
+            completed=int(outcome == "Completed"), failed=int(outcome == "Failed"),
+            busy_seconds=time.monotonic() - started
+        )
+
+    async def slot(self):
+        """One of the concurrency slots: claim, run, repeat."""
+        while True:
+            try:
+                job = await self.queue.claim(self.worker_id)
+            except Exception as e:
+                logger.error(f"Could not claim a job: {e}")
+                job = None
+            if job is None:
+                await asyncio.sleep(self.queue.config["POLL_SECONDS"])
+                continue
+            self.running += 1
+            try:
+                await self.process(job)
+            except Exception as e:
+                logger.error(f"Error processing job {job['_id']}: {e}")
+            finally:
+                self.running -= 1
+
+    async def report(self):
+        """Keep the worker visible in the throughput stats while it is idle, and retire dead jobs."""
+        while True:
+            try:
+                await self.queue.record_worker(self.worker_id, self.running)
+                await self.queue.fail_exhausted()
+            except Exception as e:
+                logger.error(f"Worker report failed: {e}")
+            await asyncio.sleep(self.queue.config["HEARTBEAT_SECONDS"])
+
+    async def run(self):
+        await self.queue.ensure_indexes()
+        print(f"Job worker {self.worker_id} running {self.concurrency} jobs at a time")
+        await asyncio.gather(self.report(), *[self.slot() for _ in range(self.concurrency)])
+
+
+if __name__ == "__main__":
+    asyncio.run(JobWorker(JobQueue(), job_queue_config["CONCURRENCY"]).run())